@@ -0,0 +1,62 @@
+"""Per-card render time of cards/card_generator.create_card_image with and without the energy icon sprite cache.
+
+"uncached" passes ResizeOnEveryDraw, whose sized() resizes the source icon with LANCZOS on every
+call, as every cost and inline icon was drawn before the cache; "cached" passes the
+EnergyIconSprites returned by load_energy_icons, as the editor and --batch do.
+If the icon files are missing (e.g. a checkout without Images/), solid placeholder icons of the same
+size are used so the comparison still runs.
+
+Usage:
+    python benchmarks/card_render_benchmark.py [--cards 105] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "cards"))
+
+from PIL import Image
+import card_generator
+
+class ResizeOnEveryDraw(card_generator.EnergyIconSprites):
+    """The uncached baseline: no resized copy is kept between draws."""
+    def sized(self, code, size):
+        icon = self.get(code)
+        return icon.resize((size, size), Image.Resampling.LANCZOS) if icon else None
+
+def load_icons():
+    icons = card_generator.load_energy_icons(verbose=False)
+    for code in list(card_generator.ENERGY_MAPPING) + ["N"]:
+        if code not in icons: icons[code] = Image.new("RGBA", (128, 128), (200, 200, 200, 255))
+    return icons
+
+def time_render(cards, fonts, icons, repeat):
+    """Returns the best per-card render time in milliseconds over repeat passes."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for card_data in cards: card_generator.create_card_image(card_data, fonts, icons)
+        elapsed = (time.perf_counter() - start) * 1000 / len(cards)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-card render time with and without cached icon sprites.")
+    parser.add_argument("--cards", type=int, default=105, help="Number of cards from card_data.json to render.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    with open(card_generator.DATA_FILE, 'r', encoding='utf-8') as f: cards = json.load(f)[:args.cards]
+    fonts = card_generator.get_fonts("Arial")
+    sprites = load_icons()
+    uncached = time_render(cards, fonts, ResizeOnEveryDraw(sprites), args.repeat)
+    cached = time_render(cards, fonts, sprites, args.repeat)
+    print(f"Rendered {len(cards)} cards, best of {args.repeat}:")
+    print(f"  uncached icons: {uncached:.2f} ms/card")
+    print(f"  cached sprites: {cached:.2f} ms/card ({uncached / cached:.2f}x)")
+    print(f"  sprite cache entries: {len(sprites.sized_icons)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Time-to-first-frame benchmark for the game client.
+
+Each run starts a fresh Python process with SDL's dummy video driver, builds Game(),
+draws the main menu once and reports the per-stage breakdown from StartupTracer.
+
+Usage:
+    python benchmarks/startup_benchmark.py --runs 10 [--trace-allocations] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_child(trace_allocations):
+    """Runs inside the measured process: build the game, draw one frame, print the stages as JSON."""
+    process_start = time.perf_counter()
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    sys.path.insert(0, PROJECT_ROOT)
+    from game_logic.profiling import StartupTracer
+    tracer = StartupTracer(trace_allocations=trace_allocations)
+    with tracer.stage("import main"):
+        import main
+    game = main.Game(tracer=tracer)
+    with tracer.stage("first draw"): game.draw()
+    tracer.mark("first_frame")
+    result = {"stages": tracer.to_dict(), "time_to_first_frame_ms": (time.perf_counter() - process_start) * 1000}
+    main.Card.image_loader.shutdown()
+    print(json.dumps(result))
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-first-frame with the dummy SDL video driver.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--trace-allocations", action="store_true", help="Also record allocations per stage (slower).")
+    parser.add_argument("--json", help="Write all raw results to this file.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child: return run_child(args.trace_allocations)
+
+    results = []
+    for _ in range(args.runs):
+        command = [sys.executable, os.path.abspath(__file__), "--child"] + (["--trace-allocations"] if args.trace_allocations else [])
+        child = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_ROOT)
+        if child.returncode != 0:
+            print(f"Startup run failed:\n{child.stderr}"); sys.exit(1)
+        results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    ttff = [r["time_to_first_frame_ms"] for r in results]
+    print(f"Time to first frame over {len(ttff)} runs: median {statistics.median(ttff):.1f} ms, min {min(ttff):.1f} ms, max {max(ttff):.1f} ms")
+    print(f"{'Stage':<28}{'median ms':>12}{'alloc KB':>12}")
+    for i, stage in enumerate(results[0]["stages"]):
+        if stage["stage"] == "first_frame": continue
+        median_ms = statistics.median(r["stages"][i]["ms"] for r in results)
+        alloc = "" if stage["allocated_kb"] is None else f"{statistics.median(r['stages'][i]['allocated_kb'] for r in results):.1f}"
+        print(f"{stage['stage']:<28}{median_ms:>12.2f}{alloc:>12}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f: json.dump(results, f, indent=4)
+
+if __name__ == '__main__':
+    main()
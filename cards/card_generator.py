@@ -1,10 +1,19 @@
 import json
 import os
-import tkinter as tk
-from tkinter import ttk, messagebox, font as tkfont, filedialog, colorchooser
-from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageTk
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, ImageDraw, ImageFont, ImageOps
 import re
 import uuid
+import hashlib
+from collections import OrderedDict
+try: # The editor needs Tk; the --batch renderer does not, so it can run on a headless machine.
+    import tkinter as tk
+    from tkinter import ttk, messagebox, font as tkfont, filedialog, colorchooser
+    from PIL import ImageTk
+except ImportError:
+    tk = None
 
 # --- Configuration ---
 CARD_WIDTH = 420
@@ -15,7 +24,11 @@ RULES_RECT = (30, 400, CARD_WIDTH - 30, 515) # (left, top, right, bottom)
 # Set base paths using os.path.join for cross-platform compatibility
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) 
+if PROJECT_ROOT not in sys.path: sys.path.insert(0, PROJECT_ROOT) # For the shared game_logic.text_layout engine
+from game_logic.text_layout import text_layout_cache
+from game_logic.costs import parse_cost, cost_icons
 OUTPUT_DIR = os.path.join(SCRIPT_DIR, "generated_cards")
+MANIFEST_FILE = os.path.join(SCRIPT_DIR, "generated_cards_manifest.json") # Build hashes of the PNGs in OUTPUT_DIR (see manifest_path_for)
 DATA_FILE = os.path.join(SCRIPT_DIR, "card_data.json")
 UI_DIR = os.path.join(PROJECT_ROOT, "Images", "UI")
 ENERGY_ICON_DIR = os.path.join(UI_DIR, "Energy")
@@ -53,6 +66,59 @@ BACKGROUND_MAPPING = {
     "Field": "F_BG.png",
 }
 
+# --- Decoded Asset Cache ---
+
+class DecodedAssetCache:
+    """A bounded LRU of decoded (and optionally fitted/resized) PIL images, shared by every card in the process.
+
+    Keys include the file's mtime, so editing an image on disk invalidates its entries. Cached images are
+    shared between cards and must be treated as read-only (they are only ever used as paste sources).
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict() # (path, mtime_ns, size, mode, method) -> (image, byte_size)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self.evictions = 0
+
+    def _lookup(self, key, build):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key); self.hits += 1
+            return entry[0]
+        self.misses += 1
+        image = build()
+        byte_size = image.width * image.height * len(image.getbands())
+        if byte_size <= self.max_bytes:
+            self.entries[key] = (image, byte_size); self.current_bytes += byte_size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.current_bytes -= evicted_size; self.evictions += 1
+        return image
+
+    def _decode(self, path, mode):
+        self.decodes += 1
+        with Image.open(path) as img: return img.convert(mode)
+
+    def get(self, path, mode, size=None, method="fit"):
+        """Returns path decoded to mode; if size is given, fitted (ImageOps.fit) or resized to it with LANCZOS."""
+        mtime = os.stat(path).st_mtime_ns
+        source = self._lookup((path, mtime, None, mode, None), lambda: self._decode(path, mode))
+        if size is None or source.size == tuple(size): return source
+        if method == "fit": return self._lookup((path, mtime, tuple(size), mode, method), lambda: ImageOps.fit(source, size, Image.Resampling.LANCZOS))
+        return self._lookup((path, mtime, tuple(size), mode, method), lambda: source.resize(size, Image.Resampling.LANCZOS))
+
+    def clear(self):
+        self.entries.clear(); self.current_bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "decodes": self.decodes, "evictions": self.evictions,
+                "entries": len(self.entries), "bytes": self.current_bytes}
+
+ASSET_CACHE = DecodedAssetCache()
+
 # --- Helper Functions ---
 def get_fonts(font_family):
     """Loads different sizes of a specified system font."""
@@ -72,12 +138,48 @@ def get_fonts(font_family):
         fonts = { k: ImageFont.load_default() for k in ["regular", "bold", "bold_title", "bold_subtitle", "stats", "italic", "bold_italic", "energy"]}
     return fonts
 
+class EnergyIconSprites(dict):
+    """The energy icons keyed by color code, plus a cache of LANCZOS-resized copies per (code, size).
+
+    Cost icons and inline (W)/(B)/(U)/(G) icons are drawn at a couple of fixed sizes, so every card
+    after the first reuses the resized sprites instead of resizing again.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sized_icons = {} # (code, size) -> resized RGBA image
+
+    def sized(self, code, size):
+        """Returns the icon for code resized to size x size, or None if the icon is missing."""
+        key = (code, size)
+        if key not in self.sized_icons:
+            icon = self.get(code)
+            self.sized_icons[key] = icon.resize((size, size), Image.Resampling.LANCZOS) if icon else None
+        return self.sized_icons[key]
+
+def load_energy_icons(verbose=True):
+    """Loads the energy icons (including the neutral 'N' icon) as an EnergyIconSprites keyed by color code."""
+    icons = EnergyIconSprites()
+    all_mappings = {**ENERGY_MAPPING, "N": "energy_neutral.png"}
+    for code, filename in all_mappings.items():
+        try:
+            path = os.path.join(ENERGY_ICON_DIR, filename)
+            icons[code] = Image.open(path).convert("RGBA")
+            if verbose: print(f"Loaded icon: {path}")
+        except Exception as e:
+            print(f"Warning: Energy icon not found at {path}: {e}")
+    return icons
+
+def _text_length(text, font):
+    return font.getlength(text) if hasattr(font, 'getlength') else font.getsize(text)[0]
+
 def text_wrap(text, font, max_width, inline_icon_size=16):
-    """Wraps text to fit within a specified width, accounting for inline icons."""
+    """Wraps text to fit within a specified width, accounting for inline icons. Results are memoized."""
+    if not text: return []
+    return list(text_layout_cache.layout(text, font, max_width, lambda t, f, w: _text_wrap(t, f, w, inline_icon_size), variant=("pil", inline_icon_size)))
+
+def _text_wrap(text, font, max_width, inline_icon_size):
     lines = []
-    if not text: return lines
-    
-    get_len = lambda t, f: f.getlength(t) if hasattr(f, 'getlength') else f.getsize(t)[0]
+    get_len = lambda t, f: text_layout_cache.width(f, t, _text_length)
 
     for paragraph in text.split('\n'):
         tokens = re.split(r'(\s|\(\w\))', paragraph)
@@ -113,6 +215,7 @@ def text_wrap(text, font, max_width, inline_icon_size=16):
 
 def draw_formatted_text_line(card_image, pos, text, default_font, bold_font, fill, energy_icons):
     """Draws a line of text, handling <b> tags and inline energy icons."""
+    if not isinstance(energy_icons, EnergyIconSprites): energy_icons = EnergyIconSprites(energy_icons)
     x, y = pos
     draw = ImageDraw.Draw(card_image)
     
@@ -130,8 +233,7 @@ def draw_formatted_text_line(card_image, pos, text, default_font, bold_font, fil
         match = re.match(r'\(([WBUG])\)', part)
         if match:
             energy_code = match.group(1)
-            if icon_img := energy_icons.get(energy_code):
-                icon_img = icon_img.resize((inline_icon_size, inline_icon_size), Image.Resampling.LANCZOS)
+            if icon_img := energy_icons.sized(energy_code, inline_icon_size):
                 card_image.paste(icon_img, (int(x), int(y)), icon_img)
                 x += inline_icon_size
             continue
@@ -146,6 +248,7 @@ def draw_formatted_text_line(card_image, pos, text, default_font, bold_font, fil
 
 def create_card_image(card_data, fonts, energy_icons):
     """Generates a single card image from data, now with custom backgrounds and borders."""
+    if not isinstance(energy_icons, EnergyIconSprites): energy_icons = EnergyIconSprites(energy_icons)
     faction = card_data.get("faction", "Default")
     default_bg, default_text = FACTION_COLORS.get(faction, FACTION_COLORS.get("Default"))
     bg_color = card_data.get("background_color", default_bg)
@@ -156,8 +259,7 @@ def create_card_image(card_data, fonts, energy_icons):
     if border_path := card_data.get("card_border_path"):
         if os.path.exists(border_path):
             try:
-                card = Image.open(border_path).convert("RGB")
-                card = ImageOps.fit(card, (CARD_WIDTH, CARD_HEIGHT), Image.Resampling.LANCZOS)
+                card = ASSET_CACHE.get(border_path, "RGB", (CARD_WIDTH, CARD_HEIGHT)).copy() # Drawn on, so copy
             except Exception as e:
                 print(f"Error loading custom border image: {e}")
                 card = Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), color=border_color)
@@ -172,8 +274,7 @@ def create_card_image(card_data, fonts, energy_icons):
     if card_bg_path := card_data.get("card_background_path"):
         if os.path.exists(card_bg_path):
             try:
-                card_bg_img = Image.open(card_bg_path).convert("RGBA")
-                card_bg_img = ImageOps.fit(card_bg_img, inner_bg.size, Image.Resampling.LANCZOS)
+                card_bg_img = ASSET_CACHE.get(card_bg_path, "RGBA", inner_bg.size)
                 inner_bg.paste(card_bg_img, (0,0), card_bg_img)
             except Exception as e:
                 print(f"Error loading card background image: {e}")
@@ -187,10 +288,9 @@ def create_card_image(card_data, fonts, energy_icons):
     if bg_path := card_data.get("background_path"):
         if os.path.exists(bg_path):
             try:
-                bg_img = Image.open(bg_path).convert("RGBA")
                 bg_scale = float(card_data.get("background_scale", 1.0))
                 bg_size = (int(artwork_size[0] * bg_scale), int(artwork_size[1] * bg_scale))
-                if bg_size[0] > 0 and bg_size[1] > 0: bg_img = ImageOps.fit(bg_img, bg_size, Image.Resampling.LANCZOS)
+                bg_img = ASSET_CACHE.get(bg_path, "RGBA", bg_size if bg_size[0] > 0 and bg_size[1] > 0 else None)
                 bg_x, bg_y = int(card_data.get("background_x", 0)), int(card_data.get("background_y", 0))
                 px, py = (artwork_size[0] - bg_img.width) // 2 + bg_x, (artwork_size[1] - bg_img.height) // 2 + bg_y
                 final_artwork.paste(bg_img, (px, py))
@@ -199,10 +299,10 @@ def create_card_image(card_data, fonts, energy_icons):
     if art_path := card_data.get("artwork_path"):
         if os.path.exists(art_path):
             try:
-                art_img = Image.open(art_path).convert("RGBA")
+                art_img = ASSET_CACHE.get(art_path, "RGBA")
                 scale = float(card_data.get("artwork_scale", 1.0))
                 ss = (int(art_img.width * scale), int(art_img.height * scale))
-                if ss[0] > 0 and ss[1] > 0: art_img = art_img.resize(ss, Image.Resampling.LANCZOS)
+                if ss[0] > 0 and ss[1] > 0: art_img = ASSET_CACHE.get(art_path, "RGBA", ss, method="resize")
                 x_off, y_off = int(card_data.get("artwork_x", 0)), int(card_data.get("artwork_y", 0))
                 px, py = (artwork_size[0] - art_img.width) // 2 + x_off, (artwork_size[1] - art_img.height) // 2 + y_off
                 final_artwork.paste(art_img, (px, py), art_img)
@@ -224,8 +324,7 @@ def create_card_image(card_data, fonts, energy_icons):
         x_offset = CARD_WIDTH - 20 - icon_size
         for color_code, count in reversed(list(energy_cost_info.items())):
             if color_code == "N": continue
-            if icon_img := energy_icons.get(color_code):
-                icon_img = icon_img.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
+            if icon_img := energy_icons.sized(color_code, icon_size):
                 card.paste(icon_img, (x_offset, 20), icon_img)
                 cost_str = str(count); text_bbox = draw.textbbox((0,0), cost_str, font=energy_font)
                 text_w, text_h = text_bbox[2] - text_bbox[0], text_bbox[3] - text_bbox[1]
@@ -236,8 +335,7 @@ def create_card_image(card_data, fonts, energy_icons):
                 x_offset -= (icon_size + 5)
 
         if generic_cost := energy_cost_info.get("N"):
-            if icon_img := energy_icons.get("N"):
-                icon_img = icon_img.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
+            if icon_img := energy_icons.sized("N", icon_size):
                 card.paste(icon_img, (x_offset, 20), icon_img)
                 cost_str = str(generic_cost); text_bbox = draw.textbbox((0,0), cost_str, font=energy_font)
                 text_w, text_h = text_bbox[2] - text_bbox[0], text_bbox[3] - text_bbox[1]
@@ -275,6 +373,134 @@ def create_card_image(card_data, fonts, energy_icons):
         
     return card
 
+# --- Incremental Build ---
+
+CARD_IMAGE_KEYS = ("card_border_path", "card_background_path", "background_path", "artwork_path")
+
+def _file_signature(path):
+    """Cheap change marker for an input file: (mtime_ns, size), or None if it is missing."""
+    try: st = os.stat(path); return [st.st_mtime_ns, st.st_size]
+    except (OSError, TypeError): return None
+
+def font_signatures(fonts):
+    """[path, signature] of the font file behind each of get_fonts' fonts (path None for the built-in fallback)."""
+    paths = [getattr(font, "path", None) for font in fonts.values()]
+    return [[path, _file_signature(path)] if isinstance(path, str) else [None, None] for path in paths]
+
+def build_environment_hash(font_family="Arial", fonts=None):
+    """Hash of everything shared by all cards: this script (layout code), the font family and its font files, and the energy icons."""
+    h = hashlib.sha256()
+    with open(os.path.abspath(__file__), 'rb') as f: h.update(f.read())
+    h.update(json.dumps([font_family, font_signatures(fonts or get_fonts(font_family))]).encode())
+    for filename in sorted({**ENERGY_MAPPING, "N": "energy_neutral.png"}.values()):
+        h.update(json.dumps([filename, _file_signature(os.path.join(ENERGY_ICON_DIR, filename))]).encode())
+    return h.hexdigest()
+
+def card_build_hash(card_data, environment_hash):
+    """Hash of a card's JSON fields plus the mtime/size of every image it references."""
+    images = {key: [card_data.get(key), _file_signature(card_data.get(key))] for key in CARD_IMAGE_KEYS if card_data.get(key)}
+    payload = json.dumps({"card": card_data, "images": images, "env": environment_hash}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def manifest_path_for(output_dir):
+    """The build manifest of an output directory: <directory name>_manifest.json next to it."""
+    output_dir = os.path.abspath(output_dir)
+    return os.path.join(os.path.dirname(output_dir), os.path.basename(output_dir) + "_manifest.json")
+
+def load_manifest(manifest_path=MANIFEST_FILE):
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f: return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError): return {}
+
+def save_manifest(manifest, manifest_path=MANIFEST_FILE):
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f: json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def render_card_file(card_data, output_path, fonts, energy_icons):
+    """Renders a card and writes it atomically, so an interrupted run never leaves a truncated PNG."""
+    tmp_path = output_path + ".tmp"
+    create_card_image(card_data, fonts, energy_icons).save(tmp_path, format="PNG")
+    os.replace(tmp_path, output_path)
+
+# Per-process render resources, loaded once by _init_render_worker.
+_worker_fonts = None; _worker_icons = None
+
+def _init_render_worker(font_family):
+    global _worker_fonts, _worker_icons
+    _worker_fonts = get_fonts(font_family); _worker_icons = load_energy_icons(verbose=False)
+
+def _render_job(card_data, output_path):
+    """Returns (error or None, worker pid, the worker's asset cache stats)."""
+    try: render_card_file(card_data, output_path, _worker_fonts, _worker_icons); error = None
+    except Exception as e: error = f"'{card_data.get('name', 'N/A')}': {e}"
+    return error, os.getpid(), ASSET_CACHE.stats()
+
+def export_cards(cards_data, fonts, energy_icons, output_dir=OUTPUT_DIR, manifest_path=None, force=False,
+                 workers=1, font_family="Arial", progress=None):
+    """Renders only cards whose build hash changed (or whose PNG is missing). Returns (rendered, skipped, errors, cache_stats).
+
+    The manifest defaults to manifest_path_for(output_dir); fonts must be get_fonts(font_family) when given.
+
+    With workers > 1 the stale cards are rendered in a process pool; each worker loads its own fonts and
+    icons from font_family. progress(done, total, card_name) is called after every rendered card.
+    cache_stats sums the asset cache counters of every process that rendered cards.
+    """
+    if not os.path.exists(output_dir): os.makedirs(output_dir)
+    manifest_path = manifest_path or manifest_path_for(output_dir)
+    old_manifest = {} if force else load_manifest(manifest_path)
+    environment_hash = build_environment_hash(font_family, fonts)
+    manifest, stale, skipped, errors = {}, [], 0, []
+    for i, card_data in enumerate(cards_data):
+        filename = f"{card_data.get('id', i)}.png"
+        build_hash = card_build_hash(card_data, environment_hash)
+        if old_manifest.get(filename) == build_hash and os.path.exists(os.path.join(output_dir, filename)):
+            manifest[filename] = build_hash; skipped += 1
+        else: stale.append((card_data, filename, build_hash))
+
+    def finished(done, card_data, filename, build_hash, error):
+        if error: errors.append(error)
+        else: manifest[filename] = build_hash
+        if progress: progress(done, len(stale), card_data.get('name', filename))
+
+    if workers > 1 and len(stale) > 1:
+        worker_stats = {} # pid -> latest cache stats of that worker
+        with ProcessPoolExecutor(max_workers=min(workers, len(stale)), initializer=_init_render_worker, initargs=(font_family,)) as pool:
+            futures = {pool.submit(_render_job, card_data, os.path.join(output_dir, filename)): (card_data, filename, build_hash)
+                       for card_data, filename, build_hash in stale}
+            for done, future in enumerate(as_completed(futures), 1):
+                error, pid, worker_stats[pid] = future.result()
+                finished(done, *futures[future], error)
+        cache_stats = {k: sum(st[k] for st in worker_stats.values()) for k in ASSET_CACHE.stats()}
+    else:
+        for done, (card_data, filename, build_hash) in enumerate(stale, 1):
+            try: render_card_file(card_data, os.path.join(output_dir, filename), fonts, energy_icons); error = None
+            except Exception as e: error = f"'{card_data.get('name', 'N/A')}': {e}"
+            finished(done, card_data, filename, build_hash, error)
+        cache_stats = ASSET_CACHE.stats()
+    save_manifest(manifest, manifest_path) # Entries for deleted or failed cards are dropped
+    return len(stale) - len(errors), skipped, errors, cache_stats
+
+def batch_main(argv=None):
+    """Command-line renderer: python card_generator.py --batch [--workers N] [--force]"""
+    parser = argparse.ArgumentParser(description="Render every card in a card data file without opening the editor.")
+    parser.add_argument("--batch", action="store_true", help="Run the headless batch renderer instead of the editor.")
+    parser.add_argument("--data", default=DATA_FILE, help="Card data JSON file.")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Directory for the rendered PNGs.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--font", default="Arial", help="Font family used for card text.")
+    parser.add_argument("--force", action="store_true", help="Ignore the build manifest and render every card.")
+    args = parser.parse_args(argv)
+    with open(args.data, 'r', encoding='utf-8') as f: cards_data = json.load(f)
+    # The parent only renders when running single-process; workers load their own fonts and icons.
+    fonts, icons = (get_fonts(args.font), load_energy_icons(verbose=False)) if args.workers <= 1 else (None, None)
+    def report(done, total, name): print(f"[{done}/{total}] {name}", flush=True)
+    rendered, skipped, errors, cache_stats = export_cards(cards_data, fonts, icons, args.output, None, args.force, args.workers, args.font, report)
+    for error in errors: print(f"Error: {error}")
+    print(f"Rendered {rendered} cards, {skipped} unchanged, {len(errors)} errors.")
+    if rendered: print(f"Asset cache: {cache_stats}")
+    return 1 if errors else 0
+
 # --- GUI Application ---
 
 class CardEditorApp:
@@ -288,16 +514,7 @@ class CardEditorApp:
         self._setup_menu(); self._setup_layout()
 
     def _load_energy_icons(self):
-        icons = {}
-        all_mappings = {**ENERGY_MAPPING, "N": "energy_neutral.png"}
-        for code, filename in all_mappings.items():
-            try:
-                path = os.path.join(ENERGY_ICON_DIR, filename)
-                icons[code] = Image.open(path).convert("RGBA")
-                print(f"Loaded icon: {path}")
-            except Exception as e:
-                print(f"Warning: Energy icon not found at {path}: {e}")
-        return icons
+        return load_energy_icons()
 
     def _setup_menu(self):
         menubar = tk.Menu(self.root)
@@ -310,6 +527,7 @@ class CardEditorApp:
         file_menu.add_separator()
         file_menu.add_command(label="Export Current Card...", command=self._export_card)
         file_menu.add_command(label="Export All Cards...", command=self._export_all_cards)
+        file_menu.add_command(label="Rebuild All Cards...", command=lambda: self._export_all_cards(force=True))
         file_menu.add_separator(); file_menu.add_command(label="Exit", command=self.root.quit)
         menubar.add_cascade(label="File", menu=file_menu)
         self.root.config(menu=menubar)
@@ -450,16 +668,14 @@ class CardEditorApp:
         try: create_card_image(card_data, self.fonts, self.energy_icons).save(filepath); messagebox.showinfo("Success", f"Card exported to:\n{filepath}")
         except Exception as e: messagebox.showerror("Export Error", f"Could not export card.\nError: {e}")
 
-    def _export_all_cards(self):
+    def _export_all_cards(self, force=False):
+        """Exports changed cards only; force=True ignores the manifest and re-renders everything."""
         if not self.cards_data: return messagebox.showwarning("Warning", "No cards to export.")
-        if not messagebox.askyesno("Confirm Export", f"Export all {len(self.cards_data)} cards?"): return
-        if not os.path.exists(OUTPUT_DIR): os.makedirs(OUTPUT_DIR)
-        errors = []
-        for i, card_data in enumerate(self.cards_data):
-            try: create_card_image(card_data, self.fonts, self.energy_icons).save(os.path.join(OUTPUT_DIR, f"{card_data.get('id', i)}.png"))
-            except Exception as e: errors.append(f"'{card_data.get('name', 'N/A')}': {e}")
+        if not messagebox.askyesno("Confirm Export", f"{'Rebuild' if force else 'Export'} all {len(self.cards_data)} cards?"): return
+        self._update_card_from_fields(silent=True)
+        rendered, skipped, errors, _ = export_cards(self.cards_data, self.fonts, self.energy_icons, force=force)
         if errors: messagebox.showwarning("Export Complete", f"Finished with {len(errors)} errors.")
-        else: messagebox.showinfo("Export Complete", f"Successfully exported {len(self.cards_data)} cards.")
+        else: messagebox.showinfo("Export Complete", f"Rendered {rendered} cards, {skipped} unchanged.")
 
     def _populate_card_list(self):
         self.card_listbox.delete(0, tk.END)
@@ -523,20 +739,7 @@ class CardEditorApp:
     def _update_all_energies(self):
         if not self.cards_data: return messagebox.showwarning("Warning", "No card data loaded.")
         for card_data in self.cards_data:
-            cost_str = card_data.get("cost", "")
-            energy_icons = {}
-            generic_cost_str = ''.join(filter(str.isdigit, cost_str))
-            specific_cost_str = ''.join(filter(str.isalpha, cost_str))
-            
-            if generic_cost_str:
-                energy_icons['N'] = int(generic_cost_str) 
-            
-            for char in specific_cost_str:
-                char = char.upper() 
-                if char in ENERGY_MAPPING:
-                    energy_icons[char] = energy_icons.get(char, 0) + 1
-            
-            card_data["energy_icons"] = energy_icons
+            card_data["energy_icons"] = cost_icons(parse_cost(card_data.get("cost", "")))
         
         self._update_preview()
         messagebox.showinfo("Success", "Energy icons data updated for all cards. Save the JSON to keep changes.")
@@ -642,6 +845,8 @@ class CardEditorApp:
                 self._update_preview()
 
 if __name__ == "__main__":
+    if "--batch" in sys.argv[1:]: sys.exit(batch_main())
+    if tk is None: sys.exit("Tkinter is not available; use --batch to render cards without the editor.")
     root = tk.Tk()
     app = CardEditorApp(root)
     root.mainloop()
@@ -0,0 +1,268 @@
+"""CPU opponents for GameStateManager.
+
+An AI receives the state manager whenever the CPU has a decision to make and returns a
+concurrent.futures.Future resolving to one action: ("channel", hand_slot),
+("play", hand_slot, zone_type, index), ("attack", character slot mask) or PASS, which
+ends the current phase. The manager polls the future from its scheduler, so a search
+running on a worker never blocks the render loop. Blocks are chosen synchronously with
+choose_blocks().
+
+MCTSAI searches CompactGameState clones with a small forward model of the turn structure
+below (automatic phases, draws, combat, end-of-turn discards) and random rollouts.
+"""
+import math
+import os
+import random
+import threading
+import time
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from .combat import CombatEngine
+from .compact_state import CompactGameState, CardTable, EMPTY
+from .gamestate import PHASE_ORDER
+from .legal_moves import PASS, ZONE_BY_NAME, ZONE_CHARACTER, legal_actions, bits
+
+MAIN1, COMBAT, MAIN2, END = (PHASE_ORDER.index(name) for name in ("Main1", "Combat", "Main2", "End"))
+MAX_HAND_SIZE = 6
+
+def _done(result):
+    future = Future(); future.set_result(result)
+    return future
+
+class CpuAI:
+    """Base class: plays nothing and discards at random, like the CPU without an AI."""
+    def request_action(self, state_manager):
+        """Returns a Future with the next action for state_manager.current_player."""
+        return _done(self.choose_action(state_manager))
+
+    def choose_action(self, state_manager):
+        return PASS
+
+    def choose_discard(self, state_manager):
+        """Returns the hand slot of the card the CPU discards at the end of its turn."""
+        return state_manager.rng.randrange(len(state_manager.current_player.hand))
+
+    def choose_blocks(self, state_manager):
+        """Returns blocks against state_manager.pending_attack (see GameStateManager.declare_blocks)."""
+        return state_manager.suggest_blocks()
+
+    def shutdown(self):
+        pass
+
+class RandomAI(CpuAI):
+    """Channels once per turn and plays cards to random free zones, like headless.RandomPolicy."""
+    def __init__(self, table):
+        self.table = table
+
+    def choose_action(self, state_manager):
+        state = CompactGameState.from_manager(state_manager, self.table.registry)
+        return rollout_action(state, self.table, state_manager.rng)
+
+# --- Forward model over CompactGameState ---
+def compact_actions(state, table):
+    """legal_actions() as a list, keeping one action per duplicate card in hand to narrow the search."""
+    hand = state.players[state.turn_index].hand
+    actions = []; seen = set()
+    for action in legal_actions(state, table):
+        key = (action[0], hand[action[1]]) + action[2:] if action[0] in ("channel", "play") else action
+        if key not in seen: seen.add(key); actions.append(action)
+    return actions
+
+def rollout_action(state, table, rng):
+    """A cheap random move: channel first, then any play, and pass once nothing is left. In combat, a random attack or none."""
+    actions = compact_actions(state, table)
+    if len(actions) == 1: return PASS
+    if state.phase_index == COMBAT: return rng.choice((PASS, rng.choice(actions)))
+    channels = [a for a in actions if a[0] == "channel"]
+    if channels: return rng.choice(channels)
+    plays = [a for a in actions if a[0] == "play"]
+    return rng.choice(plays) if plays else PASS
+
+def apply_compact(state, action, table, rng):
+    """Applies an action to a compact state; PASS advances to the next decision point."""
+    if action[0] == "pass":
+        advance(state, table, rng)
+        return
+    me = state.players[state.turn_index]
+    if action[0] == "attack":
+        attack(state, action[1], table)
+        if state.winner is None: advance(state, table, rng)
+        return
+    number = me.hand.pop(action[1]); me.moves.remove_from_hand(action[1])
+    if action[0] == "channel":
+        me.reiryoku_zone.append(number); me.energy.add(table.energy[number]); me.has_channeled_this_turn = True
+        return
+    me.pay_cost(table.cost[number], table)
+    if action[2] == "character": me.character_zones[action[3]] = number
+    elif action[2] == "support": me.support_zones[action[3]] = number
+    else: me.field_card_zone = number
+    me.moves.occupy(ZONE_BY_NAME[action[2]], action[3])
+
+_local = threading.local() # One CombatEngine per searching thread
+
+def attack(state, attack_mask, table):
+    """Resolves an attack on a compact state, with the defender blocking greedily."""
+    engine = getattr(_local, "engine", None)
+    if engine is None: engine = _local.engine = CombatEngine()
+    me = state.players[state.turn_index]; opponent = state.players[1 - state.turn_index]
+    me.exhausted |= attack_mask; me.moves.exhausted |= attack_mask
+    engine.load_compact(me, opponent, table)
+    blocks = engine.choose_blocks(attack_mask, opponent.moves.ready_characters(), opponent.life_points)
+    life, destroyed_attackers, destroyed_blockers = engine.evaluate(attack_mask, blocks)
+    opponent.life_points -= life
+    for player, destroyed in ((me, destroyed_attackers), (opponent, destroyed_blockers)):
+        for slot in bits(destroyed):
+            player.soul_burial.append(player.character_zones[slot]); player.character_zones[slot] = EMPTY
+            player.exhausted &= ~(1 << slot); player.moves.vacate(ZONE_CHARACTER, slot)
+    if opponent.life_points <= 0: state.winner = state.turn_index
+
+def advance(state, table, rng):
+    """Leaves the current phase and runs automatic phases until a player has a decision (or the game ends)."""
+    state.phase_index += 1
+    while state.winner is None:
+        me = state.players[state.turn_index]
+        if state.phase_index == END:
+            while len(me.hand) > MAX_HAND_SIZE:
+                slot = rng.randrange(len(me.hand)); me.hand.pop(slot); me.moves.remove_from_hand(slot)
+            state.phase_index = 0
+            state.turn_index ^= 1
+            if state.turn_index == 0: state.first_turn = False
+            state.turn_number += 1
+            state.players[state.turn_index].has_channeled_this_turn = False
+            continue
+        if state.phase_index == 0: me.exhausted = 0; me.moves.exhausted = 0; me.reiryoku_exhausted = 0; me.reset_energy(table)
+        elif state.phase_index == MAIN1 - 1: # Draw
+            if not (state.turn_index == 0 and state.first_turn):
+                if not me.deck: state.winner = 1 - state.turn_index; return
+                number = me.deck.pop(); me.hand.append(number); me.moves.add_to_hand(table.zone[number])
+        elif state.phase_index >= MAIN1: return
+        state.phase_index += 1
+
+def determinize(state, seat, table, rng):
+    """Reshuffles what seat cannot see: its own deck order and the opponent's hand and deck."""
+    own = state.players[seat]; opponent = state.players[1 - seat]
+    deck = own.deck.tolist(); rng.shuffle(deck); own.deck = array('H', deck)
+    hidden = opponent.hand.tolist() + opponent.deck.tolist(); rng.shuffle(hidden)
+    hand_size = len(opponent.hand)
+    opponent.hand = array('H', hidden[:hand_size]); opponent.deck = array('H', hidden[hand_size:])
+    opponent.index_moves(table)
+
+def evaluate(state, seat, table):
+    """Heuristic win probability for seat: life, board strength, resources and deck, squashed to 0..1."""
+    if state.winner is not None: return 1.0 if state.winner == seat else 0.0
+    score = 0.0
+    for sign, p in ((1, state.players[seat]), (-1, state.players[1 - seat])):
+        board = sum(table.reiatsu[n] + table.genryu[n] for n in p.character_zones) / 1000
+        board += 0.5 * sum(1 for n in p.support_zones if n != EMPTY) + (0.5 if p.field_card_zone != EMPTY else 0)
+        score += sign * (0.2 * p.life_points + 0.3 * board + 0.3 * len(p.reiryoku_zone) + 0.1 * len(p.hand) + 0.02 * len(p.deck))
+    return 1 / (1 + math.exp(-score))
+
+# --- Monte Carlo tree search ---
+class _Node:
+    __slots__ = ("children", "untried", "visits", "value")
+
+    def __init__(self, actions):
+        self.children = {} # action -> _Node
+        self.untried = actions
+        self.visits = 0
+        self.value = 0.0
+
+def search(state, table, time_budget_ms=250, max_iterations=None, seed=None, rollout_turns=4, exploration=1.4):
+    """Runs MCTS from state for the player to move and returns (best action, iterations run).
+
+    The tree covers the mover's own decisions for the rest of the turn, which are fully
+    known; each iteration determinizes the hidden cards, then plays random rollouts for
+    rollout_turns turns and scores the result with evaluate(). Stops at whichever of the
+    time budget or max_iterations comes first, so at least one of them must be set. Safe to
+    run on a worker thread or process: it only reads the state and table it is given.
+    """
+    if not time_budget_ms and max_iterations is None: raise ValueError("MCTS search needs a time budget or an iteration cap.")
+    rng = random.Random(seed)
+    seat = state.turn_index
+    root = _Node(compact_actions(state, table))
+    if len(root.untried) == 1: return root.untried[0], 0
+    deadline = time.perf_counter() + time_budget_ms / 1000 if time_budget_ms else float('inf')
+    iterations = 0
+    while (max_iterations is None or iterations < max_iterations) and (iterations == 0 or time.perf_counter() < deadline):
+        iterations += 1
+        sim = state.clone(); determinize(sim, seat, table, rng)
+        turn = sim.turn_number
+        node = root; path = [root]
+        # Selection: follow UCB1 while every move here has been tried and it is still our turn.
+        while not node.untried and node.children and sim.turn_number == turn and sim.winner is None:
+            log_visits = math.log(node.visits)
+            action, node = max(node.children.items(),
+                               key=lambda item: item[1].value / item[1].visits + exploration * math.sqrt(log_visits / item[1].visits))
+            apply_compact(sim, action, table, rng); path.append(node)
+        # Expansion
+        if node.untried and sim.turn_number == turn and sim.winner is None:
+            action = node.untried.pop(rng.randrange(len(node.untried)))
+            apply_compact(sim, action, table, rng)
+            child = node.children[action] = _Node(compact_actions(sim, table) if sim.turn_number == turn else [])
+            node = child; path.append(node)
+        # Rollout
+        while sim.winner is None and sim.turn_number < turn + rollout_turns:
+            apply_compact(sim, rollout_action(sim, table, rng), table, rng)
+        value = evaluate(sim, seat, table)
+        for visited in path:
+            visited.visits += 1; visited.value += value
+    best = max(root.children.items(), key=lambda item: item[1].visits)[0] if root.children else PASS
+    return best, iterations
+
+def _lower_priority():
+    """Runs in the search process: yields the CPU to the render loop when both compete for one core."""
+    if hasattr(os, "nice"): os.nice(10)
+
+class MCTSAI(CpuAI):
+    """Chooses each CPU move by Monte Carlo tree search within a per-move time budget.
+
+    Searches run in a single background process (or on `executor`) unless the manager's
+    scheduler is in zero-delay mode, where they run inline so headless games stay
+    deterministic when max_iterations is set. A process rather than a thread, as the
+    search is pure Python and would hold the GIL, stalling the render loop.
+    """
+    def __init__(self, table, time_budget_ms=250, max_iterations=None, rollout_turns=4, executor=None):
+        if not time_budget_ms and max_iterations is None: raise ValueError("MCTSAI needs a time budget or an iteration cap.")
+        self.table = table
+        self.time_budget_ms = time_budget_ms
+        self.max_iterations = max_iterations
+        self.rollout_turns = rollout_turns
+        self.executor = executor
+        self.last_iterations = 0
+
+    @classmethod
+    def from_catalog(cls, catalog, **options):
+        return cls(CardTable.from_catalog(catalog), **options)
+
+    def start(self):
+        """Starts the search process ahead of the first move (call it early, before other threads are running)."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=1, initializer=_lower_priority)
+            self.executor.submit(int) # The pool only starts its process on the first submit
+
+    def request_action(self, state_manager):
+        state = CompactGameState.from_manager(state_manager, self.table.registry)
+        seed = state_manager.rng.randrange(2**32)
+        args = (state, self.table, self.time_budget_ms, self.max_iterations, seed, self.rollout_turns)
+        if state_manager.scheduler.zero_delay:
+            return _done(self._finish(search(*args)))
+        self.start()
+        future = Future()
+        self.executor.submit(search, *args).add_done_callback(lambda done: self._resolve(done, future))
+        return future
+
+    def _finish(self, result):
+        action, self.last_iterations = result
+        return action
+
+    def _resolve(self, done, future):
+        try: future.set_result(self._finish(done.result()))
+        except Exception as e: future.set_exception(e)
+
+    def choose_discard(self, state_manager):
+        """Discards the weakest card in hand (by printed Reiatsu + Genryu)."""
+        hand = state_manager.current_player.hand
+        return min(range(len(hand)), key=lambda slot: hand[slot].reiatsu + hand[slot].genryu)
+
+    def shutdown(self):
+        if self.executor: self.executor.shutdown(wait=False, cancel_futures=True)
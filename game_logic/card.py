@@ -1,22 +1,152 @@
 import pygame
 import os
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .costs import parse_cost
+from .effects import compile_rules
+
+def parse_stat(value):
+    """Reiatsu/Genryu as an int; non-character cards have empty stats, which count as 0."""
+    try: return int(value)
+    except (TypeError, ValueError): return 0
+
+class ScaledImageCache:
+    """An LRU cache of scaled/rotated card surfaces, shared by every Card with the same id."""
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict() # (card_id, size, rotation) -> (surface, byte_size)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, render):
+        """Returns the cached surface for key, calling render() to build it on a miss."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        surface = render()
+        byte_size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        if byte_size <= self.max_bytes:
+            self.entries[key] = (surface, byte_size)
+            self.current_bytes += byte_size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return surface
+
+    def invalidate(self, card_id):
+        """Drops every cached variant of a card, e.g. after its source image changed."""
+        for key in [k for k in self.entries if k[0] == card_id]:
+            _, byte_size = self.entries.pop(key)
+            self.current_bytes -= byte_size
+
+    def clear(self):
+        self.entries.clear(); self.current_bytes = 0
+
+    def stats(self):
+        """Returns the cache counters as a dictionary for debug displays."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.entries), "bytes": self.current_bytes}
+
+class CardImageLoader:
+    """Decodes card images on first use, with a thread pool to prefetch cards that are about to be drawn.
+
+    Worker threads only decode the PNG; conversion to the display format and placeholder
+    rendering need the display and fonts, so they always happen on the main thread.
+    """
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.executor = None # Created on the first prefetch
+        self.pending = {} # image path -> Future of the decoded (unconverted) surface
+        self.surfaces = {} # image path -> converted surface, shared by every copy of a card
+        self.decodes = 0
+        self.prefetch_hits = 0
+
+    @staticmethod
+    def _decode(image_path):
+        try:
+            return pygame.image.load(image_path)
+        except (pygame.error, FileNotFoundError):
+            return None
+
+    def prefetch(self, cards):
+        """Starts decoding the images of the given cards in the background."""
+        for card in cards:
+            image_path = card.image_path
+            if not image_path or image_path in self.surfaces or image_path in self.pending: continue
+            if self.executor is None: self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="card-image")
+            self.pending[image_path] = self.executor.submit(self._decode, image_path)
+
+    def get(self, card):
+        """Returns the card's converted surface, waiting for a prefetch in flight or decoding it now."""
+        image_path = card.image_path
+        if (surface := self.surfaces.get(image_path)) is not None: return surface
+        future = self.pending.pop(image_path, None)
+        if future is not None: self.prefetch_hits += 1
+        raw = future.result() if future is not None else self._decode(image_path)
+        self.decodes += 1
+        if raw is None:
+            surface = card.create_placeholder_image()
+        else:
+            try: surface = raw.convert_alpha()
+            except pygame.error: surface = raw # No display mode set (e.g. tools); use the decoded surface as-is
+        self.surfaces[image_path] = surface
+        return surface
+
+    def shutdown(self):
+        if self.executor: self.executor.shutdown(wait=False, cancel_futures=True); self.executor = None
+        self.pending.clear()
 
 class Card:
-    def __init__(self, data, images_dir):
+    # Shared by all Card instances so duplicate copies of a card reuse the same scaled surfaces.
+    scaled_cache = ScaledImageCache()
+    image_loader = CardImageLoader()
+    _instance_ids = itertools.count(1)
+
+    def __init__(self, data, images_dir=None):
         self.data = data
         self.images_dir = images_dir
-        self.image = self.load_image()
+        self._image = None # Decoded on first access; never loaded without an images_dir (headless)
         self.is_exhausted = False # For tracking tapped/used state
+        self.instance_id = next(Card._instance_ids) # Unique handle for this physical copy
+        self.cost = parse_cost(data.get("cost")) # (generic, W, B, U, G) vector, parsed once at load
+        self.reiatsu = parse_stat(data.get("reiatsu")); self.genryu = parse_stat(data.get("genryu")) # Printed stats
+        self.effects = compile_rules(data.get("rules_text")) # {trigger: effects}, compiled once per distinct text
+
+    def new_instance(self):
+        """Returns another physical copy of this card that shares its data and image but has its own state."""
+        copy = Card.__new__(Card)
+        copy.data = self.data
+        copy.images_dir = self.images_dir
+        copy._image = self._image
+        copy.is_exhausted = False
+        copy.instance_id = next(Card._instance_ids)
+        copy.cost = self.cost
+        copy.reiatsu = self.reiatsu; copy.genryu = self.genryu
+        copy.effects = self.effects
+        return copy
+
+    @property
+    def image_path(self):
+        return os.path.join(self.images_dir, f"{self.data.get('id')}.png") if self.images_dir else None
+
+    @property
+    def image(self):
+        """The full-size card surface, loaded from the generated_cards folder on first access."""
+        if self._image is None and self.images_dir:
+            self._image = self.load_image()
+        return self._image
 
     def load_image(self):
-        """Loads the card's image from the generated_cards folder."""
-        try:
-            card_id = self.data.get("id")
-            image_path = os.path.join(self.images_dir, f"{card_id}.png")
-            return pygame.image.load(image_path).convert_alpha()
-        except pygame.error as e:
-            # print(f"Could not load image for {self.data.get('name')}: {e}")
-            return self.create_placeholder_image()
+        """Loads the card's image from the generated_cards folder (or a placeholder if it is missing)."""
+        return Card.image_loader.get(self)
 
     def create_placeholder_image(self):
         """Creates a placeholder surface if the card image is not found."""
@@ -28,13 +158,24 @@ class Card:
         placeholder.blit(text_surf, text_rect)
         return placeholder
 
-    def get_preview_image(self, size):
+    def get_scaled_image(self, size, rotation=0):
+        """Returns the card image scaled to size and rotated, served from the shared cache."""
+        size = (int(size[0]), int(size[1]))
+        key = (self.data.get("id"), size, rotation % 360)
+        return Card.scaled_cache.get(key, lambda: self.render_scaled_image(size, rotation))
+
+    def render_scaled_image(self, size, rotation=0):
+        """Scales and rotates the card image without caching, for owners that keep their own copy (e.g. the sprite atlas)."""
+        scaled = pygame.transform.scale(self.image, size)
+        return pygame.transform.rotate(scaled, rotation) if rotation % 360 else scaled
+
+    def get_preview_image(self, size, rotation=0):
         """Returns a scaled version of the card image for preview."""
-        return pygame.transform.scale(self.image, size)
+        return self.get_scaled_image(size, rotation)
 
-    def get_hand_image(self, size):
+    def get_hand_image(self, size, rotation=0):
         """Returns a scaled version of the card image for display in hand/field."""
-        return pygame.transform.scale(self.image, size)
+        return self.get_scaled_image(size, rotation)
 
     def get_details(self):
         """Returns a dictionary of important card details for display."""
@@ -0,0 +1,134 @@
+"""Combat resolution over the 5-slot character zones (see COMBAT in Rules.txt).
+
+The active player declares attackers as a bitmask of character slots; the defender
+assigns at most one ready blocker per attacker (`blocks[attacker slot]` is the blocking
+slot or NO_BLOCK). All pairs then deal damage simultaneously in one pass. A character is
+destroyed once the damage it took this turn reaches its Genryu, and unblocked attackers
+deal their Reiatsu to the defender's Life Points, scaled by REIATSU_PER_LIFE_POINT.
+"""
+from array import array
+
+SLOTS = 5
+ALL_SLOTS = (1 << SLOTS) - 1
+NO_BLOCK = 0xFF
+# Life Points start at 30 while Reiatsu is in the thousands; each started 1000 Reiatsu costs 1 LP.
+REIATSU_PER_LIFE_POINT = 1000
+
+def life_damage(reiatsu):
+    return -(-reiatsu // REIATSU_PER_LIFE_POINT) if reiatsu > 0 else 0
+
+def slots_of(mask):
+    """Slots set in a character bitmask, lowest first."""
+    return [slot for slot in range(SLOTS) if mask >> slot & 1]
+
+class CombatEngine:
+    """Resolves combats in one pass over preallocated per-slot buffers.
+
+    Load the two sides with load_players (live game) or load_compact (search states), then
+    call evaluate() for the outcome without side effects, or resolve() to also add the
+    damage to the loaded per-turn accumulators. Neither allocates per combat, so AI search
+    can reuse one engine for thousands of evaluations per move.
+    """
+    __slots__ = ("att_reiatsu", "att_genryu", "att_damage", "def_reiatsu", "def_genryu", "def_damage",
+                 "att_present", "def_present", "blocks", "dealt_att", "dealt_def")
+
+    def __init__(self):
+        for name in ("att_reiatsu", "att_genryu", "att_damage", "def_reiatsu", "def_genryu", "def_damage", "dealt_att", "dealt_def"):
+            setattr(self, name, array('i', [0] * SLOTS))
+        self.att_present = 0; self.def_present = 0 # Bitmasks of occupied character slots
+        self.blocks = bytearray([NO_BLOCK] * SLOTS)
+
+    # --- Loading ---
+    def load_players(self, attacker, defender, reiatsu_of, genryu_of):
+        """Loads two Players; reiatsu_of/genryu_of(player, slot) give each character's current stats."""
+        for player, reiatsu, genryu, damage, side in ((attacker, self.att_reiatsu, self.att_genryu, self.att_damage, "att"),
+                                                      (defender, self.def_reiatsu, self.def_genryu, self.def_damage, "def")):
+            present = 0
+            for slot, card in enumerate(player.character_zones):
+                if card: present |= 1 << slot; reiatsu[slot] = reiatsu_of(player, slot); genryu[slot] = genryu_of(player, slot)
+                else: reiatsu[slot] = genryu[slot] = 0
+                damage[slot] = player.damage_taken[slot]
+            setattr(self, f"{side}_present", present)
+
+    def load_compact(self, attacker, defender, table):
+        """Loads two CompactPlayerStates with printed stats; search states start each combat undamaged."""
+        reiatsu_table, genryu_table = table.reiatsu, table.genryu
+        present = 0
+        for slot, number in enumerate(attacker.character_zones):
+            self.att_reiatsu[slot] = reiatsu_table[number]; self.att_genryu[slot] = genryu_table[number]; self.att_damage[slot] = 0
+            if number: present |= 1 << slot
+        self.att_present = present; present = 0
+        for slot, number in enumerate(defender.character_zones):
+            self.def_reiatsu[slot] = reiatsu_table[number]; self.def_genryu[slot] = genryu_table[number]; self.def_damage[slot] = 0
+            if number: present |= 1 << slot
+        self.def_present = present
+
+    # --- Blocking ---
+    def clear_blocks(self):
+        blocks = self.blocks
+        for slot in range(SLOTS): blocks[slot] = NO_BLOCK
+
+    def choose_blocks(self, attack_mask, ready_mask, life_points):
+        """Fills `blocks` with a greedy defence and returns it.
+
+        The strongest attackers are considered first. Each gets the weakest ready blocker
+        that survives it, preferring one that also destroys it. If the attackers left
+        unblocked would be lethal, the remaining blockers are thrown in front of the largest.
+        """
+        self.clear_blocks()
+        blocks = self.blocks; att_reiatsu = self.att_reiatsu
+        available = ready_mask & self.def_present
+        attackers = sorted(slots_of(attack_mask & self.att_present), key=att_reiatsu.__getitem__, reverse=True)
+        for slot in attackers:
+            best = None; best_key = None
+            for blocker in slots_of(available):
+                if self.def_genryu[blocker] - self.def_damage[blocker] <= att_reiatsu[slot]: continue # Would not survive
+                destroys = self.def_reiatsu[blocker] >= self.att_genryu[slot] - self.att_damage[slot]
+                key = (not destroys, self.def_genryu[blocker])
+                if best_key is None or key < best_key: best, best_key = blocker, key
+            if best is not None: blocks[slot] = best; available &= ~(1 << best)
+        unblocked = sum(life_damage(att_reiatsu[slot]) for slot in attackers if blocks[slot] == NO_BLOCK)
+        for slot in attackers:
+            if unblocked < life_points or not available: break
+            if blocks[slot] != NO_BLOCK: continue
+            blocker = (available & -available).bit_length() - 1
+            blocks[slot] = blocker; available &= ~(1 << blocker); unblocked -= life_damage(att_reiatsu[slot])
+        return blocks
+
+    # --- Resolution ---
+    def evaluate(self, attack_mask, blocks=None):
+        """Returns (life damage to the defender, destroyed attacker mask, destroyed defender mask) without side effects."""
+        blocks = self.blocks if blocks is None else blocks
+        dealt_att = self.dealt_att; dealt_def = self.dealt_def
+        for slot in range(SLOTS): dealt_att[slot] = dealt_def[slot] = 0
+        life = 0
+        attack_mask &= self.att_present
+        for slot in range(SLOTS):
+            if not attack_mask >> slot & 1: continue
+            blocker = blocks[slot]
+            if blocker == NO_BLOCK or not self.def_present >> blocker & 1:
+                life += life_damage(self.att_reiatsu[slot])
+            else:
+                dealt_def[blocker] += self.att_reiatsu[slot]; dealt_att[slot] += self.def_reiatsu[blocker]
+        destroyed_att = destroyed_def = 0
+        for slot in range(SLOTS):
+            if dealt_att[slot] and self.att_damage[slot] + dealt_att[slot] >= self.att_genryu[slot]: destroyed_att |= 1 << slot
+            if dealt_def[slot] and self.def_damage[slot] + dealt_def[slot] >= self.def_genryu[slot]: destroyed_def |= 1 << slot
+        return life, destroyed_att, destroyed_def
+
+    def resolve(self, attack_mask, blocks=None):
+        """evaluate(), then adds the damage dealt to the loaded accumulators. Per-slot damage is left in dealt_att/dealt_def."""
+        result = self.evaluate(attack_mask, blocks)
+        for slot in range(SLOTS):
+            self.att_damage[slot] += self.dealt_att[slot]; self.def_damage[slot] += self.dealt_def[slot]
+        return result
+
+def validate_blocks(blocks, attack_mask, ready_blockers):
+    """True if every blocker is a ready defending character blocking one declared attacker."""
+    used = 0
+    for slot in range(SLOTS):
+        blocker = blocks[slot]
+        if blocker == NO_BLOCK: continue
+        if not attack_mask >> slot & 1 or not 0 <= blocker < SLOTS or not ready_blockers >> blocker & 1 or used >> blocker & 1: return False
+        used |= 1 << blocker
+    return True
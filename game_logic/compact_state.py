@@ -0,0 +1,194 @@
+from array import array
+from collections import deque
+from .costs import NO_COST, EnergyPool, reiryoku_energy, sources_to_exhaust
+from .legal_moves import MoveIndex, ZONE_NONE, ZONE_CHARACTER, ZONE_SUPPORT, ZONE_FIELD, ZONE_FOR_TYPE_CODE
+
+EMPTY = 0 # Interned number of an empty zone slot; real cards are numbered from 1
+FIELD_SLOT = 10 # Bit of the field card in CompactPlayerState.exhausted (0-4 characters, 5-9 supports)
+CHARACTER_SLOTS = 0x1F # Character bits of CompactPlayerState.exhausted, which MoveIndex.exhausted mirrors
+
+class CardRegistry:
+    """Interns string card ids to small integers (1..n) and back."""
+    def __init__(self, card_ids=()):
+        self.ids = [None] # number -> card id; slot 0 is EMPTY
+        self.numbers = {} # card id -> number
+        for card_id in card_ids: self.intern(card_id)
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        """Builds a registry with stable numbering (sorted ids) for a {id: Card} catalog."""
+        return cls(sorted(catalog))
+
+    def __len__(self):
+        return len(self.ids) - 1
+
+    def intern(self, card_id):
+        number = self.numbers.get(card_id)
+        if number is None:
+            number = self.numbers[card_id] = len(self.ids)
+            self.ids.append(card_id)
+        return number
+
+    def number(self, card):
+        """Returns the interned number of a Card (or EMPTY for None)."""
+        return self.intern(card.data["id"]) if card else EMPTY
+
+    def card_id(self, number):
+        return self.ids[number]
+
+class CardTable:
+    """Per-number card attributes, so rules code running on interned numbers never touches Card dicts.
+
+    Indexed by registry number (index 0 is EMPTY): `zone` holds the ZONE_* code of the
+    card's type, `reiatsu` and `genryu` its printed stats, `cost` its costs vector and
+    `energy` what it provides in the reiryoku zone (costs.reiryoku_energy).
+    """
+    def __init__(self, registry, catalog):
+        self.registry = registry
+        self.zone = bytearray(len(registry.ids)); self.cost = [NO_COST] * len(registry.ids); self.energy = [NO_COST] * len(registry.ids)
+        self.reiatsu = array('i', [0] * len(registry.ids)); self.genryu = array('i', [0] * len(registry.ids))
+        for number, card_id in enumerate(registry.ids):
+            card = catalog.get(card_id) if card_id else None
+            if card is None: continue
+            self.zone[number] = ZONE_FOR_TYPE_CODE.get(card.data.get("type"), ZONE_NONE)
+            self.reiatsu[number] = card.reiatsu; self.genryu[number] = card.genryu
+            self.cost[number] = card.cost; self.energy[number] = reiryoku_energy(card)
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        return cls(CardRegistry.from_catalog(catalog), catalog)
+
+class CompactPlayerState:
+    """One player's zones as arrays of interned card numbers.
+
+    The deck is stored bottom-to-top so drawing is an O(1) pop() from the end.
+    `exhausted` is a bitmask over the field slots (see FIELD_SLOT) and `reiryoku_exhausted`
+    one over the reiryoku zone; `energy` is the pool of the ready reiryoku cards. `moves` is
+    the legal_moves.MoveIndex, copied from the Player or rebuilt with index_moves().
+    """
+    __slots__ = ("hand", "deck", "soul_burial", "reiryoku_zone", "character_zones", "support_zones",
+                 "field_card_zone", "exhausted", "reiryoku_exhausted", "energy", "life_points", "has_channeled_this_turn", "moves")
+
+    def __init__(self):
+        self.hand = array('H'); self.deck = array('H'); self.soul_burial = array('H'); self.reiryoku_zone = array('H')
+        self.character_zones = array('H', [EMPTY] * 5); self.support_zones = array('H', [EMPTY] * 5)
+        self.field_card_zone = EMPTY
+        self.exhausted = 0
+        self.reiryoku_exhausted = 0
+        self.energy = EnergyPool()
+        self.life_points = 30
+        self.has_channeled_this_turn = False
+        self.moves = MoveIndex()
+
+    def clone(self):
+        copy = CompactPlayerState.__new__(CompactPlayerState)
+        copy.hand = self.hand[:]; copy.deck = self.deck[:]; copy.soul_burial = self.soul_burial[:]; copy.reiryoku_zone = self.reiryoku_zone[:]
+        copy.character_zones = self.character_zones[:]; copy.support_zones = self.support_zones[:]
+        copy.field_card_zone = self.field_card_zone
+        copy.exhausted = self.exhausted
+        copy.reiryoku_exhausted = self.reiryoku_exhausted; copy.energy = self.energy.clone()
+        copy.life_points = self.life_points
+        copy.has_channeled_this_turn = self.has_channeled_this_turn
+        copy.moves = self.moves.clone()
+        return copy
+
+    def index_moves(self, table):
+        """Rebuilds `moves` from the zones, for states assembled without a Player (e.g. decoded saves)."""
+        self.moves.rebuild((table.zone[n] for n in self.hand), {
+            ZONE_CHARACTER: [n != EMPTY for n in self.character_zones], ZONE_SUPPORT: [n != EMPTY for n in self.support_zones],
+            ZONE_FIELD: [self.field_card_zone != EMPTY]}, self.exhausted & CHARACTER_SLOTS)
+
+    def reset_energy(self, table):
+        """Recomputes `energy` from the ready reiryoku cards."""
+        self.energy = EnergyPool()
+        for i, number in enumerate(self.reiryoku_zone):
+            if not self.reiryoku_exhausted >> i & 1: self.energy.add(table.energy[number])
+
+    def pay_cost(self, cost, table):
+        """Pays a cost vector, exhausting the reiryoku cards that provide it (see Player.pay_cost). Returns True if paid."""
+        spent = self.energy.pay(cost)
+        if spent is None: return False
+        ready = ((i, table.energy[n]) for i, n in enumerate(self.reiryoku_zone) if not self.reiryoku_exhausted >> i & 1)
+        for i in sources_to_exhaust(spent, ready): self.reiryoku_exhausted |= 1 << i
+        return True
+
+    @classmethod
+    def from_player(cls, player, registry):
+        state = cls()
+        number = registry.number
+        state.hand = array('H', [number(c) for c in player.hand])
+        state.deck = array('H', [number(c) for c in reversed(player.deck)])
+        state.soul_burial = array('H', [number(c) for c in player.soul_burial])
+        state.reiryoku_zone = array('H', [number(c) for c in player.reiryoku_zone])
+        state.character_zones = array('H', [number(c) for c in player.character_zones])
+        state.support_zones = array('H', [number(c) for c in player.support_zones])
+        state.field_card_zone = number(player.field_card_zone)
+        field_cards = list(player.character_zones) + list(player.support_zones) + [player.field_card_zone]
+        state.exhausted = sum(1 << slot for slot, card in enumerate(field_cards) if card and card.is_exhausted)
+        state.reiryoku_exhausted = sum(1 << i for i, card in enumerate(player.reiryoku_zone) if card.is_exhausted)
+        state.energy = player.energy.clone()
+        state.life_points = player.life_points
+        state.has_channeled_this_turn = player.has_channeled_this_turn
+        state.moves = player.moves.clone()
+        return state
+
+    def apply_to(self, player, registry, catalog):
+        """Writes this state back into a Player, creating fresh instances of cards from a {id: Card} catalog."""
+        card = lambda number: catalog[registry.card_id(number)].new_instance() if number != EMPTY else None
+        player.hand = [card(n) for n in self.hand]
+        player.deck = deque(card(n) for n in reversed(self.deck))
+        player.soul_burial = [card(n) for n in self.soul_burial]
+        player.reiryoku_zone = [card(n) for n in self.reiryoku_zone]
+        player.character_zones = [card(n) for n in self.character_zones]
+        player.support_zones = [card(n) for n in self.support_zones]
+        player.field_card_zone = card(self.field_card_zone)
+        for slot, field_card in enumerate(player.character_zones + player.support_zones + [player.field_card_zone]):
+            if field_card: field_card.is_exhausted = bool(self.exhausted >> slot & 1)
+        for i, reiryoku_card in enumerate(player.reiryoku_zone): reiryoku_card.is_exhausted = bool(self.reiryoku_exhausted >> i & 1)
+        player.life_points = self.life_points; player.reset_damage() # Damage is per turn and not part of a snapshot
+        player.has_channeled_this_turn = self.has_channeled_this_turn
+        player.rebuild_moves(); player.reset_energy()
+
+class CompactGameState:
+    """A cheap-to-clone snapshot of a whole game, for search-based AI and simulation."""
+    __slots__ = ("players", "turn_index", "phase_index", "first_turn", "turn_number", "winner")
+
+    def __init__(self, players=None):
+        self.players = players or [CompactPlayerState(), CompactPlayerState()]
+        self.turn_index = 0
+        self.phase_index = 0
+        self.first_turn = True
+        self.turn_number = 0
+        self.winner = None # Seat index of the winner once the game is over
+
+    def clone(self):
+        copy = CompactGameState.__new__(CompactGameState)
+        copy.players = [self.players[0].clone(), self.players[1].clone()]
+        copy.turn_index = self.turn_index
+        copy.phase_index = self.phase_index
+        copy.first_turn = self.first_turn
+        copy.turn_number = self.turn_number
+        copy.winner = self.winner
+        return copy
+
+    @classmethod
+    def from_manager(cls, state_manager, registry):
+        """Captures the current state of a GameStateManager and its players."""
+        state = cls([CompactPlayerState.from_player(p, registry) for p in state_manager.players])
+        state.turn_index = state_manager.turn_index
+        state.phase_index = state_manager.phase_index
+        state.first_turn = state_manager.first_turn
+        state.turn_number = state_manager.turn_number
+        state.winner = None if state_manager.winner is None else state_manager.players.index(state_manager.winner)
+        return state
+
+    def apply_to(self, state_manager, registry, catalog):
+        """Restores this snapshot into a GameStateManager and its players."""
+        for compact, player in zip(self.players, state_manager.players):
+            compact.apply_to(player, registry, catalog)
+        state_manager.turn_index = self.turn_index
+        state_manager.phase_index = self.phase_index
+        state_manager.first_turn = self.first_turn
+        state_manager.turn_number = self.turn_number
+        state_manager.winner = None if self.winner is None else state_manager.players[self.winner]
+        state_manager.effects.rebuild()
@@ -0,0 +1,110 @@
+"""Card costs and energy pools as fixed-size count vectors.
+
+A cost such as "4BB" is a generic amount, payable with energy of any color, followed by
+specific letters that must each be paid with energy of that color (see Rules.txt). Both
+costs and pools are vectors indexed by ENERGY_TYPES: in a cost, slot 0 holds the generic
+amount; in a pool, it holds Neutral energy, which can only pay generic costs.
+"""
+ENERGY_TYPES = ("N", "W", "B", "U", "G")
+ENERGY_INDEX = {code: i for i, code in enumerate(ENERGY_TYPES)}
+GENERIC = 0
+NO_COST = (0, 0, 0, 0, 0)
+FACTION_ENERGY = {"Soul Reaper": "W", "Arrancar": "B", "Quincy": "U", "Human": "G"} # Rules.txt color of each faction
+
+_parsed = {} # cost string -> vector; the card pool only has a few dozen distinct costs
+
+def parse_cost(cost_string):
+    """Returns the (generic, W, B, U, G) vector of a cost string, parsing each distinct string once."""
+    cost = _parsed.get(cost_string)
+    if cost is None:
+        counts = [0] * len(ENERGY_TYPES)
+        digits = ''.join(filter(str.isdigit, cost_string or ''))
+        counts[GENERIC] = int(digits) if digits else 0
+        for char in (cost_string or '').upper():
+            if char == "N": counts[GENERIC] += 1 # A Neutral pip is payable with any energy, so it adds to the generic amount
+            elif char in ENERGY_INDEX: counts[ENERGY_INDEX[char]] += 1
+        cost = _parsed[cost_string] = tuple(counts)
+    return cost
+
+def cost_icons(cost):
+    """{energy code: count} of the non-zero entries of a cost vector, as stored in a card's energy_icons."""
+    return {code: count for code, count in zip(ENERGY_TYPES, cost) if count}
+
+def can_pay(pool, cost):
+    """True if pool covers cost: each specific color from its own energy, the generic amount from what is left."""
+    spare = pool[GENERIC]
+    for i in range(1, len(ENERGY_TYPES)):
+        if pool[i] < cost[i]: return False
+        spare += pool[i] - cost[i]
+    return spare >= cost[GENERIC]
+
+def pay(pool, cost):
+    """Returns the pool left after paying cost, or None if it cannot be paid.
+
+    The generic part is paid with Neutral energy first, then with the colors that have the
+    most energy to spare, so scarce colors stay available for later specific costs.
+    """
+    if not can_pay(pool, cost): return None
+    left = [pool[GENERIC]] + [pool[i] - cost[i] for i in range(1, len(ENERGY_TYPES))]
+    neutral = min(cost[GENERIC], left[GENERIC]); left[GENERIC] -= neutral
+    for _ in range(cost[GENERIC] - neutral):
+        left[max(range(1, len(ENERGY_TYPES)), key=left.__getitem__)] -= 1
+    return tuple(left)
+
+_SOURCE_ENERGY = {None: (1, 0, 0, 0, 0)} # energy code -> vector of one energy of that type
+for _code in FACTION_ENERGY.values(): _SOURCE_ENERGY[_code] = tuple(int(i == ENERGY_INDEX[_code]) for i in range(len(ENERGY_TYPES)))
+
+def reiryoku_energy(card):
+    """Energy a card provides while it sits in the reiryoku zone: one of its faction's color, or one Neutral without a faction."""
+    return _SOURCE_ENERGY[FACTION_ENERGY.get(card.data.get("faction"))]
+
+def sources_to_exhaust(spent, sources):
+    """Indexes of ready (index, energy) sources that together provide the spent energy vector."""
+    spent = list(spent); chosen = []
+    for index, energy in sources:
+        if not any(spent): break
+        if all(amount <= left for amount, left in zip(energy, spent)):
+            chosen.append(index); spent = [left - amount for left, amount in zip(spent, energy)]
+    return chosen
+
+class EnergyPool:
+    """A player's available energy as a count vector: the energy of the ready cards in the reiryoku zone,
+    updated as cards are channeled, exhausted to pay costs and readied."""
+    __slots__ = ("counts",)
+
+    def __init__(self, counts=NO_COST):
+        self.counts = list(counts)
+
+    def add(self, energy):
+        for i, amount in enumerate(energy): self.counts[i] += amount
+
+    def remove(self, energy):
+        for i, amount in enumerate(energy): self.counts[i] -= amount
+
+    def reset(self, sources):
+        """Recomputes the pool from the ready cards of a reiryoku zone, after it was replaced or readied wholesale."""
+        self.counts = [0] * len(ENERGY_TYPES)
+        for card in sources: self.add(reiryoku_energy(card))
+
+    def can_pay(self, cost):
+        return can_pay(self.counts, cost)
+
+    def pay(self, cost):
+        """Removes cost from the pool; returns the energy vector spent, or None (pool unchanged) if it cannot be paid."""
+        left = pay(self.counts, cost)
+        if left is None: return None
+        spent = tuple(have - rest for have, rest in zip(self.counts, left))
+        self.remove(spent)
+        return spent
+
+    def clone(self):
+        return EnergyPool(self.counts)
+
+    def items(self):
+        return zip(ENERGY_TYPES, self.counts)
+
+    def __getitem__(self, code):
+        return self.counts[ENERGY_INDEX[code]]
+
+    def __repr__(self):
+        return f"EnergyPool({dict(self.items())})"
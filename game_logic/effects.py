@@ -0,0 +1,229 @@
+"""Card abilities compiled from rules_text, and an index of the ones currently in play.
+
+compile_rules() turns a card's rules text into effect objects once, when the Card is
+created; sentences it does not recognise compile to nothing and stay flavour for now.
+Each effect has a trigger:
+
+    STATIC      a StatModifier, applied whenever a character's Reiatsu/Genryu is looked up
+    UPKEEP      runs in the Upkeep phase
+    ON_PLAY     runs when the card is played from the hand
+    ON_DESTROY  runs when a character is destroyed
+
+An EffectIndex is updated as cards enter and leave the field, so the Upkeep phase and
+stat lookups only visit the effects that can apply instead of scanning every card.
+"""
+import re
+from collections import Counter
+
+# Triggers
+STATIC, UPKEEP, ON_PLAY, ON_DESTROY = "static", "upkeep", "on_play", "on_destroy"
+
+# Scopes: which characters a StatModifier applies to, or whose event fires a trigger
+SELF, OTHERS, TAGGED, YOUR_TURN, EACH_TURN, OPPONENT = "self", "others", "tagged", "your_turn", "each_turn", "opponent"
+
+# Triggered actions, and who they affect
+DRAW, GAIN_LIFE, LOSE_LIFE, RETURN_TO_HAND = "draw", "gain_life", "lose_life", "return_to_hand"
+OWNER, ACTIVE, EACH = "owner", "active", "each"
+
+_tags = {} # card id -> frozenset of lower-case faction and subtypes
+
+def card_tags(card):
+    """The card's faction and subtypes, lower-case (e.g. {"human", "soul reaper"})."""
+    tags = _tags.get(card.data.get("id"))
+    if tags is None:
+        names = [card.data.get("faction") or ""] + (card.data.get("subtypes") or "").split(",")
+        tags = _tags[card.data.get("id")] = frozenset(name.strip().lower() for name in names if name.strip())
+    return tags
+
+class Condition:
+    """Whether a player controls a character with a given name ("name") or faction/subtype ("tag")."""
+    __slots__ = ("kind", "value")
+
+    def __init__(self, kind, value):
+        self.kind = kind; self.value = value
+
+    def holds(self, index, player):
+        counts = index.names if self.kind == "name" else index.tags
+        return counts[player][self.value] > 0
+
+    def __repr__(self):
+        return f"Condition({self.kind!r}, {self.value!r})"
+
+class StatModifier:
+    """A static +Reiatsu/+Genryu bonus for the source itself (SELF), every other character (OTHERS) or characters with any of `tags` (TAGGED).
+
+    With own_field set, only characters controlled by the source's controller are affected;
+    rules text reaches the opponent's characters only when it says "all characters" or "each player".
+    """
+    __slots__ = ("scope", "tags", "condition", "reiatsu", "genryu", "own_field")
+    trigger = STATIC
+
+    def __init__(self, scope, reiatsu=0, genryu=0, tags=frozenset(), condition=None, own_field=True):
+        self.scope = scope; self.tags = tags; self.condition = condition
+        self.reiatsu = reiatsu; self.genryu = genryu; self.own_field = own_field
+
+    def applies_to(self, card, controller, source, owner):
+        """True if this modifier of `owner`'s `source` affects `controller`'s `card`."""
+        if self.scope == SELF: return card is source
+        if self.own_field and controller is not owner: return False
+        if self.scope == OTHERS: return card is not source
+        return not self.tags.isdisjoint(card_tags(card))
+
+    def __repr__(self):
+        field = "own field" if self.own_field else "all fields"
+        return f"StatModifier({self.scope!r}, {self.reiatsu:+}/{self.genryu:+}, tags={sorted(self.tags)}, {field}, condition={self.condition})"
+
+class TriggeredEffect:
+    """Performs `action` (with `amount`) for `who` when `trigger` fires in `scope`, if `condition` holds for that player."""
+    __slots__ = ("trigger", "scope", "action", "amount", "who", "condition")
+
+    def __init__(self, trigger, action, amount=0, scope=SELF, who=OWNER, condition=None):
+        self.trigger = trigger; self.scope = scope; self.action = action
+        self.amount = amount; self.who = who; self.condition = condition
+
+    def __repr__(self):
+        return f"TriggeredEffect({self.trigger!r}, {self.action!r}, {self.amount}, scope={self.scope!r}, who={self.who!r}, condition={self.condition})"
+
+# --- Compilation ---
+def _tag_list(text):
+    return frozenset(tag.strip().lower() for tag in text.split(" and "))
+
+def _reaches_all_fields(match):
+    """True if the sentence says "each player" or "all characters" (or "all other characters")."""
+    sentence = match.string.lower()
+    return "each player" in sentence or re.search(r"\ball (?:other )?characters\b", sentence) is not None
+
+# (pattern, builder(match)) tried against each sentence of the rules text, in order
+_RULES = [
+    (r"if (?:a |an )?'(?P<name>[^']+)' is on your field, this character gains \+(?P<reiatsu>\d+) reiatsu",
+     lambda m: StatModifier(SELF, reiatsu=int(m["reiatsu"]), condition=Condition("name", m["name"]))),
+    (r"if you control '(?P<name>[^']+)', this character gets \+(?P<reiatsu>\d+) reiatsu",
+     lambda m: StatModifier(SELF, reiatsu=int(m["reiatsu"]), condition=Condition("name", m["name"]))),
+    (r"this character gains \+(?P<reiatsu>\d+) reiatsu$",
+     lambda m: StatModifier(SELF, reiatsu=int(m["reiatsu"]))),
+    (r"all (?P<tags>[\w ]+?) characters gain \+(?P<reiatsu>\d+) reiatsu(?: and \+(?P<genryu>\d+) genryu)?",
+     lambda m: StatModifier(TAGGED, int(m["reiatsu"]), int(m["genryu"] or 0), tags=_tag_list(m["tags"]), own_field=not _reaches_all_fields(m))),
+    (r"all other characters get (?P<reiatsu>[+-]\d+)/(?P<genryu>[+-]\d+)",
+     lambda m: StatModifier(OTHERS, int(m["reiatsu"]), int(m["genryu"]), own_field=not _reaches_all_fields(m))),
+    (r"at the beginning of each player's turn, if they control an? (?P<tag>[\w ]+?) character, they gain (?P<amount>\d+) life",
+     lambda m: TriggeredEffect(UPKEEP, GAIN_LIFE, int(m["amount"]), EACH_TURN, ACTIVE, Condition("tag", m["tag"].lower()))),
+    (r"at the beginning of your turn, each player loses (?P<amount>\d+) life",
+     lambda m: TriggeredEffect(UPKEEP, LOSE_LIFE, int(m["amount"]), YOUR_TURN, EACH)),
+    (r"when this character enters the battlefield, you may draw a card",
+     lambda m: TriggeredEffect(ON_PLAY, DRAW, 1)),
+    (r"when this character enters the battlefield, you gain (?P<amount>\d+) life",
+     lambda m: TriggeredEffect(ON_PLAY, GAIN_LIFE, int(m["amount"]))),
+    (r"when this character is destroyed, you may return it to your hand",
+     lambda m: TriggeredEffect(ON_DESTROY, RETURN_TO_HAND)),
+    (r"when a character an opponent controls is destroyed, you may draw a card",
+     lambda m: TriggeredEffect(ON_DESTROY, DRAW, 1, OPPONENT)),
+]
+_RULES = [(re.compile(pattern, re.IGNORECASE), build) for pattern, build in _RULES]
+_SENTENCE = re.compile(r"(?<=\.)\s+|\n")
+NO_EFFECTS = {}
+
+_compiled = {} # rules text -> {trigger: tuple of effects}; shared by every card with the same text
+
+def compile_rules(rules_text):
+    """Returns {trigger: (effect, ...)} for a rules text, compiling each distinct text once."""
+    effects = _compiled.get(rules_text)
+    if effects is None:
+        by_trigger = {}
+        for sentence in _SENTENCE.split(rules_text or ''):
+            sentence = sentence.strip().rstrip('.')
+            for pattern, build in _RULES:
+                if match := pattern.search(sentence):
+                    effect = build(match)
+                    by_trigger[effect.trigger] = by_trigger.get(effect.trigger, ()) + (effect,)
+                    break
+        effects = _compiled[rules_text] = by_trigger or NO_EFFECTS
+    return effects
+
+# --- Effects in play ---
+class EffectIndex:
+    """The effects of the cards on both fields, grouped by trigger, plus per-player name/tag counts for conditions.
+
+    Players report cards entering and leaving their zones through enter() and leave();
+    rebuild() recomputes everything after zones are replaced wholesale (loads, snapshots).
+    """
+    def __init__(self, players):
+        self.players = players
+        self.clear()
+
+    def clear(self):
+        self.self_modifiers = {} # card instance id -> [StatModifier] that apply to that card only
+        self.global_modifiers = [] # (owner, source card, StatModifier) that can apply to other characters
+        self.triggers = {UPKEEP: [], ON_DESTROY: []} # trigger -> [(owner, source card, TriggeredEffect)]
+        self.names = {player: Counter() for player in self.players} # Character names each player controls
+        self.tags = {player: Counter() for player in self.players} # Character factions/subtypes each player controls
+
+    def rebuild(self):
+        self.clear()
+        for player in self.players:
+            for card in player.character_zones:
+                if card: self.enter(player, card, "character")
+            for card in player.support_zones:
+                if card: self.enter(player, card, "support")
+            if player.field_card_zone: self.enter(player, player.field_card_zone, "field")
+
+    def enter(self, player, card, zone_type):
+        """Registers a card that entered one of player's zones."""
+        if zone_type == "character":
+            self.names[player][card.data.get("name")] += 1; self.tags[player].update(card_tags(card))
+        effects = card.effects
+        for modifier in effects.get(STATIC, ()):
+            if modifier.scope == SELF: self.self_modifiers.setdefault(card.instance_id, []).append(modifier)
+            else: self.global_modifiers.append((player, card, modifier))
+        for trigger, entries in self.triggers.items():
+            for effect in effects.get(trigger, ()):
+                if effect.scope != SELF: entries.append((player, card, effect)) # Self ON_DESTROY effects run from the card itself
+
+    def leave(self, player, card, zone_type):
+        """Unregisters a card that left one of player's zones."""
+        if zone_type == "character":
+            self.names[player][card.data.get("name")] -= 1; self.tags[player].subtract(card_tags(card))
+        if not card.effects: return
+        self.self_modifiers.pop(card.instance_id, None)
+        self.global_modifiers = [entry for entry in self.global_modifiers if entry[1] is not card]
+        for trigger, entries in self.triggers.items():
+            entries[:] = [entry for entry in entries if entry[1] is not card]
+
+    # --- Static modifiers ---
+    def stat_bonus(self, player, card):
+        """(Reiatsu, Genryu) added to player's character card by the static effects in play."""
+        reiatsu = genryu = 0
+        for modifier in self.self_modifiers.get(card.instance_id, ()):
+            if modifier.condition is None or modifier.condition.holds(self, player):
+                reiatsu += modifier.reiatsu; genryu += modifier.genryu
+        for owner, source, modifier in self.global_modifiers:
+            if modifier.applies_to(card, player, source, owner) and (modifier.condition is None or modifier.condition.holds(self, owner)):
+                reiatsu += modifier.reiatsu; genryu += modifier.genryu
+        return reiatsu, genryu
+
+    # --- Triggers ---
+    def run_upkeep(self, active):
+        """Runs the upkeep effects in play for active player's turn."""
+        for owner, source, effect in list(self.triggers[UPKEEP]):
+            if effect.scope == YOUR_TURN and owner is not active: continue
+            self.resolve(effect, owner, active, source)
+
+    def run_on_play(self, player, card):
+        for effect in card.effects.get(ON_PLAY, ()):
+            self.resolve(effect, player, player, card)
+
+    def run_on_destroy(self, player, card):
+        """Runs the destroyed card's own effects, then those of the cards watching player's characters."""
+        for effect in card.effects.get(ON_DESTROY, ()):
+            self.resolve(effect, player, player, card)
+        for owner, source, effect in list(self.triggers[ON_DESTROY]):
+            if effect.scope == OPPONENT and owner is not player: self.resolve(effect, owner, player, source)
+
+    def resolve(self, effect, owner, active, source):
+        targets = (owner,) if effect.who == OWNER else (active,) if effect.who == ACTIVE else self.players
+        for player in targets:
+            if effect.condition is not None and not effect.condition.holds(self, player): continue
+            if effect.action == DRAW:
+                for _ in range(effect.amount): player.draw_card()
+            elif effect.action == GAIN_LIFE: player.gain_life(effect.amount)
+            elif effect.action == LOSE_LIFE: player.lose_life(effect.amount)
+            elif effect.action == RETURN_TO_HAND: player.return_to_hand(source)
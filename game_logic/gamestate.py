@@ -1,16 +1,47 @@
-import time
 import random
+from collections import Counter
+from .scheduler import PhaseScheduler
+from .combat import CombatEngine, validate_blocks, slots_of
+from .effects import EffectIndex
+
+PHASE_ORDER = ["Restoration", "Upkeep", "Draw", "Main1", "Combat", "Main2", "End"]
+AUTOMATIC_PHASES = ["Restoration", "Upkeep", "Draw"]
+AI_PHASES = ["Main1", "Combat", "Main2"] # Phases in which an AI-controlled CPU chooses actions
+AUTOMATIC_PHASE_DELAY_MS = 500 # Pause on each automatic phase so the player can follow along
+CPU_DISCARD_DELAY_MS = 1000
+CPU_DISCARD_STEP_MS = 500
+CPU_ACTION_DELAY_MS = 600 # Pause after each CPU move so the player can follow along
+AI_POLL_MS = 16 # How often a running CPU search is checked for its result (about once per frame)
 
 class GameStateManager:
-    def __init__(self, game):
+    def __init__(self, game, scheduler=None, rng=None, verbose=True, ai=None):
         self.game = game
+        self.scheduler = scheduler if scheduler is not None else PhaseScheduler()
+        self.rng = rng or random # Seeded in headless runs so games are reproducible
+        self.verbose = verbose
         self.players = [game.player, game.cpu]
         self.turn_index = 0
-        self.phase_order = ["Restoration", "Upkeep", "Draw", "Main1", "Combat", "Main2", "End"]
+        self.phase_order = list(PHASE_ORDER)
+        self.phase_actions = [getattr(self, f"on_{phase.lower()}_phase", None) for phase in self.phase_order]
         self.phase_index = 0
         self.is_processing_automatic_phases = False
         self.first_turn = True
-        self.sub_state = None # e.g., 'awaiting_discard', 'awaiting_channel_target'
+        self.sub_state = None # e.g., 'awaiting_discard', 'awaiting_channel_target', 'awaiting_blockers'
+        self.turn_number = 0
+        self.winner = None
+        self.on_phase_change = None # Called with the manager after each phase's actions run (e.g. autosave)
+        self.action_log = None # replay.ActionLog recording turns, phases and the result, if any
+        self.ai = ai # ai.CpuAI playing the CPU seat; without one the CPU's main phases wait for player input
+        self.cpu_thinking = False
+        self.combat = CombatEngine()
+        self.pending_attack = 0 # Attacking character slots while the defender chooses blockers
+        self.effects = EffectIndex(self.players) # Abilities of the cards in play, by trigger
+        self.cards_played = [Counter(), Counter()] # Card id -> times played through apply_action, per seat
+        for player in self.players: player.effects = self.effects
+        self.effects.rebuild()
+
+    def log(self, message):
+        if self.verbose: print(message)
 
     @property
     def current_player(self):
@@ -20,6 +51,10 @@ class GameStateManager:
     def current_phase(self):
         return self.phase_order[self.phase_index]
 
+    @property
+    def defending_player(self):
+        return self.players[1 - self.turn_index]
+
     def start_game(self):
         """Initializes the game and starts the first turn."""
         if not self.players[0].hand and not self.players[1].hand:
@@ -27,13 +62,17 @@ class GameStateManager:
                 self.players[0].draw_card()
                 self.players[1].draw_card()
         
-        print(f"--- Game Start ---")
+        self.log("--- Game Start ---")
         self.start_turn()
 
+    def ai_controls(self, player):
+        return self.ai is not None and player is self.players[1]
+
     def advance_player_phase(self):
         """Manually advances the phase, called by player input."""
-        if self.is_processing_automatic_phases:
+        if self.is_processing_automatic_phases or self.game_over or self.ai_controls(self.current_player):
             return
+        if self.sub_state == 'awaiting_blockers': return # The attack resolves through declare_blocks
 
         if self.current_phase == "Main2":
             self.phase_index = self.phase_order.index("End")
@@ -42,13 +81,31 @@ class GameStateManager:
             self._advance_phase()
 
     def update(self):
+        """Runs any scheduled phase transitions or CPU actions that are due. Never blocks."""
+        self.scheduler.update()
+
+    def _run_automatic_phases(self):
+        """Steps through the automatic phases, paced by the scheduler unless it is in zero-delay mode."""
+        if not self.scheduler.zero_delay:
+            self._schedule_automatic_advance()
+            return
+        while self.is_processing_automatic_phases and self.current_phase in AUTOMATIC_PHASES:
+            self._advance_phase()
+        self.is_processing_automatic_phases = False
+
+    def _schedule_automatic_advance(self):
+        self.scheduler.schedule(AUTOMATIC_PHASE_DELAY_MS, self._advance_automatic_phase)
+
+    def _advance_automatic_phase(self):
         """Automatically progresses through phases that don't require player input."""
-        if self.is_processing_automatic_phases:
-            time.sleep(0.5) 
-            if self.current_phase in ["Restoration", "Upkeep", "Draw"]:
-                self._advance_phase()
-            else:
-                self.is_processing_automatic_phases = False
+        if not self.is_processing_automatic_phases:
+            return
+        if self.current_phase in AUTOMATIC_PHASES:
+            self._advance_phase()
+            if self.is_processing_automatic_phases:
+                self._schedule_automatic_advance()
+        else:
+            self.is_processing_automatic_phases = False
 
     def _advance_phase(self):
         """Core logic to advance to the next phase and handle turn changes."""
@@ -57,13 +114,14 @@ class GameStateManager:
             self.end_turn()
         else:
             self.execute_phase_actions()
-            if self.current_phase not in ["Restoration", "Upkeep", "Draw"]:
+            if self.current_phase not in AUTOMATIC_PHASES:
                 self.is_processing_automatic_phases = False
+                self.resume_cpu_turn()
 
     def check_hand_size(self):
         """Called after a player discards. Checks if they can now end their turn."""
         if self.sub_state == 'awaiting_discard' and len(self.current_player.hand) <= 6:
-            print(f"{self.current_player.name} has discarded down to a valid hand size.")
+            self.log(f"{self.current_player.name} has discarded down to a valid hand size.")
             self.sub_state = None
             self.end_turn()
 
@@ -74,73 +132,213 @@ class GameStateManager:
         if self.turn_index == 0: self.first_turn = False 
         self.start_turn()
 
+    @property
+    def game_over(self):
+        return self.winner is not None
+
+    def declare_winner(self, player):
+        """Ends the game; no further phases are processed."""
+        self.winner = player
+        self.is_processing_automatic_phases = False
+        self.scheduler.clear()
+        if self.action_log: self.action_log.record_winner(self)
+        self.log(f"--- {player.name} wins! ---")
+
+    def check_life_points(self):
+        """Declares a winner if either player's Life Points have dropped to 0."""
+        for i, player in enumerate(self.players):
+            if player.life_points <= 0 and not self.game_over:
+                self.declare_winner(self.players[1 - i])
+        return self.game_over
+
     def start_turn(self):
         """Begins a new turn and handles automatic start-of-turn phases."""
-        print(f"\n--- {self.current_player.name}'s Turn ---")
+        if self.game_over: return
+        self.turn_number += 1
+        self.log(f"\n--- {self.current_player.name}'s Turn ---")
         # --- Reset once-per-turn actions ---
         self.current_player.has_channeled_this_turn = False
+        for player in self.players: player.reset_damage()
         # --- End reset ---
+        if self.action_log: self.action_log.record_turn(self)
         self.is_processing_automatic_phases = True
         self.execute_phase_actions()
+        self._run_automatic_phases()
     
     def execute_phase_actions(self):
         """Executes the logic for the current phase."""
-        print(f"Entering {self.current_phase} Phase for {self.current_player.name}.")
-        self.game.phase_indicator.show() 
-        phase_action = getattr(self, f"on_{self.current_phase.lower()}_phase", None)
+        if self.verbose: self.log(f"Entering {self.current_phase} Phase for {self.current_player.name}.")
+        if self.action_log: self.action_log.record_phase(self)
+        if self.game.phase_indicator: self.game.phase_indicator.show()
+        phase_action = self.phase_actions[self.phase_index]
         if phase_action:
             phase_action()
+        if self.on_phase_change: self.on_phase_change(self)
     
     def on_restoration_phase(self):
         self.current_player.ready_all_cards()
 
     def on_upkeep_phase(self):
-        # Placeholder for future upkeep effects
-        pass
+        self.effects.run_upkeep(self.current_player)
+        self.check_life_points()
 
     def on_draw_phase(self):
         if self.turn_index == 0 and self.first_turn:
-            print(f"{self.current_player.name} skips their first Draw Phase.")
+            self.log(f"{self.current_player.name} skips their first Draw Phase.")
             return
         
         card = self.current_player.draw_card()
         if card:
-            print(f"{self.current_player.name} draws a card.")
+            self.log(f"{self.current_player.name} draws a card.")
         else:
-            print(f"{self.current_player.name}'s deck is empty!")
+            # A player who cannot draw from an empty deck loses the game.
+            self.log(f"{self.current_player.name}'s deck is empty!")
+            self.declare_winner(self.players[1 - self.turn_index])
+
+    def on_combat_phase(self):
+        self.pending_attack = 0
+        if not self.current_player.moves.ready_characters():
+            self.log(f"{self.current_player.name} has no ready characters to attack with.")
+
+    # --- Combat ---
+    def reiatsu_of(self, player, slot):
+        """Current Reiatsu of the character in a player's slot: printed, plus static effects in play."""
+        card = player.character_zones[slot]
+        return max(0, card.reiatsu + self.effects.stat_bonus(player, card)[0]) if card else 0
+
+    def genryu_of(self, player, slot):
+        """Current Genryu of the character in a player's slot: printed, plus static effects in play."""
+        card = player.character_zones[slot]
+        return max(0, card.genryu + self.effects.stat_bonus(player, card)[1]) if card else 0
+
+    def load_combat(self):
+        """Loads the current player (attacking) and the defending player into the combat engine."""
+        self.combat.load_players(self.current_player, self.defending_player, self.reiatsu_of, self.genryu_of)
+        return self.combat
+
+    def suggest_blocks(self, attack_mask=None):
+        """Greedy blocks for the defending player against attack_mask (the pending attack by default)."""
+        attack_mask = self.pending_attack if attack_mask is None else attack_mask
+        defender = self.defending_player
+        return bytes(self.load_combat().choose_blocks(attack_mask, defender.moves.ready_characters(), defender.life_points))
+
+    def declare_attack(self, attack_mask):
+        """Exhausts the attacking characters and asks the defender for blockers. Returns True if the attack was legal."""
+        attacker = self.current_player
+        if self.current_phase != "Combat" or self.sub_state or self.game_over: return False
+        if not attack_mask or attack_mask & ~attacker.moves.ready_characters(): return False
+        for slot in slots_of(attack_mask): attacker.exhaust_character(slot)
+        self.pending_attack = attack_mask
+        self.log(f"{attacker.name} attacks with {', '.join(attacker.character_zones[slot].data['name'] for slot in slots_of(attack_mask))}.")
+        defender = self.defending_player
+        if self.ai_controls(defender): self.declare_blocks(self.ai.choose_blocks(self))
+        elif defender is self.players[1]: self.declare_blocks(self.suggest_blocks())
+        else: self.sub_state = 'awaiting_blockers'
+        return True
+
+    def declare_blocks(self, blocks):
+        """Resolves the pending attack with blocks[attacker slot] = blocking slot (or combat.NO_BLOCK), then moves on to Main2."""
+        attacker, defender = self.current_player, self.defending_player
+        if not self.pending_attack or not validate_blocks(blocks, self.pending_attack, defender.moves.ready_characters()):
+            self.log("Error: Invalid blockers."); return False
+        engine = self.load_combat()
+        life, destroyed_attackers, destroyed_blockers = engine.resolve(self.pending_attack, blocks)
+        for player, dealt in ((attacker, engine.dealt_att), (defender, engine.dealt_def)):
+            for slot in range(len(dealt)):
+                if dealt[slot]: player.take_damage(slot, dealt[slot])
+        if life: defender.lose_life(life)
+        destroyed = [(player, player.character_zones[slot]) for player, mask in ((attacker, destroyed_attackers), (defender, destroyed_blockers))
+                     for slot in slots_of(mask)]
+        for slot in slots_of(destroyed_attackers): attacker.destroy_character(slot)
+        for slot in slots_of(destroyed_blockers): defender.destroy_character(slot)
+        for player, card in destroyed: self.effects.run_on_destroy(player, card)
+        self.pending_attack = 0
+        if self.sub_state == 'awaiting_blockers': self.sub_state = None
+        if not self.check_life_points(): self._advance_phase()
+        return True
 
     def on_end_phase(self):
         """Handles the End Phase logic, including hand size check and turn progression."""
-        print(f"End Phase: Cleanup effects resolve.")
+        self.log("End Phase: Cleanup effects resolve.")
         
         if len(self.current_player.hand) > 6:
             self.sub_state = 'awaiting_discard'
-            print(f"{self.current_player.name} must discard {len(self.current_player.hand) - 6} card(s).")
+            self.log(f"{self.current_player.name} must discard {len(self.current_player.hand) - 6} card(s).")
             
-            if self.current_player == self.game.cpu:
+            if self.current_player is self.players[1]:
                 self.handle_cpu_discard()
             return
         
         self.end_turn()
 
+    # --- AI-controlled CPU ---
+    def apply_action(self, player, action):
+        """Performs a ("channel", hand_slot), ("play", hand_slot, zone_type, index) or ("attack", mask) action. Returns True if it was legal."""
+        kind = action[0]
+        if kind == "attack": return player is self.current_player and self.declare_attack(action[1])
+        if kind == "channel" and action[1] < len(player.hand):
+            return player.channel_reiryoku(player.hand[action[1]], hand_index=action[1])
+        if kind == "play" and action[1] < len(player.hand):
+            card = player.hand[action[1]]
+            if not player.play_card_to_zone(card, action[2], action[3], hand_index=action[1]): return False
+            self.cards_played[self.players.index(player)][card.data["id"]] += 1
+            self.effects.run_on_play(player, card)
+            return True
+        return False
+
+    def resume_cpu_turn(self):
+        """Asks the AI for its next move if it controls the current player in one of the AI_PHASES."""
+        if self.game_over or self.cpu_thinking or self.sub_state or not self.ai_controls(self.current_player): return
+        if self.current_phase not in AI_PHASES: return
+        self.cpu_thinking = True
+        future = self.ai.request_action(self)
+        self.scheduler.schedule(0, self._poll_cpu_action, future)
+
+    def resume_loaded_game(self):
+        """Carries on a game restored from a save: restarts the automatic phases, a CPU discard or the CPU's turn."""
+        if self.game_over: return
+        if self.current_phase in AUTOMATIC_PHASES:
+            self.is_processing_automatic_phases = True
+            self._run_automatic_phases()
+        elif self.sub_state == 'awaiting_discard' and self.current_player is self.players[1]: self.handle_cpu_discard()
+        else: self.resume_cpu_turn()
+
+    def _poll_cpu_action(self, future):
+        """Applies the AI's move once its search has finished; a pass (or an illegal move) ends the phase."""
+        if self.game_over: return
+        if not future.done():
+            self.scheduler.schedule(AI_POLL_MS, self._poll_cpu_action, future)
+            return
+        self.cpu_thinking = False
+        try: action = future.result()
+        except Exception as e: print(f"Error: CPU AI failed: {e}"); action = ("pass",)
+        if self.apply_action(self.current_player, action):
+            self.scheduler.schedule(CPU_ACTION_DELAY_MS, self.resume_cpu_turn)
+        else:
+            self._advance_phase()
+
     def handle_cpu_discard(self):
-        """Handles the CPU's random discard logic."""
-        print(f"{self.current_player.name} is discarding...")
-        time.sleep(1) 
-        while len(self.current_player.hand) > 6:
-            if not self.current_player.hand: break
-            card_to_discard = random.choice(self.current_player.hand)
-            self.current_player.discard_card(card_to_discard)
-            print(f"{self.current_player.name} discarded '{card_to_discard.data['name']}'.")
-            time.sleep(0.5)
-        
-        self.check_hand_size()
+        """Handles the CPU's random discard logic, one scheduled discard at a time."""
+        self.log(f"{self.current_player.name} is discarding...")
+        self.scheduler.schedule(CPU_DISCARD_DELAY_MS, self._cpu_discard_step)
+
+    def _cpu_discard_step(self):
+        if len(self.current_player.hand) > 6:
+            slot = self.ai.choose_discard(self) if self.ai else self.rng.randrange(len(self.current_player.hand))
+            card_to_discard = self.current_player.hand[slot]
+            self.current_player.discard_card(card_to_discard, hand_index=slot)
+            self.log(f"{self.current_player.name} discarded '{card_to_discard.data['name']}'.")
+            self.scheduler.schedule(CPU_DISCARD_STEP_MS, self._cpu_discard_step)
+        else:
+            self.check_hand_size()
 
     def to_dict(self):
-        return {"turn_index": self.turn_index, "phase_index": self.phase_index, "first_turn": self.first_turn}
+        return {"turn_index": self.turn_index, "phase_index": self.phase_index, "first_turn": self.first_turn, "turn_number": self.turn_number}
 
     def from_dict(self, data):
         self.turn_index = data.get("turn_index", 0)
         self.phase_index = data.get("phase_index", 0)
         self.first_turn = data.get("first_turn", True)
+        self.turn_number = data.get("turn_number", 0)
+        self.effects.rebuild()
 
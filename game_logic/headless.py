@@ -0,0 +1,108 @@
+import json
+import random
+from collections import Counter
+from .card import Card
+from .player import Player
+from .gamestate import GameStateManager
+from .scheduler import PhaseScheduler
+from .replay import ActionLog
+from .legal_moves import legal_actions
+
+MAIN_PHASES = ["Main1", "Main2"]
+
+def load_card_catalog(card_data_path):
+    """Builds {id: Card} from card_data.json without touching pygame or any image files."""
+    with open(card_data_path, 'r', encoding='utf-8') as f: card_list = json.load(f)
+    return {data["id"]: Card(data) for data in card_list if data.get("id")}
+
+class RandomPolicy:
+    """A simple rules-following player: channels once per turn and fills free zones at random."""
+    def __init__(self, rng):
+        self.rng = rng
+
+    def take_main_phase(self, player, state_manager):
+        """Acts for one main phase and returns the cards it played to the field."""
+        played = []
+        channels = [action for action in legal_actions(state_manager) if action[0] == "channel"]
+        if channels: state_manager.apply_action(player, self.rng.choice(channels))
+        while plays := [action for action in legal_actions(state_manager) if action[0] == "play"]:
+            action = self.rng.choice(plays); card = player.hand[action[1]]
+            state_manager.apply_action(player, action); played.append(card)
+        return played
+
+    def choose_attack(self, player, state_manager):
+        """Returns a random attack action, or PASS for no attack."""
+        return self.rng.choice(list(legal_actions(state_manager)))
+
+    def choose_blocks(self, player, state_manager):
+        return state_manager.suggest_blocks()
+
+    def choose_discard(self, player, state_manager):
+        """Returns the hand slot to discard."""
+        return self.rng.randrange(len(player.hand))
+
+class HeadlessGame:
+    """Plays complete games from Player, GameStateManager and the card data alone.
+
+    There is no display, no image loading and no delay: the scheduler runs in zero-delay
+    mode and both seats are driven by policies. Pass a seed for a reproducible game,
+    replay_path to stream its actions to a replay.ActionLog, and an ai.CpuAI to have it
+    play seat 1 through the state manager instead of its policy.
+    """
+    def __init__(self, catalog, player_deck_ids, cpu_deck_ids, seed=None, policies=None, max_turns=500, replay_path=None, ai=None):
+        self.all_cards = catalog
+        self.rng = random.Random(seed)
+        self.max_turns = max_turns
+        self.phase_indicator = None # GameStateManager shows this on phase changes when present
+        self.player = Player("Player 1", verbose=False); self.cpu = Player("CPU", verbose=False)
+        self.player.create_deck([catalog[cid].new_instance() for cid in player_deck_ids], rng=self.rng)
+        self.cpu.create_deck([catalog[cid].new_instance() for cid in cpu_deck_ids], rng=self.rng)
+        self.policies = policies or [RandomPolicy(self.rng), RandomPolicy(self.rng)]
+        self.state_manager = GameStateManager(self, PhaseScheduler(zero_delay=True), rng=self.rng, verbose=False, ai=ai)
+        self.life_history = [] # (player LP, cpu LP) at the start of each turn
+        self.cards_played = self.state_manager.cards_played # Card id -> times played, per seat, by policies and AI alike
+        self.action_log = None
+        if replay_path: self.action_log = ActionLog(replay_path, seed=seed); self.action_log.attach(self.state_manager)
+
+    def play(self):
+        """Plays the game to completion (or max_turns) and returns a summary dictionary."""
+        sm = self.state_manager
+        sm.start_game()
+        last_turn = 0
+        while not sm.game_over and sm.turn_number <= self.max_turns:
+            if sm.scheduler: sm.update() # Only queued CPU discards and AI moves remain in zero-delay mode
+            if sm.game_over: break
+            if sm.turn_number != last_turn:
+                last_turn = sm.turn_number
+                self.life_history.append((self.player.life_points, self.cpu.life_points))
+
+            player = sm.current_player; policy = self.policies[sm.turn_index]
+            if sm.sub_state == 'awaiting_blockers':
+                defender = sm.defending_player
+                sm.declare_blocks(self.policies[sm.players.index(defender)].choose_blocks(defender, sm))
+                continue
+            if sm.ai_controls(player): continue # The AI's whole turn runs inside sm.update()
+            if sm.sub_state == 'awaiting_discard':
+                # The CPU seat discards through the state manager's own scheduled logic.
+                if player is self.player:
+                    slot = policy.choose_discard(player, sm)
+                    player.discard_card(player.hand[slot], hand_index=slot); sm.check_hand_size()
+                continue
+            if sm.current_phase in MAIN_PHASES:
+                policy.take_main_phase(player, sm)
+            elif sm.current_phase == "Combat":
+                action = policy.choose_attack(player, sm)
+                if action[0] == "attack" and sm.apply_action(player, action): continue # Resolving moves on to Main2
+            sm.advance_player_phase()
+            sm.check_life_points()
+        if self.action_log: self.action_log.close()
+        return self.result()
+
+    def result(self):
+        sm = self.state_manager
+        winner = None if sm.winner is None else sm.players.index(sm.winner)
+        # Every card that has left the deck was drawn (the opening hand included).
+        cards_drawn = [Counter(card.data["id"] for zone in (p.hand, p.soul_burial, p.reiryoku_zone, p.character_zones, p.support_zones, [p.field_card_zone]) for card in zone if card)
+                       for p in sm.players]
+        return {"winner": winner, "turns": sm.turn_number, "life_history": self.life_history,
+                "cards_drawn": cards_drawn, "cards_played": self.cards_played}
@@ -0,0 +1,41 @@
+class HitTestIndex:
+    """A uniform grid over the logical screen that resolves a point to the target registered there.
+
+    Targets are (owner, zone, slot) tuples, e.g. ("player", "character", 2). Each cell lists
+    the rects overlapping it, so a lookup only checks the one or two rects in the cell under
+    the point instead of every zone on the board. Rects follow pygame.Rect.collidepoint
+    semantics (right and bottom edges are exclusive).
+    """
+    def __init__(self, width, height, cell_size=64):
+        self.cell_size = cell_size
+        self.columns = width // cell_size + 1
+        self.rows = height // cell_size + 1
+        self.cells = [[] for _ in range(self.columns * self.rows)] # cell -> [(left, top, right, bottom, target)]
+        self.rects = {} # target -> (left, top, width, height)
+
+    def add(self, rect, target):
+        """Registers target over rect (anything unpackable as x, y, w, h)."""
+        x, y, w, h = (int(v) for v in rect)
+        if w <= 0 or h <= 0: return
+        self.rects[target] = (x, y, w, h)
+        entry = (x, y, x + w, y + h, target)
+        cs = self.cell_size
+        for row in range(max(0, y // cs), min(self.rows - 1, (y + h - 1) // cs) + 1):
+            for col in range(max(0, x // cs), min(self.columns - 1, (x + w - 1) // cs) + 1):
+                self.cells[row * self.columns + col].append(entry)
+
+    def hit(self, pos):
+        """Returns the target under pos, or None."""
+        px, py = int(pos[0]), int(pos[1])
+        col, row = px // self.cell_size, py // self.cell_size
+        if not (0 <= col < self.columns and 0 <= row < self.rows): return None
+        for left, top, right, bottom, target in self.cells[row * self.columns + col]:
+            if left <= px < right and top <= py < bottom: return target
+        return None
+
+    def rect_of(self, target):
+        return self.rects.get(target)
+
+    def clear(self):
+        for cell in self.cells: cell.clear()
+        self.rects.clear()
@@ -0,0 +1,120 @@
+"""Move legality for both the live game and compact search states.
+
+Every player state keeps a MoveIndex that is updated as cards are drawn, leave the hand or
+enter a zone, so legal_actions() enumerates moves with bit operations instead of comparing
+phase names, scanning the board for empty zones or walking the hand.
+
+Actions are tuples: ("channel", hand_slot), ("play", hand_slot, zone_type, index),
+("attack", character slot mask) and PASS.
+"""
+from .gamestate import PHASE_ORDER
+
+PASS = ("pass",)
+MAIN_PHASE_INDEXES = (PHASE_ORDER.index("Main1"), PHASE_ORDER.index("Main2"))
+COMBAT_PHASE_INDEX = PHASE_ORDER.index("Combat")
+
+# Zone a card type is played to (ZONE_NONE: not playable to a zone)
+ZONE_NONE, ZONE_CHARACTER, ZONE_SUPPORT, ZONE_FIELD = 0, 1, 2, 3
+ZONE_FOR_TYPE_CODE = {"Character": ZONE_CHARACTER, "Technique": ZONE_SUPPORT, "Equipment": ZONE_SUPPORT, "Field": ZONE_FIELD}
+ZONE_NAMES = {ZONE_CHARACTER: "character", ZONE_SUPPORT: "support", ZONE_FIELD: "field"}
+ZONE_BY_NAME = {name: code for code, name in ZONE_NAMES.items()}
+ZONE_SIZES = {ZONE_CHARACTER: 5, ZONE_SUPPORT: 5, ZONE_FIELD: 1}
+
+def zone_code(card):
+    """ZONE_* code of a Card (or of None, which is ZONE_NONE)."""
+    return ZONE_FOR_TYPE_CODE.get(card.data.get("type"), ZONE_NONE) if card else ZONE_NONE
+
+def bits(mask):
+    """Yields the positions of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class MoveIndex:
+    """Free-slot bitmasks and a per-type index of hand slots for one player.
+
+    `hand[code]` has bit j set when hand slot j holds a card played to zone `code`;
+    `free[code]` has bit i set when slot i of that zone is empty, and `exhausted` has bit i
+    set when the character in slot i is exhausted. Removing a hand card shifts the higher
+    slots down with two mask operations per type, so every update is O(1).
+    """
+    __slots__ = ("hand", "free", "hand_size", "exhausted")
+
+    def __init__(self):
+        self.hand = [0, 0, 0, 0]
+        self.free = [0] + [(1 << ZONE_SIZES[code]) - 1 for code in (ZONE_CHARACTER, ZONE_SUPPORT, ZONE_FIELD)]
+        self.hand_size = 0
+        self.exhausted = 0
+
+    def clone(self):
+        copy = MoveIndex.__new__(MoveIndex)
+        copy.hand = self.hand[:]; copy.free = self.free[:]; copy.hand_size = self.hand_size; copy.exhausted = self.exhausted
+        return copy
+
+    def rebuild(self, hand_codes, zone_occupied, exhausted=0):
+        """Recomputes the index from hand zone codes and {code: [occupied?] per slot}, after zones are replaced wholesale."""
+        self.__init__()
+        for code in hand_codes: self.add_to_hand(code)
+        for code, occupied in zone_occupied.items():
+            for index, taken in enumerate(occupied):
+                if taken: self.occupy(code, index)
+        self.exhausted = exhausted
+
+    def add_to_hand(self, code):
+        self.hand[code] |= 1 << self.hand_size
+        self.hand_size += 1
+
+    def remove_from_hand(self, slot):
+        low = (1 << slot) - 1
+        hand = self.hand
+        for code in range(4):
+            mask = hand[code]
+            hand[code] = (mask & low) | (mask >> (slot + 1) << slot)
+        self.hand_size -= 1
+
+    def occupy(self, code, index):
+        self.free[code] &= ~(1 << index)
+
+    def vacate(self, code, index):
+        self.free[code] |= 1 << index
+        if code == ZONE_CHARACTER: self.exhausted &= ~(1 << index)
+
+    def ready_characters(self):
+        """Bitmask of occupied character slots whose character is ready (able to attack or block)."""
+        return ~(self.free[ZONE_CHARACTER] | self.exhausted) & ((1 << ZONE_SIZES[ZONE_CHARACTER]) - 1)
+
+    def can_play(self, slot, code, index):
+        return bool(self.hand[code] >> slot & 1 and self.free[code] >> index & 1)
+
+def legal_actions(state, table=None):
+    """Yields every legal action for the player to move: PASS, then channels and the plays the
+    player can pay for in a main phase, or one attack per non-empty set of ready characters in
+    the Combat phase.
+
+    `state` is a GameStateManager or a CompactGameState; each of their players carries a
+    MoveIndex in `moves` and an EnergyPool in `energy`. Compact hands hold card numbers, so
+    their costs come from `table` (a compact_state.CardTable), which compact states require.
+    Nothing is legal while the manager waits on a discard, a channel target or blockers.
+    """
+    yield PASS
+    if getattr(state, "sub_state", None) or state.winner is not None: return
+    player = state.players[state.turn_index]
+    moves = player.moves
+    if state.phase_index == COMBAT_PHASE_INDEX:
+        ready = attackers = moves.ready_characters()
+        while attackers:
+            yield ("attack", attackers)
+            attackers = (attackers - 1) & ready
+        return
+    if state.phase_index not in MAIN_PHASE_INDEXES: return
+    if not player.has_channeled_this_turn:
+        for slot in range(moves.hand_size): yield ("channel", slot)
+    hand = player.hand; can_pay = player.energy.can_pay
+    for code in (ZONE_CHARACTER, ZONE_SUPPORT, ZONE_FIELD):
+        free = moves.free[code]
+        if not free: continue
+        name = ZONE_NAMES[code]
+        for slot in bits(moves.hand[code]):
+            if not can_pay(table.cost[hand[slot]] if table else hand[slot].cost): continue
+            for index in bits(free): yield ("play", slot, name, index)
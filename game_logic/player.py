@@ -1,87 +1,185 @@
 import random
+from collections import deque
+from .legal_moves import MoveIndex, ZONE_CHARACTER, ZONE_SUPPORT, ZONE_FIELD, ZONE_BY_NAME, zone_code
+from .costs import EnergyPool, reiryoku_energy, sources_to_exhaust
 
 class Player:
-    def __init__(self, name):
+    def __init__(self, name, verbose=True):
         self.name = name
+        self.verbose = verbose # Headless simulations turn off the per-action console output
         self.hand = []
-        self.deck = []
+        self.deck = deque() # Top of the deck is on the left
         self.soul_burial = [] # Graveyard
         self.character_zones = [None] * 5
         self.support_zones = [None] * 5
         self.field_card_zone = None
         self.life_points = 30
+        self.damage_taken = [0] * 5 # Combat damage on each character this turn; see combat.CombatEngine
         
         # --- Reiryoku Mechanic Attributes ---
         self.reiryoku_zone = []
+        self.energy = EnergyPool() # Updated as cards enter or leave reiryoku_zone
         self.has_channeled_this_turn = False
         # --- End Attributes ---
+        self.action_log = None # replay.ActionLog recording this player's actions, if any
+        self.effects = None # effects.EffectIndex told about cards entering and leaving the field, if any
+        self.moves = MoveIndex() # Kept in step with the hand and zones; see legal_moves.legal_actions
 
-    def create_deck(self, cards):
-        """Initializes the player's deck."""
-        self.deck = cards
-        random.shuffle(self.deck)
+    def create_deck(self, cards, rng=None):
+        """Initializes the player's deck, shuffled with rng (the random module by default).
+
+        Every entry should be its own Card instance (see Card.new_instance) so duplicate
+        copies never share state such as is_exhausted.
+        """
+        cards = list(cards)
+        (rng or random).shuffle(cards)
+        self.deck = deque(cards)
+
+    def log(self, message):
+        if self.verbose: print(message)
 
     def draw_card(self):
         """Draws a card from the deck to the hand."""
         if self.deck:
-            card = self.deck.pop(0)
-            self.hand.append(card)
+            card = self.deck.popleft()
+            self.hand.append(card); self.moves.add_to_hand(zone_code(card))
+            if self.action_log: self.action_log.record_draw(self)
             return card
         return None
 
-    def discard_card(self, card_to_discard):
+    def find_in_hand(self, card, hand_index):
+        """Returns hand_index if that hand slot holds this exact card instance, or None.
+
+        Every caller already knows the slot (from legal_actions, a click, a discard choice or a
+        log record), so this is an O(1) check rather than a search of the hand.
+        """
+        if hand_index is not None and 0 <= hand_index < len(self.hand) and self.hand[hand_index] is card:
+            return hand_index
+        return None
+
+    def discard_card(self, card_to_discard, hand_index):
         """Moves a card from hand to the soul burial."""
-        if card_to_discard in self.hand:
-            self.hand.remove(card_to_discard)
-            self.soul_burial.append(card_to_discard)
-            print(f"{self.name} discarded {card_to_discard.data['name']}")
-
-    def play_card_to_zone(self, card, zone_type, index):
-        """Plays a card from the hand to a specified zone."""
-        if card in self.hand:
-            if zone_type == "character" and self.character_zones[index] is None:
-                self.character_zones[index] = card
-                self.hand.remove(card)
-            elif zone_type == "support" and self.support_zones[index] is None:
-                self.support_zones[index] = card
-                self.hand.remove(card)
-            elif zone_type == "field" and self.field_card_zone is None:
-                self.field_card_zone = card
-                self.hand.remove(card)
-
-    def channel_reiryoku(self, card):
+        slot = self.find_in_hand(card_to_discard, hand_index)
+        if slot is not None:
+            if self.action_log: self.action_log.record_discard(self, slot)
+            self.soul_burial.append(self.hand.pop(slot)); self.moves.remove_from_hand(slot)
+            self.log(f"{self.name} discarded {card_to_discard.data['name']}")
+
+    def play_card_to_zone(self, card, zone_type, index, hand_index):
+        """Plays a card from the hand to a specified zone. Returns True if the card was played."""
+        slot = self.find_in_hand(card, hand_index)
+        if slot is None: return False
+        if not self.can_pay(card):
+            self.log(f"Error: Not enough energy to play {card.data['name']}.")
+            return False
+        if zone_type == "character" and self.character_zones[index] is None:
+            self.character_zones[index] = card
+        elif zone_type == "support" and self.support_zones[index] is None:
+            self.support_zones[index] = card
+        elif zone_type == "field" and self.field_card_zone is None:
+            self.field_card_zone = card
+        else:
+            return False
+        if self.action_log: self.action_log.record_play(self, slot, zone_type, index)
+        self.pay_cost(card.cost)
+        self.hand.pop(slot); self.moves.remove_from_hand(slot); self.moves.occupy(ZONE_BY_NAME[zone_type], index)
+        if self.effects: self.effects.enter(self, card, zone_type)
+        return True
+
+    def channel_reiryoku(self, card, hand_index):
         """Moves a card from hand to the reiryoku zone to generate energy."""
-        if card in self.hand and not self.has_channeled_this_turn:
-            self.hand.remove(card)
-            self.reiryoku_zone.append(card)
+        slot = self.find_in_hand(card, hand_index)
+        if slot is not None and not self.has_channeled_this_turn:
+            if self.action_log: self.action_log.record_channel(self, slot)
+            self.reiryoku_zone.append(self.hand.pop(slot)); self.moves.remove_from_hand(slot)
+            self.energy.add(reiryoku_energy(card))
             self.has_channeled_this_turn = True
-            print(f"{self.name} channeled {card.data['name']} for Reiryoku.")
+            self.log(f"{self.name} channeled {card.data['name']} for Reiryoku.")
             return True
-        print(f"Error: Cannot channel {card.data['name']}.")
+        self.log(f"Error: Cannot channel {card.data['name']}.")
         return False
 
     def get_energy_pool(self):
-        """Calculates and returns the player's available energy."""
-        energy = {"N": 0, "W": 0, "B": 0, "U": 0, "G": 0}
-        # Each card in the reiryoku zone provides 1 Neutral energy.
-        energy["N"] += len(self.reiryoku_zone)
-        
-        # This can be expanded later to check for cards on the field that produce energy.
-        # for card in self.character_zones + self.support_zones:
-        #     if card and hasattr(card, 'produces_energy') and card.produces_energy:
-        #         for type, amount in card.energy_production.items():
-        #             energy[type] += amount
-        
-        return energy
+        """Returns the player's energy pool (a costs.EnergyPool; read-only for callers)."""
+        # Each card in the reiryoku zone provides its costs.reiryoku_energy, added as it is channeled.
+        # Cards on the field that produce energy would add theirs on entering play in the same way.
+        return self.energy
+
+    def can_pay(self, card):
+        """True if the energy pool covers the card's cost."""
+        return self.energy.can_pay(card.cost)
+
+    def pay_cost(self, cost):
+        """Pays a cost vector from the pool, exhausting the reiryoku cards that provided the energy. Returns True if paid."""
+        spent = self.energy.pay(cost)
+        if spent is None: return False
+        ready = ((i, reiryoku_energy(card)) for i, card in enumerate(self.reiryoku_zone) if not card.is_exhausted)
+        for i in sources_to_exhaust(spent, ready): self.reiryoku_zone[i].is_exhausted = True
+        return True
+
+    def reset_energy(self):
+        """Recomputes the pool from the ready reiryoku cards."""
+        self.energy.reset(card for card in self.reiryoku_zone if not card.is_exhausted)
 
     def ready_all_cards(self):
         """Readies all cards on the field at the start of a turn."""
+        if self.action_log: self.action_log.record_ready(self)
         for card in self.character_zones:
             if card: card.is_exhausted = False
         for card in self.support_zones:
             if card: card.is_exhausted = False
         if self.field_card_zone:
             self.field_card_zone.is_exhausted = False
+        for card in self.reiryoku_zone: card.is_exhausted = False
+        self.moves.exhausted = 0; self.reset_energy()
+
+    # --- Combat ---
+    def exhaust_character(self, slot):
+        """Exhausts the character in a slot (e.g. when it attacks)."""
+        card = self.character_zones[slot]
+        if card is None: return
+        if self.action_log: self.action_log.record_exhaust(self, slot)
+        card.is_exhausted = True; self.moves.exhausted |= 1 << slot
+
+    def take_damage(self, slot, amount):
+        """Adds combat damage to the character in a slot; it lasts until the turn ends."""
+        if self.action_log: self.action_log.record_damage(self, slot, amount)
+        self.damage_taken[slot] += amount
+
+    def lose_life(self, amount):
+        if self.action_log: self.action_log.record_life(self, amount)
+        self.life_points -= amount
+        self.log(f"{self.name} loses {amount} Life Points ({self.life_points} left).")
+
+    def gain_life(self, amount):
+        if self.action_log: self.action_log.record_heal(self, amount)
+        self.life_points += amount
+        self.log(f"{self.name} gains {amount} Life Points ({self.life_points} left).")
+
+    def destroy_character(self, slot):
+        """Moves the character in a slot to the soul burial."""
+        card = self.character_zones[slot]
+        if card is None: return
+        if self.action_log: self.action_log.record_destroy(self, slot)
+        card.is_exhausted = False
+        self.soul_burial.append(card); self.character_zones[slot] = None
+        self.damage_taken[slot] = 0; self.moves.vacate(ZONE_CHARACTER, slot)
+        if self.effects: self.effects.leave(self, card, "character")
+        self.log(f"{self.name}'s {card.data['name']} was destroyed.")
+
+    def return_to_hand(self, card):
+        """Returns this exact card from the soul burial to the hand."""
+        for index in range(len(self.soul_burial) - 1, -1, -1):
+            if self.soul_burial[index] is not card: continue
+            if self.action_log: self.action_log.record_return(self, index)
+            self.hand.append(self.soul_burial.pop(index)); self.moves.add_to_hand(zone_code(card))
+            self.log(f"{self.name} returned {card.data['name']} to their hand.")
+            return True
+        return False
+
+    def reset_damage(self):
+        """Clears the combat damage on every character at the start of a turn."""
+        self.damage_taken = [0] * 5
 
     def to_dict(self):
         """Converts the player's state to a serializable dictionary."""
@@ -102,13 +200,22 @@ class Player:
         """Reconstructs the player's state from a dictionary."""
         self.name = data.get("name", "Player")
         self.life_points = data.get("life_points", 30)
-        self.hand = [all_cards_map.get(cid) for cid in data.get("hand", []) if cid]
-        self.deck = [all_cards_map.get(cid) for cid in data.get("deck", []) if cid]
-        self.soul_burial = [all_cards_map.get(cid) for cid in data.get("soul_burial", []) if cid]
-        self.character_zones = [all_cards_map.get(cid) for cid in data.get("character_zones", [None]*5)]
-        self.support_zones = [all_cards_map.get(cid) for cid in data.get("support_zones", [None]*5)]
-        field_cid = data.get("field_card_zone")
-        self.field_card_zone = all_cards_map.get(field_cid) if field_cid else None
-        self.reiryoku_zone = [all_cards_map.get(cid) for cid in data.get("reiryoku_zone", []) if cid] # Added for loading
+        # Every loaded copy gets its own Card instance so duplicates keep separate state.
+        instance = lambda cid: all_cards_map[cid].new_instance() if cid in all_cards_map else None
+        self.hand = [instance(cid) for cid in data.get("hand", []) if cid]
+        self.deck = deque(instance(cid) for cid in data.get("deck", []) if cid)
+        self.soul_burial = [instance(cid) for cid in data.get("soul_burial", []) if cid]
+        self.character_zones = [instance(cid) for cid in data.get("character_zones", [None]*5)]
+        self.support_zones = [instance(cid) for cid in data.get("support_zones", [None]*5)]
+        self.field_card_zone = instance(data.get("field_card_zone"))
+        self.reiryoku_zone = [instance(cid) for cid in data.get("reiryoku_zone", []) if cid] # Added for loading
         self.has_channeled_this_turn = data.get("has_channeled_this_turn", False) # Added for loading
+        self.rebuild_moves(); self.reset_energy()
+
+    def rebuild_moves(self):
+        """Recomputes the move index after the hand or zones were replaced wholesale (loads, snapshots)."""
+        self.moves.rebuild((zone_code(card) for card in self.hand), {
+            ZONE_CHARACTER: [card is not None for card in self.character_zones], ZONE_SUPPORT: [card is not None for card in self.support_zones],
+            ZONE_FIELD: [self.field_card_zone is not None]},
+            sum(1 << slot for slot, card in enumerate(self.character_zones) if card and card.is_exhausted))
 
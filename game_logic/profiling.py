@@ -0,0 +1,42 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+class StartupTracer:
+    """Records the wall time (and optionally the memory allocated) of each named startup stage.
+
+    Allocation tracking uses tracemalloc, which slows Python down noticeably, so it is
+    off unless trace_allocations=True.
+    """
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations
+        self.stages = [] # [(name, seconds, allocated_bytes or None)]
+        self.started_at = time.perf_counter()
+        if trace_allocations and not tracemalloc.is_tracing(): tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        allocated_before = tracemalloc.get_traced_memory()[0] if self.trace_allocations else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[0] - allocated_before if self.trace_allocations else None
+            self.stages.append((name, elapsed, allocated))
+
+    def mark(self, name):
+        """Records a zero-length stage holding the time elapsed since the tracer was created."""
+        self.stages.append((name, time.perf_counter() - self.started_at, None))
+
+    def to_dict(self):
+        return [{"stage": name, "ms": seconds * 1000, "allocated_kb": None if allocated is None else allocated / 1024}
+                for name, seconds, allocated in self.stages]
+
+    def report(self):
+        """Returns a printable table of the recorded stages."""
+        lines = [f"{'Stage':<28}{'ms':>10}{'alloc KB':>12}"]
+        for entry in self.to_dict():
+            alloc = "" if entry["allocated_kb"] is None else f"{entry['allocated_kb']:.1f}"
+            lines.append(f"{entry['stage']:<28}{entry['ms']:>10.2f}{alloc:>12}")
+        return "\n".join(lines)
@@ -0,0 +1,84 @@
+import math
+import pygame
+
+class DirtyRectRenderer:
+    """Retained-mode presenter that only redraws and presents regions that changed.
+
+    Each frame the game describes its screen as named regions, each a (rect, signature)
+    pair where the signature is any comparable value capturing what is drawn there.
+    Regions whose signature or rect changed since the last frame are redrawn under a
+    clip on the logical surface, rescaled individually to the window and pushed with
+    pygame.display.update(rects). An unchanged frame presents nothing at all.
+    """
+    def __init__(self, logical_size, max_rects=6):
+        self.logical_rect = pygame.Rect((0, 0), logical_size)
+        self.max_rects = max_rects # Above this many dirty rects, present their union instead
+        self.regions = {} # name -> (rect, signature) as of the last presented frame
+        self.full_redraw = True
+        self.frames_presented = 0
+        self.frames_skipped = 0
+
+    def invalidate(self):
+        """Forces the next frame to redraw and present the whole screen (e.g. after a resize)."""
+        self.full_redraw = True
+
+    def collect(self, regions):
+        """Diffs regions (name -> (rect, signature)) against the last frame and returns the dirty rects."""
+        dirty = []
+        for name, (rect, signature) in regions.items():
+            previous = self.regions.get(name)
+            if previous is None or previous[1] != signature or previous[0] != rect:
+                dirty.append(rect)
+                if previous is not None: dirty.append(previous[0])
+        for name in self.regions.keys() - regions.keys():
+            dirty.append(self.regions[name][0])
+        self.regions = {name: (pygame.Rect(rect), signature) for name, (rect, signature) in regions.items()}
+
+        if self.full_redraw:
+            self.full_redraw = False
+            return [self.logical_rect.copy()]
+        return self._merge(dirty)
+
+    def _merge(self, rects):
+        # Inflate slightly so nearest-neighbour rescaling never leaves seams at region edges.
+        merged = []
+        for rect in rects:
+            rect = pygame.Rect(rect).inflate(4, 4).clip(self.logical_rect)
+            if not rect.width or not rect.height: continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index)); index = rect.collidelist(merged)
+            merged.append(rect)
+        if len(merged) > self.max_rects:
+            return [merged[0].unionall(merged[1:])]
+        return merged
+
+    def _to_window(self, rect, scale_x, scale_y):
+        left, top = int(rect.left * scale_x), int(rect.top * scale_y)
+        right, bottom = math.ceil(rect.right * scale_x), math.ceil(rect.bottom * scale_y)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def present(self, logical_surface, screen, dirty_rects, draw_scene):
+        """Redraws each dirty rect with draw_scene() under a clip, rescales it to screen and updates the display."""
+        if not dirty_rects:
+            self.frames_skipped += 1
+            return
+
+        for rect in dirty_rects:
+            logical_surface.set_clip(rect)
+            draw_scene()
+        logical_surface.set_clip(None)
+
+        window_w, window_h = screen.get_size()
+        if not window_w or not window_h: return
+        scale_x = window_w / self.logical_rect.width; scale_y = window_h / self.logical_rect.height
+        window_rects = []
+        for rect in dirty_rects:
+            window_rect = self._to_window(rect, scale_x, scale_y).clip(screen.get_rect())
+            if not window_rect.width or not window_rect.height: continue
+            source = logical_surface if rect == self.logical_rect else logical_surface.subsurface(rect)
+            if window_rect.size == source.get_size(): screen.blit(source, window_rect)
+            else: screen.blit(pygame.transform.scale(source, window_rect.size), window_rect)
+            window_rects.append(window_rect)
+        pygame.display.update(window_rects)
+        self.frames_presented += 1
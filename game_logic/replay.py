@@ -0,0 +1,179 @@
+"""Append-only action logs and a replay engine that rebuilds any point of a logged game.
+
+A log is a header followed by fixed-size action records, with a full save snapshot
+(see save_format) at the start and every `snapshot_interval` turns. Replaying seeks to
+the nearest snapshot at or before the target and re-applies the actions after it.
+
+    header    "BSDR", version:H, seed (length:H + UTF-8)
+    record    kind:B, seat:B, a:H, b:H, c:H
+    snapshot  a record of kind SNAPSHOT (a = turn number), then length:I + encode_game bytes
+"""
+import struct
+from .player import Player
+from .gamestate import GameStateManager
+from .scheduler import PhaseScheduler
+from .save_format import encode_game, decode_game, SaveFormatError
+
+MAGIC = b"BSDR"
+VERSION = 1
+
+# Record kinds
+DRAW, DISCARD, PLAY, CHANNEL, READY, TURN, PHASE, WIN, SNAPSHOT = range(1, 10)
+EXHAUST, DAMAGE, LIFE, DESTROY, HEAL, RETURN = range(10, 16)
+ZONE_CODES = {"character": 0, "support": 1, "field": 2}
+ZONE_TYPES = {code: zone_type for zone_type, code in ZONE_CODES.items()}
+
+_HEADER = struct.Struct("<4sH")
+_RECORD = struct.Struct("<BBHHH")
+_LENGTH_H = struct.Struct("<H")
+_LENGTH_I = struct.Struct("<I")
+
+class ActionLog:
+    """Streams every rules-level action of a game to disk.
+
+    attach() hooks a GameStateManager and its players; they report their actions through
+    the record_* methods. Writes are buffered and flushed at each snapshot and on close().
+    """
+    def __init__(self, path, seed=None, snapshot_interval=5, buffer_size=64 * 1024):
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self.file = open(path, 'wb', buffering=buffer_size)
+        seed_text = str(seed).encode('utf-8') if seed is not None else b""
+        self.file.write(_HEADER.pack(MAGIC, VERSION) + _LENGTH_H.pack(len(seed_text)) + seed_text)
+        self.state_manager = None
+        self.records = 0
+
+    def attach(self, state_manager):
+        """Starts logging a game; the current state becomes the initial snapshot."""
+        self.state_manager = state_manager
+        state_manager.action_log = self
+        for player in state_manager.players: player.action_log = self
+        self.snapshot()
+
+    def _write(self, kind, seat, a=0, b=0, c=0):
+        self.file.write(_RECORD.pack(kind, seat, a, b, c)); self.records += 1
+
+    def _seat(self, player):
+        return 0 if player is self.state_manager.players[0] else 1
+
+    def record_draw(self, player): self._write(DRAW, self._seat(player))
+    def record_discard(self, player, slot): self._write(DISCARD, self._seat(player), slot)
+    def record_play(self, player, slot, zone_type, index): self._write(PLAY, self._seat(player), slot, ZONE_CODES[zone_type], index)
+    def record_channel(self, player, slot): self._write(CHANNEL, self._seat(player), slot)
+    def record_ready(self, player): self._write(READY, self._seat(player))
+    def record_exhaust(self, player, slot): self._write(EXHAUST, self._seat(player), slot)
+    def record_damage(self, player, slot, amount): self._write(DAMAGE, self._seat(player), slot, min(amount, 0xFFFF))
+    def record_life(self, player, amount): self._write(LIFE, self._seat(player), min(amount, 0xFFFF))
+    def record_destroy(self, player, slot): self._write(DESTROY, self._seat(player), slot)
+    def record_heal(self, player, amount): self._write(HEAL, self._seat(player), min(amount, 0xFFFF))
+    def record_return(self, player, burial_index): self._write(RETURN, self._seat(player), burial_index)
+    def record_phase(self, state_manager): self._write(PHASE, state_manager.turn_index, state_manager.phase_index)
+    def record_winner(self, state_manager): self._write(WIN, state_manager.players.index(state_manager.winner))
+
+    def record_turn(self, state_manager):
+        """Logs the start of a turn, followed by a snapshot every snapshot_interval turns."""
+        self._write(TURN, state_manager.turn_index, state_manager.turn_number, state_manager.first_turn)
+        if self.snapshot_interval and state_manager.turn_number % self.snapshot_interval == 0: self.snapshot()
+
+    def snapshot(self):
+        payload = encode_game(self.state_manager)
+        self.file.write(_RECORD.pack(SNAPSHOT, 0, self.state_manager.turn_number, 0, 0) + _LENGTH_I.pack(len(payload)) + payload)
+        self.file.flush()
+
+    def flush(self):
+        if not self.file.closed: self.file.flush()
+
+    def close(self):
+        """Flushes and closes the log and detaches it from the game."""
+        if self.state_manager:
+            self.state_manager.action_log = None
+            for player in self.state_manager.players: player.action_log = None
+        if not self.file.closed: self.file.close()
+
+class ReplayFile:
+    """A parsed action log: the seed, the action records and the snapshots between them."""
+    def __init__(self, seed, actions, snapshots):
+        self.seed = seed
+        self.actions = actions # [(kind, seat, a, b, c)]
+        self.snapshots = snapshots # [(action_index, turn_number, encode_game bytes)], in order
+
+    @classmethod
+    def read(cls, path):
+        with open(path, 'rb') as f: data = f.read()
+        if len(data) < _HEADER.size + _LENGTH_H.size: raise SaveFormatError("Replay file is too short.")
+        magic, version = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC: raise SaveFormatError("Not a Bleach Soul Deck replay file.")
+        if version > VERSION: raise SaveFormatError(f"Replay version {version} is newer than supported ({VERSION}).")
+        offset = _HEADER.size
+        seed_length, = _LENGTH_H.unpack_from(data, offset); offset += _LENGTH_H.size
+        seed = data[offset:offset + seed_length].decode('utf-8') or None; offset += seed_length
+
+        actions, snapshots = [], []
+        while offset + _RECORD.size <= len(data): # A crash can leave a partial record at the end; it is ignored
+            record = _RECORD.unpack_from(data, offset); offset += _RECORD.size
+            if record[0] != SNAPSHOT:
+                actions.append(record); continue
+            if offset + _LENGTH_I.size > len(data): break
+            length, = _LENGTH_I.unpack_from(data, offset); offset += _LENGTH_I.size
+            if offset + length > len(data): break
+            snapshots.append((len(actions), record[2], data[offset:offset + length])); offset += length
+        if not snapshots: raise SaveFormatError("Replay file has no initial snapshot.")
+        return cls(seed, actions, snapshots)
+
+    def turn_index(self, turn_number):
+        """Index of the first action of a turn (just after its TURN record), or None."""
+        for i, (kind, _, a, _, _) in enumerate(self.actions):
+            if kind == TURN and a == turn_number: return i + 1
+        return None
+
+class ReplayEngine:
+    """Rebuilds the game at any action of a ReplayFile from the card catalog alone (no display needed)."""
+    def __init__(self, replay, catalog):
+        self.replay = replay
+        self.all_cards = catalog
+        self.phase_indicator = None # GameStateManager shows this on phase changes when present
+        self.player = Player("Player 1", verbose=False); self.cpu = Player("CPU", verbose=False)
+        self.state_manager = GameStateManager(self, PhaseScheduler(zero_delay=True), verbose=False)
+        self.position = None # Number of actions applied
+
+    def seek(self, action_index):
+        """Restores the state after the first action_index actions, starting from the nearest snapshot."""
+        action_index = max(0, min(action_index, len(self.replay.actions)))
+        if self.position is None or not self._snapshot_start(action_index) <= self.position <= action_index:
+            start, _, payload = max((s for s in self.replay.snapshots if s[0] <= action_index), key=lambda s: s[0])
+            decode_game(payload, self.state_manager, self.all_cards); self.position = start
+        for action in self.replay.actions[self.position:action_index]: self.apply(action)
+        self.position = action_index
+        return self.state_manager
+
+    def _snapshot_start(self, action_index):
+        return max(s[0] for s in self.replay.snapshots if s[0] <= action_index)
+
+    def seek_turn(self, turn_number):
+        """Restores the state at the start of a turn (before its Restoration phase)."""
+        index = self.replay.turn_index(turn_number)
+        if index is None: raise ValueError(f"Turn {turn_number} is not in the replay.")
+        return self.seek(index)
+
+    def apply(self, action):
+        """Re-applies one logged action."""
+        kind, seat, a, b, c = action
+        sm = self.state_manager; player = sm.players[seat]
+        if kind == DRAW: player.draw_card()
+        elif kind == DISCARD: player.discard_card(player.hand[a], hand_index=a)
+        elif kind == PLAY: player.play_card_to_zone(player.hand[a], ZONE_TYPES[b], c, hand_index=a)
+        elif kind == CHANNEL: player.channel_reiryoku(player.hand[a], hand_index=a)
+        elif kind == READY: player.ready_all_cards()
+        elif kind == TURN:
+            sm.turn_index = seat; sm.turn_number = a; sm.first_turn = bool(b); sm.phase_index = 0
+            player.has_channeled_this_turn = False
+            for p in sm.players: p.reset_damage()
+        elif kind == PHASE: sm.turn_index = seat; sm.phase_index = a
+        elif kind == EXHAUST: player.exhaust_character(a)
+        elif kind == DAMAGE: player.take_damage(a, b)
+        elif kind == LIFE: player.lose_life(a)
+        elif kind == DESTROY: player.destroy_character(a)
+        elif kind == HEAL: player.gain_life(a)
+        elif kind == RETURN: player.return_to_hand(player.soul_burial[a])
+        elif kind == WIN: sm.winner = player
+        else: raise SaveFormatError(f"Unknown replay action kind {kind}.")
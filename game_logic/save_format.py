@@ -0,0 +1,167 @@
+"""Versioned binary save files.
+
+Layout (all integers little-endian):
+
+    header   "BSDS", version:H
+    ids      count:H, then per card id: length:B + UTF-8 bytes  (interned numbers start at 1)
+    game     turn_index:B, phase_index:B, first_turn:B, turn_number:I, winner:b (-1 = none),
+             sub_state:B (index into SUB_STATES), pending_attack:B
+    player   x2: name (length:B + UTF-8), life_points:h, has_channeled:B, exhausted:H,
+             field:H, characters:5H, supports:5H, then hand, deck (bottom-to-top),
+             soul_burial and reiryoku_zone as count:H + count*H, then the indexes of the
+             exhausted reiryoku cards the same way, then damage_taken:5H
+    trailer  crc32:I of everything before it
+
+Card state that differs between copies (is_exhausted) is kept per slot in the
+`exhausted` bitmask and the exhausted reiryoku indexes, so duplicate cards load as
+independent instances.
+"""
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from .compact_state import CardRegistry, CompactGameState, CompactPlayerState
+
+MAGIC = b"BSDS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+_GAME = struct.Struct("<BBBIb")
+_PROMPT = struct.Struct("<BB")
+_DAMAGE = struct.Struct("<5H")
+SUB_STATES = (None, 'awaiting_discard', 'awaiting_channel_target', 'awaiting_blockers') # GameStateManager.sub_state values
+_PLAYER = struct.Struct("<hBHH5H5H")
+_COUNT = struct.Struct("<H")
+_CRC = struct.Struct("<I")
+
+class SaveFormatError(Exception):
+    """Raised when a save file is truncated, corrupt or from an unsupported version."""
+
+def _pack_array(values):
+    data = array('H', values)
+    if sys.byteorder == 'big': data.byteswap()
+    return _COUNT.pack(len(data)) + data.tobytes()
+
+def _pack_text(text):
+    raw = text.encode('utf-8')[:255]
+    return bytes([len(raw)]) + raw
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data; self.offset = 0
+
+    def unpack(self, fmt):
+        try: values = fmt.unpack_from(self.data, self.offset)
+        except struct.error as e: raise SaveFormatError(f"Truncated save file: {e}")
+        self.offset += fmt.size
+        return values
+
+    def text(self):
+        length = self.data[self.offset]
+        raw = self.data[self.offset + 1:self.offset + 1 + length]
+        self.offset += 1 + length
+        return raw.decode('utf-8')
+
+    def array(self):
+        count, = self.unpack(_COUNT)
+        values = array('H', self.data[self.offset:self.offset + 2 * count])
+        if len(values) != count: raise SaveFormatError("Truncated save file.")
+        if sys.byteorder == 'big': values.byteswap()
+        self.offset += 2 * count
+        return values
+
+def encode_game(state_manager):
+    """Serializes a GameStateManager and its players to bytes."""
+    registry = CardRegistry()
+    state = CompactGameState.from_manager(state_manager, registry)
+    parts = [_HEADER.pack(MAGIC, VERSION), _COUNT.pack(len(registry))]
+    parts.extend(_pack_text(card_id) for card_id in registry.ids[1:])
+    parts.append(_GAME.pack(state.turn_index, state.phase_index, state.first_turn, state.turn_number, -1 if state.winner is None else state.winner))
+    parts.append(_PROMPT.pack(SUB_STATES.index(state_manager.sub_state), state_manager.pending_attack))
+    for player, compact in zip(state_manager.players, state.players):
+        parts.append(_pack_text(player.name))
+        parts.append(_PLAYER.pack(compact.life_points, compact.has_channeled_this_turn, compact.exhausted, compact.field_card_zone,
+                                  *compact.character_zones, *compact.support_zones))
+        parts.extend(_pack_array(zone) for zone in (compact.hand, compact.deck, compact.soul_burial, compact.reiryoku_zone))
+        parts.append(_pack_array(i for i in range(len(compact.reiryoku_zone)) if compact.reiryoku_exhausted >> i & 1))
+        parts.append(_DAMAGE.pack(*player.damage_taken))
+    body = b"".join(parts)
+    return body + _CRC.pack(zlib.crc32(body))
+
+def decode_game(data, state_manager, catalog):
+    """Restores bytes from encode_game into a GameStateManager, creating card instances from a {id: Card} catalog."""
+    if len(data) < _HEADER.size + _CRC.size: raise SaveFormatError("Save file is too short.")
+    body, (crc,) = data[:-_CRC.size], _CRC.unpack(data[-_CRC.size:])
+    if zlib.crc32(body) != crc: raise SaveFormatError("Save file checksum mismatch.")
+    reader = _Reader(body)
+    magic, version = reader.unpack(_HEADER)
+    if magic != MAGIC: raise SaveFormatError("Not a Bleach Soul Deck save file.")
+    if version > VERSION: raise SaveFormatError(f"Save file version {version} is newer than supported ({VERSION}).")
+
+    registry = CardRegistry()
+    count, = reader.unpack(_COUNT)
+    for _ in range(count): registry.intern(reader.text())
+    missing = [card_id for card_id in registry.ids[1:] if card_id not in catalog]
+    if missing: raise SaveFormatError(f"Save file references unknown cards: {', '.join(missing)}")
+
+    state = CompactGameState([CompactPlayerState(), CompactPlayerState()])
+    state.turn_index, state.phase_index, first_turn, state.turn_number, winner = reader.unpack(_GAME)
+    state.first_turn = bool(first_turn); state.winner = None if winner < 0 else winner
+    sub_state, pending_attack = reader.unpack(_PROMPT)
+    if sub_state >= len(SUB_STATES): raise SaveFormatError(f"Save file has an unknown prompt ({sub_state}).")
+    names = []; damage = []
+    for compact in state.players:
+        names.append(reader.text())
+        values = reader.unpack(_PLAYER)
+        compact.life_points, has_channeled, compact.exhausted, compact.field_card_zone = values[:4]
+        compact.has_channeled_this_turn = bool(has_channeled)
+        compact.character_zones = array('H', values[4:9]); compact.support_zones = array('H', values[9:14])
+        compact.hand, compact.deck, compact.soul_burial, compact.reiryoku_zone = (reader.array() for _ in range(4))
+        compact.reiryoku_exhausted = sum(1 << i for i in reader.array() if i < len(compact.reiryoku_zone))
+        damage.append(list(reader.unpack(_DAMAGE)))
+    state.apply_to(state_manager, registry, catalog)
+    state_manager.sub_state = SUB_STATES[sub_state]; state_manager.pending_attack = pending_attack
+    for player, name, damage_taken in zip(state_manager.players, names, damage): player.name = name; player.damage_taken = damage_taken
+
+def write_atomic(path, data):
+    """Writes data to path via a temp file and os.replace, so a crash leaves either the old or the new file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data); f.flush(); os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class AutosaveWriter:
+    """Writes save snapshots on a background thread.
+
+    The snapshot is encoded by the caller on the main thread (so it is consistent);
+    only the file I/O runs in the background. If saves arrive faster than they can be
+    written, only the latest pending snapshot is written.
+    """
+    def __init__(self):
+        self.executor = None # Created on the first save
+        self.lock = threading.Lock()
+        self.latest = None # (path, data) waiting to be written
+        self.writes = 0
+
+    def save(self, path, data):
+        with self.lock:
+            idle = self.latest is None
+            self.latest = (path, data)
+        if idle:
+            if self.executor is None: self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+            self.executor.submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self.lock:
+                job, self.latest = self.latest, None
+            if job is None: return
+            try: write_atomic(*job); self.writes += 1
+            except OSError as e: print(f"Error autosaving game: {e}")
+
+    def shutdown(self):
+        """Finishes any pending write."""
+        if self.executor: self.executor.shutdown(wait=True); self.executor = None
@@ -0,0 +1,37 @@
+import heapq
+import itertools
+import time
+
+class PhaseScheduler:
+    """Queues delayed phase transitions and CPU actions without blocking the main loop.
+
+    `clock` returns the current time in milliseconds (the game passes
+    pygame.time.get_ticks). With zero_delay=True every delay is ignored and update()
+    drains the whole queue, so the same rules code can run headless at full speed.
+    """
+    def __init__(self, clock=None, zero_delay=False):
+        self.clock = clock or (lambda: int(time.monotonic() * 1000))
+        self.zero_delay = zero_delay
+        self._queue = [] # heap of (due_ms, sequence, callback, args)
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def schedule(self, delay_ms, callback, *args):
+        """Runs callback(*args) once delay_ms milliseconds have passed."""
+        due = self.clock() + (0 if self.zero_delay else delay_ms)
+        heapq.heappush(self._queue, (due, next(self._sequence), callback, args))
+
+    def update(self):
+        """Runs every callback that is due and returns how many ran. Never sleeps."""
+        now = float('inf') if self.zero_delay else self.clock()
+        ran = 0
+        while self._queue and self._queue[0][0] <= now:
+            _, _, callback, args = heapq.heappop(self._queue)
+            callback(*args)
+            ran += 1
+        return ran
+
+    def clear(self):
+        self._queue.clear()
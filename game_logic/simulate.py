@@ -0,0 +1,160 @@
+"""Batch game simulator: plays many headless games across a process pool and merges the results.
+
+Usage:
+    python -m game_logic.simulate --games 100000 --deck-a deck_a.json --deck-b deck_b.json
+
+Deck files are JSON lists of card ids. Without them, each side gets a random 50-card deck
+(at most 3 copies of a card) drawn from the catalog using the base seed.
+
+Each run prints its throughput in games/s. Games are independent, so it scales with
+--workers; to size a large run, measure one core with --workers 1 on the decks in question,
+as the rate changes with the rules and cards in play.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .headless import HeadlessGame, load_card_catalog
+
+CARD_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cards", "card_data.json")
+DECK_SIZE = 50
+MAX_COPIES = 3
+
+_worker_catalog = None # Loaded once per worker process by _init_worker
+
+def game_seed(base_seed, game_index):
+    """Returns the deterministic seed of one game, independent of how games are split across workers."""
+    return f"{base_seed}:{game_index}"
+
+def random_deck(card_ids, rng, size=DECK_SIZE, max_copies=MAX_COPIES):
+    """Builds a legal random deck: size cards with at most max_copies of any id."""
+    pool = [cid for cid in card_ids for _ in range(max_copies)]
+    return rng.sample(pool, min(size, len(pool)))
+
+class SimulationStats:
+    """Aggregated results of a batch of games. Two instances merge by simple addition."""
+    def __init__(self):
+        self.games = 0
+        self.wins = [0, 0]
+        self.unfinished = 0
+        self.total_turns = 0
+        self.cards_drawn = [Counter(), Counter()]
+        self.cards_played = [Counter(), Counter()]
+        self.life_totals = [] # Per turn: [sum of A's LP, sum of B's LP, games that reached this turn]
+
+    def add_game(self, result):
+        self.games += 1
+        self.total_turns += result["turns"]
+        if result["winner"] is None: self.unfinished += 1
+        else: self.wins[result["winner"]] += 1
+        for seat in (0, 1):
+            self.cards_drawn[seat].update(result["cards_drawn"][seat])
+            self.cards_played[seat].update(result["cards_played"][seat])
+        for turn, (lp_a, lp_b) in enumerate(result["life_history"]):
+            if turn == len(self.life_totals): self.life_totals.append([0, 0, 0])
+            totals = self.life_totals[turn]
+            totals[0] += lp_a; totals[1] += lp_b; totals[2] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.unfinished += other.unfinished
+        self.total_turns += other.total_turns
+        for seat in (0, 1):
+            self.cards_drawn[seat].update(other.cards_drawn[seat])
+            self.cards_played[seat].update(other.cards_played[seat])
+        for turn, totals in enumerate(other.life_totals):
+            if turn == len(self.life_totals): self.life_totals.append([0, 0, 0])
+            for i in range(3): self.life_totals[turn][i] += totals[i]
+        return self
+
+    def to_report(self):
+        """Returns the merged results as a JSON-serializable dictionary."""
+        games = max(self.games, 1)
+        per_game = lambda counter: {cid: count / games for cid, count in counter.most_common()}
+        return {
+            "games": self.games,
+            "win_rate": [self.wins[0] / games, self.wins[1] / games],
+            "unfinished": self.unfinished,
+            "average_turns": self.total_turns / games,
+            "draws_per_game": [per_game(c) for c in self.cards_drawn],
+            "plays_per_game": [per_game(c) for c in self.cards_played],
+            "life_curve": [(a / n, b / n) for a, b, n in self.life_totals],
+        }
+
+def _init_worker(card_data_path):
+    global _worker_catalog
+    _worker_catalog = load_card_catalog(card_data_path)
+
+def _run_games(deck_a, deck_b, base_seed, start, count, max_turns):
+    """Worker task: plays games start..start+count-1 and returns their SimulationStats."""
+    stats = SimulationStats()
+    for game_index in range(start, start + count):
+        game = HeadlessGame(_worker_catalog, deck_a, deck_b, seed=game_seed(base_seed, game_index), max_turns=max_turns)
+        stats.add_game(game.play())
+    return stats
+
+def simulate(deck_a, deck_b, games, workers=None, seed=0, card_data_path=CARD_DATA_PATH, max_turns=500, chunk_size=None, progress=None):
+    """Plays `games` games of deck_a (seat 0) against deck_b (seat 1) and returns the merged report.
+
+    Games are split into chunks and spread over a process pool; every game's seed depends
+    only on (seed, game index), so results are identical for any worker count.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(1000, games // (workers * 4) or 1))
+    chunks = [(start, min(chunk_size, games - start)) for start in range(0, games, chunk_size)]
+    stats = SimulationStats()
+    if workers == 1:
+        _init_worker(card_data_path)
+        for start, count in chunks:
+            stats.merge(_run_games(deck_a, deck_b, seed, start, count, max_turns))
+            if progress: progress(stats.games, games)
+        return stats.to_report()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(card_data_path,)) as pool:
+        futures = [pool.submit(_run_games, deck_a, deck_b, seed, start, count, max_turns) for start, count in chunks]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            if progress: progress(stats.games, games)
+    return stats.to_report()
+
+def load_deck(path):
+    with open(path, 'r', encoding='utf-8') as f: return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate headless Bleach Soul Deck games between two decks.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--deck-a", help="JSON list of card ids for seat 0.")
+    parser.add_argument("--deck-b", help="JSON list of card ids for seat 1.")
+    parser.add_argument("--cards", default=CARD_DATA_PATH, help="Path to card_data.json.")
+    parser.add_argument("--max-turns", type=int, default=500)
+    parser.add_argument("--output", help="Write the full JSON report to this file.")
+    args = parser.parse_args(argv)
+
+    card_ids = list(load_card_catalog(args.cards))
+    deck_rng = random.Random(args.seed)
+    deck_a = load_deck(args.deck_a) if args.deck_a else random_deck(card_ids, deck_rng)
+    deck_b = load_deck(args.deck_b) if args.deck_b else random_deck(card_ids, deck_rng)
+
+    progress = lambda done, total: print(f"\r{done}/{total} games", end="", flush=True)
+    start = time.perf_counter()
+    report = simulate(deck_a, deck_b, args.games, args.workers, args.seed, args.cards, args.max_turns, progress=progress)
+    elapsed = time.perf_counter() - start
+    print()
+    print(f"Throughput: {report['games'] / elapsed:.0f} games/s on {args.workers or os.cpu_count() or 1} worker(s) ({elapsed:.1f}s)")
+    print(f"Games: {report['games']}  Unfinished: {report['unfinished']}  Average turns: {report['average_turns']:.1f}")
+    print(f"Win rate: deck A {report['win_rate'][0]:.1%}, deck B {report['win_rate'][1]:.1%}")
+    for seat, name in enumerate("AB"):
+        top = list(report["plays_per_game"][seat].items())[:5]
+        print(f"Most played (deck {name}): " + ", ".join(f"{cid} {rate:.2f}/game" for cid, rate in top))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f: json.dump(report, f, indent=4)
+        print(f"Report written to {args.output}")
+
+if __name__ == '__main__':
+    main()
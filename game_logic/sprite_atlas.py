@@ -0,0 +1,48 @@
+import pygame
+
+class SpriteAtlas:
+    """Packs pre-scaled, pre-rotated card sprites into a few large page surfaces.
+
+    Sprites are placed with a simple shelf packer: left to right along a row, starting a
+    new row (shelf) when the current one is full and a new page when the page is full.
+    Drawing a sprite is a single blit of a sub-rect from its page, so no per-frame
+    scaling or rotation is needed.
+    """
+    def __init__(self, page_size=(2048, 2048), padding=1):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self.regions = {} # key -> (page_index, rect)
+        self._cursor_x = 0; self._cursor_y = 0; self._shelf_height = 0
+
+    def __contains__(self, key):
+        return key in self.regions
+
+    def _new_page(self):
+        self.pages.append(pygame.Surface(self.page_size, pygame.SRCALPHA))
+        self._cursor_x = 0; self._cursor_y = 0; self._shelf_height = 0
+
+    def add(self, key, surface):
+        """Copies surface into the atlas under key and returns its (page_index, rect)."""
+        if key in self.regions: return self.regions[key]
+        w, h = surface.get_size()
+        if w > self.page_size[0] or h > self.page_size[1]:
+            raise ValueError(f"Sprite {key!r} ({w}x{h}) is larger than an atlas page.")
+
+        if not self.pages: self._new_page()
+        if self._cursor_x + w > self.page_size[0]: # Start a new shelf
+            self._cursor_x = 0; self._cursor_y += self._shelf_height + self.padding; self._shelf_height = 0
+        if self._cursor_y + h > self.page_size[1]: # Start a new page
+            self._new_page()
+
+        rect = pygame.Rect(self._cursor_x, self._cursor_y, w, h)
+        self.pages[-1].blit(surface, rect.topleft)
+        self._cursor_x += w + self.padding
+        self._shelf_height = max(self._shelf_height, h)
+        self.regions[key] = (len(self.pages) - 1, rect)
+        return self.regions[key]
+
+    def blit_args(self, key, pos):
+        """Returns the (source, dest, area) tuple for key, suitable for Surface.blits()."""
+        page_index, rect = self.regions[key]
+        return (self.pages[page_index], pos, rect)
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+class TextLayoutCache:
+    """Memoizes token widths per font and wrapped lines per (text, font, width, variant).
+
+    Font-agnostic: callers pass their own measure/wrap functions, so the Pillow card
+    generator and the pygame client share the same engine. Fonts are used directly as
+    keys, which keeps them alive for as long as their entries are cached.
+    """
+    def __init__(self, max_layouts=4096, max_widths=65536):
+        self.max_layouts = max_layouts
+        self.max_widths = max_widths
+        self.widths = {} # (font, token) -> width
+        self.layouts = OrderedDict() # (text, font, max_width, variant) -> tuple of lines
+        self.hits = 0
+        self.misses = 0
+
+    def width(self, font, token, measure):
+        """Returns measure(token, font), measuring each distinct token once per font."""
+        key = (font, token)
+        width = self.widths.get(key)
+        if width is None:
+            if len(self.widths) >= self.max_widths: self.widths.clear()
+            width = self.widths[key] = measure(token, font)
+        return width
+
+    def layout(self, text, font, max_width, wrap, variant=None):
+        """Returns the cached lines for text, calling wrap(text, font, max_width) on a miss.
+
+        `variant` separates wrappers with different rules (e.g. icon sizes) that share a font.
+        """
+        key = (text, font, max_width, variant)
+        lines = self.layouts.get(key)
+        if lines is not None:
+            self.layouts.move_to_end(key); self.hits += 1
+            return lines
+        self.misses += 1
+        lines = self.layouts[key] = tuple(wrap(text, font, max_width))
+        if len(self.layouts) > self.max_layouts: self.layouts.popitem(last=False)
+        return lines
+
+    def clear(self):
+        self.widths.clear(); self.layouts.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "layouts": len(self.layouts), "widths": len(self.widths)}
+
+# One engine shared by every text renderer in the process.
+text_layout_cache = TextLayoutCache()
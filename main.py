@@ -5,6 +5,7 @@ import random
 import textwrap
 import time
 import re
+from collections import OrderedDict
 
 # --- Constants ---
 LOGICAL_WIDTH = 1920
@@ -14,6 +15,7 @@ CARD_PREVIEW_HEIGHT = 428
 CARD_HAND_WIDTH = 120
 CARD_HAND_HEIGHT = 170
 FPS = 60
+CPU_THINK_MS = 300 # MCTS time budget per CPU move; the search runs in a worker process
 
 # --- Colors ---
 BLACK = (0, 0, 0)
@@ -29,12 +31,19 @@ CLOSE_BUTTON_COLOR = (180, 40, 40)
 BUTTON_COLOR = (0, 100, 200)
 BUTTON_HOVER_COLOR = (50, 150, 255)
 HIGHLIGHT_COLOR = (255, 255, 0, 100) # Semi-transparent yellow for highlighting
+HOVER_OUTLINE_COLOR = (180, 200, 255) # Outline of the card under the mouse
+ATTACK_OUTLINE_COLOR = (255, 60, 60) # Attacking (or selected to attack) characters
+BLOCK_OUTLINE_COLOR = (60, 160, 255) # Characters assigned to block
+EXHAUSTED_TINT = (0, 0, 0, 110) # Darkens exhausted cards on the field
 
 
 # --- File Paths ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CARDS_DIR = os.path.join(SCRIPT_DIR, "cards")
-SAVE_FILE_PATH = os.path.join(SCRIPT_DIR, "savegame.json")
+SAVE_FILE_PATH = os.path.join(SCRIPT_DIR, "savegame.sav")
+AUTOSAVE_FILE_PATH = os.path.join(SCRIPT_DIR, "autosave.sav")
+LEGACY_SAVE_FILE_PATH = os.path.join(SCRIPT_DIR, "savegame.json") # JSON saves from older versions, still loadable
+REPLAY_DIR = os.path.join(SCRIPT_DIR, "replays") # One action log per game, for bug reports and regression games
 CARD_DATA_PATH = os.path.join(CARDS_DIR, "card_data.json")
 CARD_IMAGES_DIR = os.path.join(CARDS_DIR, "generated_cards")
 CARD_BACK_PATH = os.path.join(CARD_IMAGES_DIR, "card_back.png")
@@ -55,6 +64,18 @@ ENERGY_MAPPING = {
 from game_logic.card import Card
 from game_logic.player import Player
 from game_logic.gamestate import GameStateManager
+from game_logic.scheduler import PhaseScheduler
+from game_logic.profiling import StartupTracer
+from game_logic.text_layout import text_layout_cache
+from game_logic.sprite_atlas import SpriteAtlas
+from game_logic.hit_index import HitTestIndex
+from game_logic.save_format import encode_game, decode_game, write_atomic, AutosaveWriter
+from game_logic.replay import ActionLog
+from game_logic.renderer import DirtyRectRenderer
+from game_logic.ai import MCTSAI
+from game_logic.legal_moves import legal_actions
+from game_logic.combat import NO_BLOCK, slots_of
+from game_logic.costs import ENERGY_TYPES, GENERIC
 
 # --- UI Component Classes ---
 class ConfirmationDialog:
@@ -125,6 +146,11 @@ class CardInfoWindow:
         self.scroll_y = 0
         self.close_button_rect = pygame.Rect(self.width - 35, 5, 30, 30)
         self.energy_icons = energy_icons
+        self.text_blocks = OrderedDict() # (card id, width) -> (rendered detail text surface, content height)
+        self.max_text_blocks = 16
+        # The panel is composed once per card (frame, title, preview) and the text is re-blitted only on scroll.
+        self.chrome = None; self.chrome_card_id = None; self.text_box_rect = None
+        self.panel_key = None # (card id, scroll_y) currently composed into self.surface
 
     def show(self, card):
         self.scroll_y = 0; self.visible = True
@@ -152,44 +178,43 @@ class CardInfoWindow:
             self.rect.clamp_ip(pygame.Rect(0,0,LOGICAL_WIDTH, LOGICAL_HEIGHT)); return True
         return is_mouse_over
 
-    def draw_cost_icons(self, surface, cost_string, x, y):
-        """Draws energy cost icons based on the cost string."""
+    def draw_cost_icons(self, surface, cost, x, y):
+        """Draws energy cost icons for a cost vector (see game_logic.costs)."""
         icon_size = self.small_font.get_height()
-        
-        generic_cost_str = ''.join(filter(str.isdigit, cost_string))
-        specific_cost_str = ''.join(filter(str.isalpha, cost_string))
-        
-        specific_costs = {}
-        for char in specific_cost_str:
-            specific_costs[char.upper()] = specific_costs.get(char.upper(), 0) + 1
 
         # Draw generic cost
-        if generic_cost_str:
+        if cost[GENERIC]:
             if icon_img := self.energy_icons.get("N"):
                 scaled_icon = pygame.transform.scale(icon_img, (icon_size, icon_size))
                 surface.blit(scaled_icon, (x, y))
                 
-                num_text = self.bold_small_font.render(generic_cost_str, True, WHITE)
+                num_text = self.bold_small_font.render(str(cost[GENERIC]), True, WHITE)
                 text_rect = num_text.get_rect(center=(x + icon_size / 2, y + icon_size / 2))
                 surface.blit(num_text, text_rect)
                 x += icon_size + 5
 
         # Draw specific costs
-        for code, count in specific_costs.items():
-             if icon_img := self.energy_icons.get(code):
+        for code, count in zip(ENERGY_TYPES[1:], cost[1:]):
+             if count and (icon_img := self.energy_icons.get(code)):
+                scaled_icon = pygame.transform.scale(icon_img, (icon_size, icon_size))
                 for _ in range(count):
-                    scaled_icon = pygame.transform.scale(icon_img, (icon_size, icon_size))
                     surface.blit(scaled_icon, (x, y))
                     x += icon_size + 5
         return x
 
+    def _text_width(self, text):
+        return text_layout_cache.width(self.small_font, text, lambda t, f: f.size(t)[0])
+
     def custom_wrap(self, text, max_width):
-        """A custom text wrapper that understands inline icon syntax and handles long words."""
+        """A custom text wrapper that understands inline icon syntax and handles long words. Results are memoized."""
+        return text_layout_cache.layout(text, self.small_font, max_width, lambda t, f, w: self._custom_wrap(t, w), variant="info_window")
+
+    def _custom_wrap(self, text, max_width):
         lines = []
         words = text.split(' ')
         current_line = []
         current_width = 0
-        space_width = self.small_font.size(' ')[0]
+        space_width = self._text_width(' ')
         inline_icon_size = self.small_font.get_height() + 2 # Icon width + padding
 
         for word in words:
@@ -198,7 +223,7 @@ class CardInfoWindow:
             if is_icon:
                 word_width = inline_icon_size
             else:
-                word_width = self.small_font.size(word)[0]
+                word_width = self._text_width(word)
 
             # If adding this word would exceed the width, wrap the current line
             buffer = 5
@@ -213,7 +238,7 @@ class CardInfoWindow:
                     for broken_line in broken_word_lines[:-1]:
                         lines.append(broken_line)
                     current_line = [broken_word_lines[-1]]
-                    current_width = self.small_font.size(broken_word_lines[-1])[0]
+                    current_width = self._text_width(broken_word_lines[-1])
                 else:
                     current_line = [word]
                     current_width = word_width
@@ -276,34 +301,56 @@ class CardInfoWindow:
             x += text_img.get_width() + space_width
 
 
-    def draw(self, main_surface, card):
-        if not self.visible or not card: return
-        self.surface.fill(WINDOW_BG_COLOR)
-        pygame.draw.rect(self.surface, WHITE, self.surface.get_rect(), 2, border_radius=5)
+    def compose_chrome(self, card):
+        """Renders the parts of the panel that only change with the card: frame, title bar and preview."""
+        chrome = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        chrome.fill(WINDOW_BG_COLOR)
+        pygame.draw.rect(chrome, WHITE, chrome.get_rect(), 2, border_radius=5)
         title_bar_rect = pygame.Rect(0, 0, self.width, 40)
-        pygame.draw.rect(self.surface, TITLE_BAR_COLOR, title_bar_rect, border_top_left_radius=5, border_top_right_radius=5)
+        pygame.draw.rect(chrome, TITLE_BAR_COLOR, title_bar_rect, border_top_left_radius=5, border_top_right_radius=5)
         title_text = self.font.render(card.data.get("name", ""), True, WHITE)
-        self.surface.blit(title_text, title_text.get_rect(centerx=self.width/2, centery=20))
-        pygame.draw.rect(self.surface, CLOSE_BUTTON_COLOR, self.close_button_rect, border_radius=3)
-        pygame.draw.line(self.surface, WHITE, (self.close_button_rect.left + 5, self.close_button_rect.top + 5), (self.close_button_rect.right - 5, self.close_button_rect.bottom - 5), 3)
-        pygame.draw.line(self.surface, WHITE, (self.close_button_rect.left + 5, self.close_button_rect.bottom - 5), (self.close_button_rect.right - 5, self.close_button_rect.top + 5), 3)
+        chrome.blit(title_text, title_text.get_rect(centerx=self.width/2, centery=20))
+        pygame.draw.rect(chrome, CLOSE_BUTTON_COLOR, self.close_button_rect, border_radius=3)
+        pygame.draw.line(chrome, WHITE, (self.close_button_rect.left + 5, self.close_button_rect.top + 5), (self.close_button_rect.right - 5, self.close_button_rect.bottom - 5), 3)
+        pygame.draw.line(chrome, WHITE, (self.close_button_rect.left + 5, self.close_button_rect.bottom - 5), (self.close_button_rect.right - 5, self.close_button_rect.top + 5), 3)
         
         if card_preview_image := card.get_preview_image((CARD_PREVIEW_WIDTH, CARD_PREVIEW_HEIGHT)):
              img_rect = card_preview_image.get_rect(centerx=self.width/2, top=title_bar_rect.bottom + 20)
-             self.surface.blit(card_preview_image, img_rect)
+             chrome.blit(card_preview_image, img_rect)
         
-        text_box_rect = pygame.Rect(10, img_rect.bottom + 20, self.width - 20, self.height - img_rect.bottom - 30)
-        text_render_surface = pygame.Surface((text_box_rect.width, 1000), pygame.SRCALPHA)
+        self.text_box_rect = pygame.Rect(10, img_rect.bottom + 20, self.width - 20, self.height - img_rect.bottom - 30)
+        self.chrome = chrome; self.chrome_card_id = card.data.get("id"); self.panel_key = None
+
+    def draw(self, main_surface, card):
+        if not self.visible or not card: return
+        if self.chrome_card_id != card.data.get("id"): self.compose_chrome(card)
+        text_render_surface, content_height = self.get_text_block(card, self.text_box_rect.width)
+        self.scroll_y = min(self.scroll_y, max(0, content_height - self.text_box_rect.height))
+
+        panel_key = (self.chrome_card_id, self.scroll_y)
+        if panel_key != self.panel_key: # Scrolling is a sub-rect blit of the cached text block
+            self.surface = self.chrome.copy()
+            self.surface.blit(text_render_surface, self.text_box_rect.topleft, (0, self.scroll_y, self.text_box_rect.width, self.text_box_rect.height))
+            self.panel_key = panel_key
+        main_surface.blit(self.surface, self.rect.topleft)
+
+    def get_text_block(self, card, width):
+        """Returns (surface, content height) of the card's rendered details, rendering them only once per card."""
+        key = (card.data.get("id"), width)
+        if (block := self.text_blocks.get(key)) is not None:
+            self.text_blocks.move_to_end(key); return block
+        text_render_surface = pygame.Surface((width, 1000), pygame.SRCALPHA)
         text_render_surface.fill(TRANSPARENT)
-        
+        text_box_rect = pygame.Rect(0, 0, width, 0)
+
         details = card.get_details(); y_offset = 0
-        for key, value in details.items():
-            key_text = self.bold_small_font.render(f"{key}: ", True, WHITE)
+        for label, value in details.items():
+            key_text = self.bold_small_font.render(f"{label}: ", True, WHITE)
             text_render_surface.blit(key_text, (0, y_offset))
             x_offset = key_text.get_width()
             
-            if key == "Cost" and value != "N/A":
-                self.draw_cost_icons(text_render_surface, str(value), x_offset, y_offset)
+            if label == "Cost" and value != "N/A":
+                self.draw_cost_icons(text_render_surface, card.cost, x_offset, y_offset)
                 y_offset += 22
             else:
                 remaining_width = text_box_rect.width - x_offset
@@ -315,10 +362,9 @@ class CardInfoWindow:
                     y_offset += 22
             y_offset += 10
 
-        max_scroll = max(0, y_offset - text_box_rect.height)
-        self.scroll_y = min(self.scroll_y, max_scroll)
-        self.surface.blit(text_render_surface, text_box_rect.topleft, (0, self.scroll_y, text_box_rect.width, text_box_rect.height))
-        main_surface.blit(self.surface, self.rect.topleft)
+        block = self.text_blocks[key] = (text_render_surface.subsurface((0, 0, width, min(y_offset, 1000))).copy(), y_offset)
+        if len(self.text_blocks) > self.max_text_blocks: self.text_blocks.popitem(last=False)
+        return block
 
 class SoulBurialWindow:
     """A scrollable window to display soul burial cards as images."""
@@ -348,9 +394,15 @@ class SoulBurialWindow:
         # Calculate layout
         self.cards_per_row = (self.width - 20) // (self.card_size[0] + self.card_spacing)
         self.row_height = self.card_size[1] + self.card_spacing
+        self.list_rect = pygame.Rect(10, 50, self.width - 20, self.height - 50) # Visible part of the thumbnail strip
+
+        # Thumbnails are drawn once into a persistent strip that grows as cards are buried.
+        self.strip = None; self.strip_cards = [] # Cards already drawn into the strip, in order
+        self.panel_key = None # (card count, scroll_y) currently composed into self.surface
 
     def show(self, cards):
         """Show the soul burial window with the given cards."""
+        if cards is not self.cards: self.strip_cards = []; self.panel_key = None
         self.cards = cards
         self.scroll_y = 0
         self.visible = True
@@ -385,7 +437,7 @@ class SoulBurialWindow:
                     else:
                         clicked_card = self._get_card_at_position(relative_pos)
                         if clicked_card:
-                            game.selected_card = clicked_card
+                            game.selected_card = clicked_card; game.selected_slot = None
                             game.info_window.show(clicked_card)
                             return True
                 # Handle scrolling
@@ -410,19 +462,20 @@ class SoulBurialWindow:
         return is_mouse_over
 
     def _get_card_at_position(self, relative_pos):
-        """Get the card at the given relative position."""
-        if relative_pos[1] < 50:  # Below title bar
+        """Get the card at the given relative position, by index arithmetic over the thumbnail grid."""
+        if not self.list_rect.collidepoint(relative_pos):  # Title bar or border
             return None
         
-        # Adjust for scroll
-        adjusted_y = relative_pos[1] - 50 + self.scroll_y
+        # Position inside the strip, adjusted for scroll
+        strip_x = relative_pos[0] - self.list_rect.x
+        strip_y = relative_pos[1] - self.list_rect.y + self.scroll_y
         
-        # Calculate which card was clicked
-        row = adjusted_y // self.row_height
-        col = relative_pos[0] // (self.card_size[0] + self.card_spacing)
-        
-        card_index = row * self.cards_per_row + col
+        col, x_in_cell = divmod(strip_x, self.card_size[0] + self.card_spacing)
+        row, y_in_cell = divmod(strip_y, self.row_height)
+        if col >= self.cards_per_row or x_in_cell >= self.card_size[0] or y_in_cell >= self.card_size[1]:
+            return None  # In the spacing between cards
         
+        card_index = int(row * self.cards_per_row + col)
         if 0 <= card_index < len(self.cards):
             return self.cards[card_index]
         return None
@@ -435,11 +488,41 @@ class SoulBurialWindow:
         rows = (len(self.cards) + self.cards_per_row - 1) // self.cards_per_row
         return rows * self.row_height
 
+    def _update_strip(self):
+        """Draws thumbnails for newly buried cards into the strip; rebuilds it if cards were removed or reordered."""
+        built = len(self.strip_cards)
+        if built > len(self.cards) or (built and (self.cards[0] is not self.strip_cards[0] or self.cards[built - 1] is not self.strip_cards[-1])):
+            self.strip_cards = []; built = 0
+        if built == len(self.cards) and self.strip is not None:
+            return False
+        
+        rows_needed = max(1, (len(self.cards) + self.cards_per_row - 1) // self.cards_per_row)
+        if self.strip is None or self.strip.get_height() < rows_needed * self.row_height:
+            capacity_rows = max(rows_needed, 2 * self.strip.get_height() // self.row_height if self.strip else 4)
+            grown = pygame.Surface((self.list_rect.width, capacity_rows * self.row_height), pygame.SRCALPHA)
+            if self.strip is not None and built: grown.blit(self.strip, (0, 0))
+            self.strip = grown
+        if built == 0: self.strip.fill(TRANSPARENT)
+        
+        for i in range(built, len(self.cards)):
+            row, col = divmod(i, self.cards_per_row)
+            self.strip.blit(self.cards[i].get_hand_image(self.card_size), (col * (self.card_size[0] + self.card_spacing), row * self.row_height))
+        self.strip_cards = list(self.cards)
+        return True
+
     def draw(self, main_surface):
         """Draw the soul burial window."""
         if not self.visible:
             return
         
+        strip_changed = self._update_strip()
+        panel_key = (len(self.cards), self.scroll_y)
+        if strip_changed or panel_key != self.panel_key:
+            self._compose_panel(); self.panel_key = panel_key
+        main_surface.blit(self.surface, self.rect.topleft)
+
+    def _compose_panel(self):
+        """Redraws the window frame and blits the visible part of the thumbnail strip."""
         self.surface.fill(WINDOW_BG_COLOR)
         pygame.draw.rect(self.surface, WHITE, self.surface.get_rect(), 2, border_radius=5)
         
@@ -459,22 +542,9 @@ class SoulBurialWindow:
         pygame.draw.line(self.surface, WHITE, (self.close_button_rect.left + 5, self.close_button_rect.bottom - 5), 
                         (self.close_button_rect.right - 5, self.close_button_rect.top + 5), 3)
         
-        # Draw cards
+        # Draw cards: one clipped blit of the visible rows
         if self.cards:
-            start_y = 50 - self.scroll_y
-            for i, card in enumerate(self.cards):
-                row = i // self.cards_per_row
-                col = i % self.cards_per_row
-                
-                x = 10 + col * (self.card_size[0] + self.card_spacing)
-                y = start_y + row * self.row_height
-                
-                # Only draw if visible
-                if y + self.card_size[1] > 50 and y < self.height:
-                    card_image = card.get_hand_image(self.card_size)
-                    self.surface.blit(card_image, (x, y))
-        
-        main_surface.blit(self.surface, self.rect.topleft)
+            self.surface.blit(self.strip, self.list_rect.topleft, (0, self.scroll_y, self.list_rect.width, self.list_rect.height))
 
 class PhaseIndicator:
     def __init__(self):
@@ -510,23 +580,40 @@ class PhaseIndicator:
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((LOGICAL_WIDTH, LOGICAL_HEIGHT), pygame.RESIZABLE)
-        self.logical_screen = pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT))
-        pygame.display.set_caption("Bleach Soul Deck"); self.clock = pygame.time.Clock()
-        self.large_font = pygame.font.Font(None, 74); self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
-        self.running = True; self.all_cards = {}; self.energy_icons = self.load_energy_icons()
-        self.card_back_image = self.load_card_back()
-        self.load_card_data()
-        self.player = Player("Player 1"); self.cpu = Player("CPU")
-        self.selected_card = None; self.info_window = CardInfoWindow(self.energy_icons)
-        self.player_soul_burial_window = SoulBurialWindow(is_player_side=True)
-        self.cpu_soul_burial_window = SoulBurialWindow(is_player_side=False)
-        self.phase_indicator = PhaseIndicator(); self.confirmation_dialog = ConfirmationDialog("Advance to next phase?")
+    def __init__(self, tracer=None):
+        # Each startup stage is timed; set BSD_TRACE_STARTUP=1 to print the breakdown.
+        self.startup_tracer = tracer = tracer or StartupTracer()
+        with tracer.stage("pygame.init"): pygame.init()
+        with tracer.stage("display"):
+            self.screen = pygame.display.set_mode((LOGICAL_WIDTH, LOGICAL_HEIGHT), pygame.RESIZABLE)
+            self.logical_screen = pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT))
+            self.renderer = DirtyRectRenderer((LOGICAL_WIDTH, LOGICAL_HEIGHT))
+            pygame.display.set_caption("Bleach Soul Deck"); self.clock = pygame.time.Clock()
+        with tracer.stage("fonts"):
+            self.large_font = pygame.font.Font(None, 74); self.font = pygame.font.Font(None, 36)
+            self.small_font = pygame.font.Font(None, 24)
+        self.running = True; self.all_cards = {}
+        with tracer.stage("load_energy_icons"): self.energy_icons = self.load_energy_icons()
+        with tracer.stage("load_card_back"):
+            self.card_back_image = self.load_card_back()
+            self.image_cache = Card.scaled_cache # Exposes hits/misses via self.image_cache.stats()
+            self.sprite_atlas = SpriteAtlas(); self.build_sprite_atlas()
+        with tracer.stage("load_card_data"): self.load_card_data()
+        with tracer.stage("cpu_ai"): self.cpu_ai = MCTSAI.from_catalog(self.all_cards, time_budget_ms=CPU_THINK_MS); self.cpu_ai.start()
+        with tracer.stage("windows"):
+            self.player = Player("Player 1"); self.cpu = Player("CPU")
+            self.selected_card = None; self.selected_slot = None; self.info_window = CardInfoWindow(self.energy_icons)
+            self.player_soul_burial_window = SoulBurialWindow(is_player_side=True)
+            self.cpu_soul_burial_window = SoulBurialWindow(is_player_side=False)
+            self.phase_indicator = PhaseIndicator(); self.confirmation_dialog = ConfirmationDialog("Advance to next phase?")
         self.game_state = 'main_menu'; self.state_manager = None
-        self.define_layout(); self.define_menu_buttons()
+        self.autosaver = AutosaveWriter()
+        self.action_log = None; self.seed = None; self.rng = random.Random()
+        self.mouse_pos = (0, 0); self.hover_target = None # Logical mouse position and (owner, zone, slot) under it, once per frame
+        self.play_targets = {} # (owner, zone, slot) -> legal play of the selected hand card, once per frame
+        self.combat_marks = {} # (owner, "character", slot) -> "attacker", "blocker" or "selected", once per frame
+        self.reset_combat_selection()
+        with tracer.stage("define_layout"): self.define_layout(); self.define_menu_buttons()
 
     def define_layout(self):
         center_x = LOGICAL_WIDTH / 2; center_y = LOGICAL_HEIGHT / 2
@@ -546,6 +633,7 @@ class Game:
         self.cpu_burial_zone = pygame.Rect(start_x_main - ZONE_H_GAP - CARD_HAND_WIDTH, cpu_supp_y, CARD_HAND_WIDTH, CARD_HAND_HEIGHT)
         self.cpu_deck_zone = pygame.Rect(self.cpu_burial_zone.left - ZONE_H_GAP - CARD_HAND_WIDTH, cpu_supp_y, CARD_HAND_WIDTH, CARD_HAND_HEIGHT)
         self.pause_button_rect = pygame.Rect(LOGICAL_WIDTH - 60, 10, 50, 50)
+        self.game_over_rect = pygame.Rect(0, 0, 800, 100); self.game_over_rect.center = (center_x, center_y)
 
         # --- Player Status Display Layout (LP & Energy) ---
         self.player_status_rect = pygame.Rect(self.player_deck_zone.x, self.player_deck_zone.y - 80, self.player_burial_zone.right - self.player_deck_zone.x, 70)
@@ -569,8 +657,18 @@ class Game:
         self.channel_button_rect = pygame.Rect(self.player_reiryoku_zone_rect.x, self.player_reiryoku_zone_rect.bottom + 10, CARD_HAND_WIDTH, 40)
         # --- End Layout Update ---
 
+        # --- Hit-Test Index (board zones; the hand row is resolved arithmetically in player_hand_slot_at) ---
+        self.board_index = HitTestIndex(LOGICAL_WIDTH, LOGICAL_HEIGHT)
+        for side in ("player", "cpu"):
+            for i, rect in enumerate(getattr(self, f"{side}_character_zones")): self.board_index.add(rect, (side, "character", i))
+            for i, rect in enumerate(getattr(self, f"{side}_support_zones")): self.board_index.add(rect, (side, "support", i))
+            self.board_index.add(getattr(self, f"{side}_field_zone"), (side, "field", 0))
+            self.board_index.add(getattr(self, f"{side}_deck_zone"), (side, "deck", 0))
+            self.board_index.add(getattr(self, f"{side}_burial_zone"), (side, "burial", 0))
+            self.board_index.add(getattr(self, f"{side}_reiryoku_zone_rect"), (side, "reiryoku", 0))
+
     def define_menu_buttons(self):
-        self.main_menu_buttons = {"New Battle": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 - 50, 300, 60),"Load Battle": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 + 30, 300, 60),"Quit": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 + 110, 300, 60)}
+        self.main_menu_buttons = {"New Battle": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 - 50, 300, 60),"Load Battle": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 + 30, 300, 60),"Continue (Autosave)": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 + 110, 300, 60),"Quit": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 + 190, 300, 60)}
         self.pause_menu_buttons = {"Resume": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 - 50, 300, 60),"Save Game": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 + 30, 300, 60),"Exit to Main Menu": pygame.Rect(LOGICAL_WIDTH/2 - 150, LOGICAL_HEIGHT/2 + 110, 300, 60)}
 
     def load_energy_icons(self):
@@ -589,6 +687,19 @@ class Game:
             image = pygame.Surface((CARD_HAND_WIDTH, CARD_HAND_HEIGHT)); image.fill((40, 0, 80)); pygame.draw.rect(image, (80, 0, 160), image.get_rect(), 10)
         return pygame.transform.scale(image, (CARD_HAND_WIDTH, CARD_HAND_HEIGHT))
 
+    def build_sprite_atlas(self):
+        """Packs the card back in both orientations into the sprite atlas."""
+        self.sprite_atlas.add(("card_back", 0), self.card_back_image)
+        self.sprite_atlas.add(("card_back", 180), pygame.transform.rotate(self.card_back_image, 180))
+
+    def card_sprite(self, card, rotation=0):
+        """Returns the atlas key of a hand-sized card face, packing it on first use. The atlas is the only owner of
+        these faces: they are rendered uncached, so Card.scaled_cache does not hold a second copy."""
+        key = (card.data.get("id"), rotation)
+        if key not in self.sprite_atlas:
+            self.sprite_atlas.add(key, card.render_scaled_image((CARD_HAND_WIDTH, CARD_HAND_HEIGHT), rotation))
+        return key
+
     def load_card_data(self):
         if not os.path.exists(CARD_DATA_PATH): return
         try:
@@ -597,25 +708,49 @@ class Game:
                 if card_id := card_data.get("id"): self.all_cards[card_id] = Card(card_data, CARD_IMAGES_DIR)
         except Exception as e: print(f"Error loading card data: {e}")
 
+    def reseed(self):
+        """Starts a new RNG for deck shuffles and CPU choices; set BSD_SEED to replay a specific game."""
+        self.seed = int(os.environ.get("BSD_SEED") or random.randrange(2**32)); self.rng = random.Random(self.seed)
+
+    def start_action_log(self):
+        """Streams this game's actions to a new file in REPLAY_DIR."""
+        if self.action_log: self.action_log.close(); self.action_log = None
+        try:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.seed}.bsr")
+            self.action_log = ActionLog(path, seed=self.seed); self.action_log.attach(self.state_manager)
+        except OSError as e: print(f"Warning: Could not start the replay log: {e}")
+
     def start_new_game(self):
         self.player = Player("Player 1"); self.cpu = Player("CPU")
         if not self.all_cards: return
-        ids = list(self.all_cards.keys()); random.shuffle(ids)
+        self.reseed()
+        ids = list(self.all_cards.keys()); self.rng.shuffle(ids)
         player_deck_ids = (ids * (50 // len(ids) + 1))[:50]
         cpu_deck_ids = (ids * (50 // len(ids) + 1))[:50]
-        random.shuffle(player_deck_ids)
-        random.shuffle(cpu_deck_ids)
-        self.player.create_deck([self.all_cards[cid] for cid in player_deck_ids])
-        self.cpu.create_deck([self.all_cards[cid] for cid in cpu_deck_ids])
-        self.state_manager = GameStateManager(self)
+        self.rng.shuffle(player_deck_ids)
+        self.rng.shuffle(cpu_deck_ids)
+        self.player.create_deck([self.all_cards[cid].new_instance() for cid in player_deck_ids], rng=self.rng)
+        self.cpu.create_deck([self.all_cards[cid].new_instance() for cid in cpu_deck_ids], rng=self.rng)
+        # Decode the deck images in the background; anything not ready yet is decoded on first draw.
+        Card.image_loader.prefetch(list(self.player.deck) + list(self.cpu.deck))
+        self.state_manager = GameStateManager(self, PhaseScheduler(clock=pygame.time.get_ticks), rng=self.rng, ai=self.cpu_ai)
+        self.state_manager.on_phase_change = self.autosave
+        self.start_action_log()
         self.game_state = 'in_game'; self.state_manager.start_game()
 
     def run(self):
+        first_frame = True
         while self.running:
             self.handle_events()
             if self.game_state == 'in_game': self.update()
             self.draw()
+            if first_frame:
+                first_frame = False; self.startup_tracer.mark("first_frame")
+                if os.environ.get("BSD_TRACE_STARTUP"): print(self.startup_tracer.report())
             self.clock.tick(FPS)
+        Card.image_loader.shutdown(); self.autosaver.shutdown(); self.cpu_ai.shutdown()
+        if self.action_log: self.action_log.close()
         pygame.quit()
         
     def scale_mouse_pos(self, pos):
@@ -624,16 +759,18 @@ class Game:
         return int(pos[0] * (LOGICAL_WIDTH / w)), int(pos[1] * (LOGICAL_HEIGHT / h))
 
     def handle_events(self):
+        self.mouse_pos = logical_pos = self.scale_mouse_pos(pygame.mouse.get_pos())
         for event in pygame.event.get():
             if event.type == pygame.QUIT: self.running = False
-            if event.type == pygame.VIDEORESIZE: self.screen = pygame.display.set_mode(event.size, pygame.RESIZABLE)
-            
-            logical_pos = self.scale_mouse_pos(pygame.mouse.get_pos())
+            if event.type == pygame.VIDEORESIZE:
+                self.screen = pygame.display.set_mode(event.size, pygame.RESIZABLE); self.renderer.invalidate()
+                self.mouse_pos = logical_pos = self.scale_mouse_pos(pygame.mouse.get_pos())
+            if event.type == pygame.WINDOWEXPOSED: self.renderer.invalidate()
             
             if self.confirmation_dialog.visible:
                 result = self.confirmation_dialog.handle_event(event, logical_pos)
                 if result == "yes":
-                    self.state_manager.advance_player_phase()
+                    self.confirm_phase_end()
                 if result is not None: continue 
 
             if event.type == pygame.KEYDOWN:
@@ -649,6 +786,7 @@ class Game:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.main_menu_buttons["New Battle"].collidepoint(pos): self.start_new_game()
             if self.main_menu_buttons["Load Battle"].collidepoint(pos): self.load_game_state()
+            if self.main_menu_buttons["Continue (Autosave)"].collidepoint(pos): self.load_game_state(AUTOSAVE_FILE_PATH)
             if self.main_menu_buttons["Quit"].collidepoint(pos): self.running = False
 
     def handle_ingame_events(self, event, pos):
@@ -664,25 +802,27 @@ class Game:
         
         if self.state_manager and self.state_manager.sub_state == 'awaiting_channel_target':
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                for i, card in enumerate(self.player.hand):
-                    if self.get_player_hand_rect(i).collidepoint(pos):
-                        self.player.channel_reiryoku(card)
-                        self.state_manager.sub_state = None
-                        self.deselect_card()
-                        return
                 self.state_manager.sub_state = None
+                if (i := self.player_hand_slot_at(pos)) is not None:
+                    self.state_manager.apply_action(self.player, ("channel", i))
+                    self.deselect_card()
             return
 
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.pause_button_rect.collidepoint(pos): self.game_state = 'paused'
             elif self.next_phase_button_rect.collidepoint(pos): 
+                if self.state_manager.ai_controls(self.state_manager.current_player) and not self.declaring_blocks(): return # The CPU ends its own phases
                 current_phase = self.state_manager.current_phase
                 question = f"End {current_phase}?"
                 if current_phase == "Main2":
                     question = "End Turn?"
+                elif self.declaring_blocks():
+                    question = "Confirm blockers?"
+                elif self.declaring_attack() and self.attack_selection:
+                    question = f"Attack with {len(slots_of(self.attack_selection))} character(s)?"
                 self.confirmation_dialog.ask(question)
             elif self.channel_button_rect.collidepoint(pos):
-                if self.state_manager and self.state_manager.current_phase in ["Main1", "Main2"] and not self.player.has_channeled_this_turn:
+                if self.can_channel():
                     self.state_manager.sub_state = 'awaiting_channel_target'
                     print("Select a card from your hand to channel for Reiryoku.")
             else: self.handle_card_click(pos)
@@ -693,62 +833,130 @@ class Game:
             if self.pause_menu_buttons["Save Game"].collidepoint(pos): self.save_game_state()
             if self.pause_menu_buttons["Exit to Main Menu"].collidepoint(pos): self.game_state = 'main_menu'
 
-    def deselect_card(self): self.selected_card = None; self.info_window.hide()
+    def deselect_card(self): self.selected_card = None; self.selected_slot = None; self.info_window.hide()
+
+    def selected_hand_slot(self):
+        """Hand slot of the selected card, or None if the selection is not (or no longer) in the player's hand."""
+        return self.player.find_in_hand(self.selected_card, self.selected_slot) if self.selected_card else None
     
     def handle_discard_click(self, mouse_pos):
-        for i, card in enumerate(self.player.hand):
-            if self.get_player_hand_rect(i).collidepoint(mouse_pos):
-                self.player.discard_card(card)
-                self.state_manager.check_hand_size()
-                break
+        if (i := self.player_hand_slot_at(mouse_pos)) is not None:
+            self.player.discard_card(self.player.hand[i], hand_index=i)
+            self.state_manager.check_hand_size()
+
+    def player_hand_slot_at(self, pos):
+        """Index of the player's hand card under pos, by arithmetic over the hand row (tracks the hand size)."""
+        hand_y = LOGICAL_HEIGHT - CARD_HAND_HEIGHT - 20
+        if not hand_y <= pos[1] < hand_y + CARD_HAND_HEIGHT: return None
+        start_x = LOGICAL_WIDTH // 2 - (len(self.player.hand) * (CARD_HAND_WIDTH + 10) // 2)
+        slot, offset = divmod(pos[0] - start_x, CARD_HAND_WIDTH + 10)
+        return slot if 0 <= slot < len(self.player.hand) and offset < CARD_HAND_WIDTH else None
+
+    def hit_test(self, pos):
+        """Resolves a logical position to (owner, zone, slot), or None if it is not over a hand card or zone."""
+        if (slot := self.player_hand_slot_at(pos)) is not None: return ("player", "hand", slot)
+        return self.board_index.hit(pos)
+
+    def card_at(self, target):
+        """The card shown at a hit-test target (the top card for reiryoku), or None."""
+        if target is None: return None
+        owner, zone, slot = target
+        p = self.player if owner == "player" else self.cpu
+        if zone == "hand": return p.hand[slot] if slot < len(p.hand) else None
+        if zone == "character": return p.character_zones[slot]
+        if zone == "support": return p.support_zones[slot]
+        if zone == "field": return p.field_card_zone
+        if zone == "reiryoku": return p.reiryoku_zone[-1] if p.reiryoku_zone else None
+        return None
+
+    def target_rect(self, target):
+        if target[1] == "hand": return self.get_player_hand_rect(target[2])
+        return pygame.Rect(self.board_index.rect_of(target))
+
+    def player_actions(self):
+        """The player's legal actions right now (none on the CPU's turn), from legal_moves.legal_actions."""
+        sm = self.state_manager
+        if not sm or sm.current_player is not self.player: return []
+        return list(legal_actions(sm))
+
+    def can_channel(self):
+        return any(action[0] == "channel" for action in self.player_actions())
+
+    def get_play_targets(self):
+        """{(owner, zone, slot): action} for every zone the selected hand card can legally be played to (none if it cannot be paid for)."""
+        slot = self.selected_hand_slot()
+        if slot is None: return {}
+        return {("player", action[2], action[3]): action for action in self.player_actions() if action[0] == "play" and action[1] == slot}
+
+    # --- Combat ---
+    def reset_combat_selection(self):
+        self.attack_selection = 0 # Character slots the player has picked to attack with
+        self.block_selection = bytearray([NO_BLOCK] * 5) # CPU attacker slot -> player's blocking slot
+        self.selected_blocker = None
+
+    def declaring_attack(self):
+        sm = self.state_manager
+        return bool(sm) and sm.current_player is self.player and sm.current_phase == "Combat" and not sm.sub_state and not sm.game_over
+
+    def declaring_blocks(self):
+        sm = self.state_manager
+        return bool(sm) and sm.sub_state == 'awaiting_blockers' and sm.defending_player is self.player
+
+    def handle_combat_click(self, target):
+        """Toggles attackers, or pairs a blocker with an attacker. Returns True if the click was used."""
+        if target is None or target[1] != "character": return False
+        owner, _, slot = target
+        if self.declaring_attack() and owner == "player":
+            if not self.player.moves.ready_characters() >> slot & 1: return False
+            self.attack_selection ^= 1 << slot; return True
+        if not self.declaring_blocks(): return False
+        if owner == "player" and self.player.moves.ready_characters() >> slot & 1:
+            if slot in self.block_selection: self.block_selection[self.block_selection.index(slot)] = NO_BLOCK # Unassign
+            else: self.selected_blocker = slot
+            return True
+        if owner == "cpu" and self.selected_blocker is not None and self.state_manager.pending_attack >> slot & 1:
+            self.block_selection[slot] = self.selected_blocker; self.selected_blocker = None
+            return True
+        return False
+
+    def confirm_phase_end(self):
+        """Runs the confirmed Next Phase: declares the selected blockers or attackers, or just ends the phase."""
+        sm = self.state_manager
+        if self.declaring_blocks(): sm.declare_blocks(bytes(self.block_selection))
+        elif self.declaring_attack() and self.attack_selection: sm.declare_attack(self.attack_selection)
+        else: sm.advance_player_phase()
+        self.reset_combat_selection()
+
+    def get_combat_marks(self):
+        """{(owner, "character", slot): mark} for the attack being declared or the blocks being chosen."""
+        sm = self.state_manager
+        if self.declaring_attack():
+            self.attack_selection &= self.player.moves.ready_characters()
+            return {("player", "character", slot): "attacker" for slot in slots_of(self.attack_selection)}
+        if not sm or sm.sub_state != 'awaiting_blockers': return {}
+        attacker, defender = ("player", "cpu") if sm.current_player is self.player else ("cpu", "player")
+        marks = {(attacker, "character", slot): "attacker" for slot in slots_of(sm.pending_attack)}
+        for blocker in self.block_selection:
+            if blocker != NO_BLOCK: marks[(defender, "character", blocker)] = "blocker"
+        if self.selected_blocker is not None: marks[(defender, "character", self.selected_blocker)] = "selected"
+        return marks
 
     def handle_card_click(self, mouse_pos):
-        if self.selected_card and self.selected_card in self.player.hand:
-            if self.state_manager and self.state_manager.current_phase in ["Main1", "Main2"]:
-                card_type = self.selected_card.data.get("type")
-                if card_type == "Character":
-                    for i, r in enumerate(self.player_character_zones):
-                        if r.collidepoint(mouse_pos) and not self.player.character_zones[i]: self.player.play_card_to_zone(self.selected_card, "character", i); self.deselect_card(); return
-                elif card_type in ["Technique", "Equipment"]:
-                     for i, r in enumerate(self.player_support_zones):
-                        if r.collidepoint(mouse_pos) and not self.player.support_zones[i]: self.player.play_card_to_zone(self.selected_card, "support", i); self.deselect_card(); return
-                elif card_type == "Field":
-                    if self.player_field_zone.collidepoint(mouse_pos) and not self.player.field_card_zone: self.player.play_card_to_zone(self.selected_card, "field", 0); self.deselect_card(); return
-        
-        clicked_a_card = False
-        for i, card in enumerate(self.player.hand):
-            if self.get_player_hand_rect(i).collidepoint(mouse_pos): self.selected_card = card; self.info_window.show(card); clicked_a_card = True; break
-        if not clicked_a_card:
-            all_zones = [
-                (self.player.character_zones, self.player_character_zones), 
-                (self.player.support_zones, self.player_support_zones),
-                ([self.player.field_card_zone], [self.player_field_zone]), 
-                (self.cpu.character_zones, self.cpu_character_zones),
-                (self.cpu.support_zones, self.cpu_support_zones),
-                ([self.cpu.field_card_zone], [self.cpu_field_zone]),
-                (self.player.reiryoku_zone, [self.player_reiryoku_zone_rect]),
-                (self.cpu.reiryoku_zone, [self.cpu_reiryoku_zone_rect])
-            ]
-            for card_list, rect_list in all_zones:
-                if rect_list and (rect_list[0] == self.player_reiryoku_zone_rect or rect_list[0] == self.cpu_reiryoku_zone_rect):
-                    if card_list and rect_list[0].collidepoint(mouse_pos):
-                        self.selected_card = card_list[-1]; self.info_window.show(card_list[-1]); clicked_a_card = True; break
-                else:
-                    for i, card in enumerate(card_list):
-                        if card and rect_list[i].collidepoint(mouse_pos):
-                            self.selected_card = card; self.info_window.show(card); clicked_a_card = True; break
-                if clicked_a_card: break
+        target = self.hit_test(mouse_pos)
+        owner, zone, slot = target or (None, None, None)
+        if self.handle_combat_click(target): return
+        if action := self.get_play_targets().get(target):
+            self.state_manager.apply_action(self.player, action); self.deselect_card(); return
+        
+        if card := self.card_at(target):
+            self.selected_card = card; self.selected_slot = slot if zone == "hand" else None; self.info_window.show(card); return
         
         # Check for soul burial zone clicks
-        if not clicked_a_card:
-            if self.player_burial_zone.collidepoint(mouse_pos) and self.player.soul_burial:
-                self.player_soul_burial_window.show(self.player.soul_burial)
-                clicked_a_card = True
-            elif self.cpu_burial_zone.collidepoint(mouse_pos) and self.cpu.soul_burial:
-                self.cpu_soul_burial_window.show(self.cpu.soul_burial)
-                clicked_a_card = True
+        if zone == "burial":
+            burial, window = (self.player.soul_burial, self.player_soul_burial_window) if owner == "player" else (self.cpu.soul_burial, self.cpu_soul_burial_window)
+            if burial: window.show(burial); return
         
-        if not clicked_a_card: self.deselect_card()
+        self.deselect_card()
 
     def update(self):
         self.phase_indicator.update()
@@ -759,19 +967,78 @@ class Game:
         return pygame.Rect(start_x + i * (CARD_HAND_WIDTH + 10), LOGICAL_HEIGHT - CARD_HAND_HEIGHT - 20, CARD_HAND_WIDTH, CARD_HAND_HEIGHT)
 
     def draw(self):
+        # Resolved once per frame, after events and updates, so it matches the hand and board being drawn.
+        self.hover_target = self.hit_test(self.mouse_pos) if self.game_state == 'in_game' and self.state_manager else None
+        self.play_targets = self.get_play_targets() if self.game_state == 'in_game' else {}
+        self.combat_marks = self.get_combat_marks() if self.game_state == 'in_game' else {}
+        dirty_rects = self.renderer.collect(self.get_render_regions())
+        self.renderer.present(self.logical_screen, self.screen, dirty_rects, self.draw_scene)
+
+    def draw_scene(self):
         if self.game_state == 'main_menu': self.draw_main_menu()
         elif self.game_state in ['in_game', 'paused']:
             self.draw_game_board()
             if self.game_state == 'paused': self.draw_pause_menu()
-        
-        scaled_surface = pygame.transform.scale(self.logical_screen, self.screen.get_size())
-        self.screen.blit(scaled_surface, (0, 0)); pygame.display.flip()
+
+    def get_render_regions(self):
+        """Describes the screen as {name: (rect, signature)} so the renderer can redraw only what changed."""
+        mouse_pos = self.mouse_pos
+        full_rect = pygame.Rect(0, 0, LOGICAL_WIDTH, LOGICAL_HEIGHT)
+        dialog = self.confirmation_dialog
+        regions = {"screen": (full_rect, (self.game_state, dialog.visible, dialog.question))}
+
+        if self.game_state == 'main_menu':
+            for name, rect in self.main_menu_buttons.items(): regions[f"menu:{name}"] = (rect, rect.collidepoint(mouse_pos))
+            return regions
+        if self.game_state == 'paused':
+            for name, rect in self.pause_menu_buttons.items(): regions[f"pause:{name}"] = (rect, rect.collidepoint(mouse_pos))
+        if dialog.visible:
+            regions["dialog:yes"] = (dialog.yes_button, dialog.yes_button.collidepoint(mouse_pos))
+            regions["dialog:no"] = (dialog.no_button, dialog.no_button.collidepoint(mouse_pos))
+
+        # --- Board Zones ---
+        card_state = lambda card, target: (card, card.is_exhausted, self.combat_marks.get(target)) if card else target in self.play_targets
+        top_card = lambda cards: cards[-1] if cards else None
+        for side, p in (("player", self.player), ("cpu", self.cpu)):
+            for i, card in enumerate(p.character_zones): regions[f"{side}:character:{i}"] = (getattr(self, f"{side}_character_zones")[i], card_state(card, (side, "character", i)))
+            for i, card in enumerate(p.support_zones): regions[f"{side}:support:{i}"] = (getattr(self, f"{side}_support_zones")[i], card_state(card, (side, "support", i)))
+            regions[f"{side}:field"] = (getattr(self, f"{side}_field_zone"), card_state(p.field_card_zone, (side, "field", 0)))
+            regions[f"{side}:deck"] = (getattr(self, f"{side}_deck_zone"), len(p.deck))
+            regions[f"{side}:burial"] = (getattr(self, f"{side}_burial_zone"), (len(p.soul_burial), top_card(p.soul_burial)))
+            regions[f"{side}:reiryoku"] = (getattr(self, f"{side}_reiryoku_zone_rect"), len(p.reiryoku_zone))
+
+        # --- Hands ---
+        hand_y = LOGICAL_HEIGHT - CARD_HAND_HEIGHT - 20
+        selected_in_hand = self.selected_card if self.selected_hand_slot() is not None else None
+        regions["player:hand"] = (pygame.Rect(0, hand_y, LOGICAL_WIDTH, CARD_HAND_HEIGHT), (tuple(self.player.hand), selected_in_hand))
+        regions["cpu:hand"] = (pygame.Rect(0, 20, LOGICAL_WIDTH, CARD_HAND_HEIGHT), len(self.cpu.hand))
+        hover_rect = self.hover_rect()
+        regions["hover"] = (hover_rect or pygame.Rect(0, 0, 0, 0), (self.hover_target, hover_rect is not None))
+
+        # --- Status Panels, Buttons and Prompts ---
+        sm = self.state_manager
+        if sm:
+            regions["player:status"] = (self.player_status_rect, (self.player.life_points, tuple(self.player.get_energy_pool().counts)))
+            regions["cpu:status"] = (self.cpu_status_rect, (self.cpu.life_points, tuple(self.cpu.get_energy_pool().counts)))
+            regions["phase_button"] = (self.next_phase_button_rect, (sm.sub_state != 'awaiting_discard', sm.current_phase, sm.current_player == self.player,
+                                                                     self.declaring_blocks(), bool(self.attack_selection), self.next_phase_button_rect.collidepoint(mouse_pos)))
+            regions["channel_button"] = (self.channel_button_rect, (sm.current_player == self.player, self.can_channel(), self.channel_button_rect.collidepoint(mouse_pos)))
+            regions["phase_indicator"] = (self.phase_indicator.rect, (self.phase_indicator.visible, sm.current_phase))
+            regions["prompt"] = (pygame.Rect(0, LOGICAL_HEIGHT - 250, LOGICAL_WIDTH, 60), (sm.sub_state, len(sm.current_player.hand), self.declaring_blocks()))
+            regions["game_over"] = (self.game_over_rect, sm.winner)
+
+        # --- Windows ---
+        info = self.info_window
+        regions["info_window"] = (info.rect, (info.visible, self.selected_card, info.scroll_y))
+        for name, window in (("player_burial_window", self.player_soul_burial_window), ("cpu_burial_window", self.cpu_soul_burial_window)):
+            regions[name] = (window.rect, (window.visible, len(window.cards), window.scroll_y))
+        return regions
 
     def draw_main_menu(self):
         self.logical_screen.fill((10, 10, 20))
         title = self.large_font.render("Bleach: Soul Deck", True, WHITE)
         self.logical_screen.blit(title, title.get_rect(centerx=LOGICAL_WIDTH/2, centery=LOGICAL_HEIGHT/2 - 200))
-        mouse_pos = self.scale_mouse_pos(pygame.mouse.get_pos())
+        mouse_pos = self.mouse_pos
         for name, rect in self.main_menu_buttons.items():
             color = BUTTON_HOVER_COLOR if rect.collidepoint(mouse_pos) else BUTTON_COLOR
             pygame.draw.rect(self.logical_screen, color, rect, border_radius=10)
@@ -779,15 +1046,17 @@ class Game:
     
     def draw_pause_menu(self):
         overlay = pygame.Surface((LOGICAL_WIDTH, LOGICAL_HEIGHT), pygame.SRCALPHA); overlay.fill((0, 0, 0, 180)); self.logical_screen.blit(overlay, (0, 0))
-        mouse_pos = self.scale_mouse_pos(pygame.mouse.get_pos())
+        mouse_pos = self.mouse_pos
         for name, rect in self.pause_menu_buttons.items():
             color = BUTTON_HOVER_COLOR if rect.collidepoint(mouse_pos) else BUTTON_COLOR
             pygame.draw.rect(self.logical_screen, color, rect, border_radius=10)
             text = self.font.render(name, True, WHITE); self.logical_screen.blit(text, text.get_rect(center=rect.center))
     
     def draw_game_board(self):
-        self.logical_screen.fill((20, 20, 30)); self.draw_zones(self.logical_screen); self.draw_cards_on_field(self.logical_screen)
-        self.draw_hands(self.logical_screen); self.draw_counters(self.logical_screen); self.draw_player_status(self.logical_screen)
+        self.logical_screen.fill((20, 20, 30)); self.draw_zones(self.logical_screen); self.draw_play_targets(self.logical_screen); self.draw_cards_on_field(self.logical_screen)
+        self.draw_combat_marks(self.logical_screen)
+        self.draw_hands(self.logical_screen); self.draw_counters(self.logical_screen); self.draw_hover(self.logical_screen)
+        self.draw_player_status(self.logical_screen)
         self.info_window.draw(self.logical_screen, self.selected_card)
         self.player_soul_burial_window.draw(self.logical_screen)
         self.cpu_soul_burial_window.draw(self.logical_screen)
@@ -801,7 +1070,7 @@ class Game:
         if self.state_manager and self.state_manager.sub_state != 'awaiting_discard':
             self.draw_phase_button(self.logical_screen)
         if self.state_manager: self.phase_indicator.draw(self.logical_screen, self.state_manager.current_phase)
-        self.confirmation_dialog.draw(self.logical_screen, self.scale_mouse_pos(pygame.mouse.get_pos()))
+        self.confirmation_dialog.draw(self.logical_screen, self.mouse_pos)
 
         if self.state_manager and self.state_manager.sub_state == 'awaiting_discard':
             current_player = self.state_manager.current_player
@@ -812,21 +1081,32 @@ class Game:
             prompt_text = self.font.render("Select a card in your hand to Channel.", True, (255, 255, 150))
             self.logical_screen.blit(prompt_text, prompt_text.get_rect(centerx=LOGICAL_WIDTH / 2, y=LOGICAL_HEIGHT - 250))
 
+        if self.declaring_blocks():
+            prompt_text = self.font.render("Select one of your ready characters, then the attacker it blocks.", True, (255, 255, 150))
+            self.logical_screen.blit(prompt_text, prompt_text.get_rect(centerx=LOGICAL_WIDTH / 2, y=LOGICAL_HEIGHT - 250))
+
+        if self.state_manager and self.state_manager.game_over:
+            winner_text = self.large_font.render(f"{self.state_manager.winner.name} wins!", True, (255, 215, 0))
+            self.logical_screen.blit(winner_text, winner_text.get_rect(center=self.game_over_rect.center))
+
 
     def draw_phase_button(self, surface):
-        mouse_pos = self.scale_mouse_pos(pygame.mouse.get_pos())
+        mouse_pos = self.mouse_pos
         color = BUTTON_HOVER_COLOR if self.next_phase_button_rect.collidepoint(mouse_pos) else BUTTON_COLOR
         pygame.draw.circle(surface, color, self.next_phase_button_rect.center, self.next_phase_button_rect.width / 2)
         phase_text = self.state_manager.current_phase if self.state_manager else ""
         button_main_text = "End Turn" if phase_text == "Main2" else "Next Phase"
+        if self.state_manager and self.state_manager.ai_controls(self.state_manager.current_player): button_main_text = "CPU Turn"
+        if self.declaring_blocks(): button_main_text = "Block"
+        elif self.declaring_attack() and self.attack_selection: button_main_text = "Attack"
         text1 = self.font.render(button_main_text, True, WHITE)
         text2 = self.small_font.render(f"({phase_text})", True, WHITE)
         surface.blit(text1, text1.get_rect(centerx=self.next_phase_button_rect.centerx, centery=self.next_phase_button_rect.centery - 15))
         surface.blit(text2, text2.get_rect(centerx=self.next_phase_button_rect.centerx, centery=self.next_phase_button_rect.centery + 15))
 
     def draw_channel_button(self, surface):
-        mouse_pos = self.scale_mouse_pos(pygame.mouse.get_pos())
-        is_active = self.state_manager and self.state_manager.current_phase in ["Main1", "Main2"] and not self.player.has_channeled_this_turn
+        mouse_pos = self.mouse_pos
+        is_active = self.can_channel()
         
         color = GRAY if not is_active else BUTTON_HOVER_COLOR if self.channel_button_rect.collidepoint(mouse_pos) else BUTTON_COLOR
             
@@ -901,31 +1181,64 @@ class Game:
             (self.cpu, [self.cpu.field_card_zone], [self.cpu_field_zone], 180)
         ]
 
+        blits = []
         for p, card_list, rect_list, rot in zones_to_draw:
             for i, card in enumerate(card_list):
-                if card: 
-                    img = card.get_hand_image(size)
-                    surface.blit(pygame.transform.rotate(img, rot), rect_list[i].topleft)
+                if card: blits.append(self.sprite_atlas.blit_args(self.card_sprite(card, rot), rect_list[i].topleft))
         
         if self.player.reiryoku_zone:
-            surface.blit(self.card_back_image, self.player_reiryoku_zone_rect.topleft)
+            blits.append(self.sprite_atlas.blit_args(("card_back", 0), self.player_reiryoku_zone_rect.topleft))
         if self.cpu.reiryoku_zone:
-            surface.blit(pygame.transform.rotate(self.card_back_image, 180), self.cpu_reiryoku_zone_rect.topleft)
+            blits.append(self.sprite_atlas.blit_args(("card_back", 180), self.cpu_reiryoku_zone_rect.topleft))
+        surface.blits(blits, doreturn=False)
 
 
     def draw_hands(self, surface):
-        for i, card in enumerate(self.player.hand):
-            card_rect = self.get_player_hand_rect(i); surface.blit(card.get_hand_image((CARD_HAND_WIDTH, CARD_HAND_HEIGHT)), card_rect.topleft)
-            if self.selected_card == card: pygame.draw.rect(surface, (255, 255, 0), card_rect, 4, border_radius=5)
+        hand_rects = [self.get_player_hand_rect(i) for i in range(len(self.player.hand))]
+        blits = [self.sprite_atlas.blit_args(self.card_sprite(card), rect.topleft) for card, rect in zip(self.player.hand, hand_rects)]
         cpu_start_x = LOGICAL_WIDTH // 2 - (len(self.cpu.hand) * (CARD_HAND_WIDTH + 10) // 2)
-        for i in range(len(self.cpu.hand)): surface.blit(self.card_back_image, (cpu_start_x + i * (CARD_HAND_WIDTH + 10), 20))
+        blits.extend(self.sprite_atlas.blit_args(("card_back", 0), (cpu_start_x + i * (CARD_HAND_WIDTH + 10), 20)) for i in range(len(self.cpu.hand)))
+        surface.blits(blits, doreturn=False)
+        if (slot := self.selected_hand_slot()) is not None: pygame.draw.rect(surface, (255, 255, 0), hand_rects[slot], 4, border_radius=5)
+
+    def hover_rect(self):
+        """Rect of the card or burial pile under the mouse that gets a hover outline, or None."""
+        target = self.hover_target
+        if target is None: return None
+        card = self.card_at(target)
+        if card is not None and card is self.selected_card: return None # Already outlined as the selection
+        if card or (target[1] == "burial" and (self.player if target[0] == "player" else self.cpu).soul_burial):
+            return self.target_rect(target)
+        return None
+
+    def draw_play_targets(self, surface):
+        """Tints the empty zones the selected hand card can be played to."""
+        for target in self.play_targets:
+            rect = self.target_rect(target)
+            highlight_surf = pygame.Surface(rect.size, pygame.SRCALPHA); highlight_surf.fill(HIGHLIGHT_COLOR)
+            surface.blit(highlight_surf, rect.topleft)
+
+    def draw_combat_marks(self, surface):
+        """Darkens exhausted characters and outlines attackers, blockers and the blocker being assigned."""
+        for side, p in (("player", self.player), ("cpu", self.cpu)):
+            for i, card in enumerate(p.character_zones):
+                if card and card.is_exhausted:
+                    rect = getattr(self, f"{side}_character_zones")[i]
+                    tint = pygame.Surface(rect.size, pygame.SRCALPHA); tint.fill(EXHAUSTED_TINT); surface.blit(tint, rect.topleft)
+        colors = {"attacker": ATTACK_OUTLINE_COLOR, "blocker": BLOCK_OUTLINE_COLOR, "selected": (255, 255, 0)}
+        for target, mark in self.combat_marks.items():
+            pygame.draw.rect(surface, colors[mark], self.target_rect(target), 4, border_radius=5)
+
+    def draw_hover(self, surface):
+        if rect := self.hover_rect(): pygame.draw.rect(surface, HOVER_OUTLINE_COLOR, rect, 2, border_radius=5)
 
     def draw_counters(self, surface):
-        size = (CARD_HAND_WIDTH, CARD_HAND_HEIGHT)
-        if self.player.deck: surface.blit(self.card_back_image, self.player_deck_zone.topleft)
-        if self.player.soul_burial: surface.blit(self.player.soul_burial[-1].get_hand_image(size), self.player_burial_zone.topleft)
-        if self.cpu.deck: surface.blit(pygame.transform.rotate(self.card_back_image, 180), self.cpu_deck_zone.topleft)
-        if self.cpu.soul_burial: surface.blit(pygame.transform.rotate(self.cpu.soul_burial[-1].get_hand_image(size), 180), self.cpu_burial_zone.topleft)
+        atlas = self.sprite_atlas; blits = []
+        if self.player.deck: blits.append(atlas.blit_args(("card_back", 0), self.player_deck_zone.topleft))
+        if self.player.soul_burial: blits.append(atlas.blit_args(self.card_sprite(self.player.soul_burial[-1]), self.player_burial_zone.topleft))
+        if self.cpu.deck: blits.append(atlas.blit_args(("card_back", 180), self.cpu_deck_zone.topleft))
+        if self.cpu.soul_burial: blits.append(atlas.blit_args(self.card_sprite(self.cpu.soul_burial[-1], 180), self.cpu_burial_zone.topleft))
+        surface.blits(blits, doreturn=False)
         
         zones_with_counters = [
             (self.player.deck, self.player_deck_zone),
@@ -941,19 +1254,35 @@ class Game:
 
     def save_game_state(self):
         try:
-            state = {"player": self.player.to_dict(), "cpu": self.cpu.to_dict(), "game_state": self.state_manager.to_dict()}
-            with open(SAVE_FILE_PATH, 'w') as f: json.dump(state, f, indent=4)
+            write_atomic(SAVE_FILE_PATH, encode_game(self.state_manager))
             print("Game saved successfully.")
         except Exception as e: print(f"Error saving game: {e}")
 
-    def load_game_state(self):
-        if not os.path.exists(SAVE_FILE_PATH): print("No save file found."); return
+    def autosave(self, state_manager):
+        """Snapshots the game on the main thread and writes it in the background; runs on phase changes but only
+        saves at rest points, when the player's Main1 or Main2 begins, so a load never lands mid-turn for the CPU."""
+        if state_manager.current_phase not in ("Main1", "Main2") or state_manager.current_player is not self.player or state_manager.sub_state: return
+        try: self.autosaver.save(AUTOSAVE_FILE_PATH, encode_game(state_manager))
+        except Exception as e: print(f"Error autosaving game: {e}")
+
+    def load_game_state(self, path=None):
+        """Loads a save file (the manual save by default); without a manual save, falls back to a legacy JSON save."""
+        path = path or SAVE_FILE_PATH; found = os.path.exists(path)
+        if not found and (path != SAVE_FILE_PATH or not os.path.exists(LEGACY_SAVE_FILE_PATH)): print("No save file found."); return
+        self.autosaver.shutdown() # Let an in-flight autosave finish before reading it
         try:
-            with open(SAVE_FILE_PATH, 'r') as f: state = json.load(f)
-            self.player.from_dict(state['player'], self.all_cards)
-            self.cpu.from_dict(state['cpu'], self.all_cards)
-            self.state_manager = GameStateManager(self)
-            self.state_manager.from_dict(state['game_state'])
+            self.reseed()
+            state_manager = GameStateManager(self, PhaseScheduler(clock=pygame.time.get_ticks), rng=self.rng, ai=self.cpu_ai)
+            if found:
+                with open(path, 'rb') as f: decode_game(f.read(), state_manager, self.all_cards)
+            else:
+                with open(LEGACY_SAVE_FILE_PATH, 'r') as f: state = json.load(f)
+                self.player.from_dict(state['player'], self.all_cards)
+                self.cpu.from_dict(state['cpu'], self.all_cards)
+                state_manager.from_dict(state['game_state'])
+            Card.image_loader.prefetch(self.player.hand + self.cpu.hand + list(self.player.deck) + list(self.cpu.deck))
+            self.state_manager = state_manager; self.state_manager.on_phase_change = self.autosave
+            self.start_action_log(); self.state_manager.resume_loaded_game() # A game saved mid-turn carries on
             self.game_state = 'in_game'; print("Game loaded successfully.")
         except Exception as e: print(f"Error loading game: {e}")
 
@@ -0,0 +1,34 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game_logic.headless import HeadlessGame, load_card_catalog
+from game_logic.legal_moves import zone_code
+
+CARD_DATA_PATH = os.path.join(ROOT, "cards", "card_data.json")
+
+@pytest.fixture(scope="session")
+def catalog():
+    return load_card_catalog(CARD_DATA_PATH)
+
+@pytest.fixture
+def game(catalog):
+    """A HeadlessGame with empty decks, for setting up boards by hand."""
+    return HeadlessGame(catalog, [], [], seed=0)
+
+def card_named(catalog, name):
+    """A fresh instance of the first catalog card with this name."""
+    return next(card for card in catalog.values() if card.data["name"] == name).new_instance()
+
+def give(player, card):
+    """Adds card to player's hand, keeping the move index in step."""
+    player.hand.append(card); player.moves.add_to_hand(zone_code(card))
+    return card
+
+def put_card(player, card, zone_type="character", index=0):
+    """Plays card from the hand through the Player, so every index sees it enter; its cost is funded first."""
+    give(player, card); player.energy.add(card.cost)
+    assert player.play_card_to_zone(card, zone_type, index, hand_index=len(player.hand) - 1)
@@ -0,0 +1,8 @@
+import pytest
+from game_logic.ai import MCTSAI
+from game_logic.compact_state import CardTable
+
+def test_mcts_needs_a_budget_or_an_iteration_cap(catalog):
+    table = CardTable.from_catalog(catalog)
+    with pytest.raises(ValueError): MCTSAI(table, time_budget_ms=0)
+    assert MCTSAI(table, time_budget_ms=0, max_iterations=10).max_iterations == 10
@@ -0,0 +1,45 @@
+from conftest import card_named, give
+from game_logic.costs import can_pay, parse_cost, pay
+from game_logic.gamestate import PHASE_ORDER
+from game_logic.legal_moves import legal_actions
+
+def main_phase(game, *reiryoku):
+    """Puts the game in the player's Main1 with the given cards ready in the reiryoku zone."""
+    sm = game.state_manager; sm.turn_index = 0; sm.phase_index = PHASE_ORDER.index("Main1")
+    game.player.reiryoku_zone = list(reiryoku); game.player.reset_energy()
+    return sm
+
+def plays(sm):
+    return [action for action in legal_actions(sm) if action[0] == "play"]
+
+def test_pay_uses_neutral_for_generic_first():
+    assert can_pay((1, 0, 1, 0, 0), (1, 0, 1, 0, 0)) and not can_pay((2, 0, 0, 0, 0), (1, 0, 1, 0, 0))
+    assert pay((1, 1, 1, 0, 0), (1, 0, 1, 0, 0)) == (0, 1, 0, 0, 0)
+    assert pay((0, 0, 1, 0, 0), (1, 0, 1, 0, 0)) is None
+
+def test_affordable_play_exhausts_reiryoku(game, catalog):
+    sm = main_phase(game, card_named(catalog, "Grand Fisher"), card_named(catalog, "Cero"), card_named(catalog, "Orihime Inoue"))
+    hollow = give(game.player, card_named(catalog, "Basic Hollow")) # 1B
+    assert ("play", 0, "character", 0) in plays(sm)
+    assert game.player.play_card_to_zone(hollow, "character", 0, hand_index=0)
+    assert [card.is_exhausted for card in game.player.reiryoku_zone] == [True, True, False]
+    assert game.player.energy.counts == [0, 0, 0, 0, 1]
+
+def test_unaffordable_play_is_not_legal(game, catalog):
+    sm = main_phase(game, card_named(catalog, "Kon"), card_named(catalog, "Orihime Inoue"))
+    hollow = give(game.player, card_named(catalog, "Basic Hollow")) # 1B, but only Red and Gray energy are ready
+    assert not plays(sm)
+    assert not game.player.play_card_to_zone(hollow, "character", 0, hand_index=0)
+    assert game.player.hand == [hollow] and game.player.character_zones[0] is None
+    assert not any(card.is_exhausted for card in game.player.reiryoku_zone)
+
+def test_restoration_readies_reiryoku(game, catalog):
+    main_phase(game, card_named(catalog, "Grand Fisher"), card_named(catalog, "Cero"))
+    assert game.player.play_card_to_zone(give(game.player, card_named(catalog, "Basic Hollow")), "character", 0, hand_index=0)
+    assert not game.player.can_pay(card_named(catalog, "Basic Hollow"))
+    game.player.ready_all_cards()
+    assert game.player.energy.counts == [0, 0, 2, 0, 0] and not any(card.is_exhausted for card in game.player.reiryoku_zone)
+
+def test_parse_cost():
+    assert parse_cost("4BB") == (4, 0, 2, 0, 0) and parse_cost("5WB") == (5, 1, 1, 0, 0)
+    assert parse_cost("2N") == (3, 0, 0, 0, 0) and parse_cost("") == (0, 0, 0, 0, 0)
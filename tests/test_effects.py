@@ -0,0 +1,26 @@
+from game_logic.effects import compile_rules, STATIC, TAGGED, OTHERS
+from conftest import card_named, put_card
+
+def test_tagged_field_modifier_only_affects_its_controller(game, catalog):
+    sm = game.state_manager; player, cpu = game.player, game.cpu
+    put_card(player, catalog["FIELD-002"].new_instance(), "field")
+    ours, theirs = card_named(catalog, "Rukia Kuchiki"), card_named(catalog, "Rukia Kuchiki")
+    put_card(player, ours, "character", 0); put_card(cpu, theirs, "character", 0)
+    assert sm.reiatsu_of(player, 0) == ours.reiatsu + 300 and sm.genryu_of(player, 0) == ours.genryu + 300
+    assert sm.reiatsu_of(cpu, 0) == theirs.reiatsu and sm.genryu_of(cpu, 0) == theirs.genryu
+
+def test_rules_text_naming_all_characters_reaches_both_fields():
+    modifier, = compile_rules("All other characters get -500/-500.")[STATIC]
+    assert modifier.scope == OTHERS and not modifier.own_field
+    modifier, = compile_rules("All Quincy characters gain +1000 Reiatsu.")[STATIC]
+    assert modifier.scope == TAGGED and modifier.own_field
+
+def test_conditional_self_modifier(game, catalog):
+    sm = game.state_manager; player = game.player
+    ichigo = catalog["SUB-001"].new_instance()
+    put_card(player, ichigo, "character", 0)
+    assert sm.reiatsu_of(player, 0) == ichigo.reiatsu
+    put_card(player, card_named(catalog, "Rukia Kuchiki"), "character", 1)
+    assert sm.reiatsu_of(player, 0) == ichigo.reiatsu + 500
+    player.destroy_character(1)
+    assert sm.reiatsu_of(player, 0) == ichigo.reiatsu
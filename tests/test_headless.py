@@ -0,0 +1,17 @@
+import random
+from game_logic.ai import RandomAI
+from game_logic.compact_state import CardTable
+from game_logic.headless import HeadlessGame
+
+def test_cards_played_counts_ai_controlled_seat(catalog):
+    rng = random.Random(1)
+    deck_a, deck_b = (rng.choices(sorted(catalog), k=50) for _ in range(2))
+    result = HeadlessGame(catalog, deck_a, deck_b, seed=1, ai=RandomAI(CardTable.from_catalog(catalog))).play()
+    assert sum(result["cards_played"][1].values()) > 0
+    assert sum(result["cards_played"][0].values()) > 0
+
+def test_same_seed_replays_the_same_game(catalog):
+    rng = random.Random(2)
+    deck_a, deck_b = (rng.choices(sorted(catalog), k=50) for _ in range(2))
+    first, second = (HeadlessGame(catalog, deck_a, deck_b, seed=7).play() for _ in range(2))
+    assert first["winner"] == second["winner"] and first["life_history"] == second["life_history"]
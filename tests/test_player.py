@@ -0,0 +1,15 @@
+from conftest import give
+
+def test_hand_actions_use_the_given_slot(game, catalog):
+    player = game.player
+    first, second = (give(player, catalog["SUB-001"].new_instance()) for _ in range(2)) # Duplicates: same data, separate instances
+    assert player.find_in_hand(second, 1) == 1
+    assert player.find_in_hand(second, 0) is None # A slot holding another copy is not a match
+    player.discard_card(second, hand_index=1)
+    assert player.hand == [first] and player.soul_burial == [second] and player.moves.hand_size == 1
+
+def test_stale_slot_is_rejected(game, catalog):
+    player = game.player
+    card = give(player, catalog["SUB-001"].new_instance())
+    assert not player.play_card_to_zone(card, "character", 0, hand_index=3)
+    assert player.hand == [card] and player.character_zones[0] is None
@@ -0,0 +1,12 @@
+import random
+from game_logic.headless import HeadlessGame
+from game_logic.replay import ReplayEngine, ReplayFile
+from game_logic.save_format import encode_game
+
+def test_replay_reaches_the_final_state(catalog, tmp_path):
+    rng = random.Random(3)
+    deck_a, deck_b = (rng.choices(sorted(catalog), k=50) for _ in range(2))
+    path = str(tmp_path / "game.bsr")
+    game = HeadlessGame(catalog, deck_a, deck_b, seed=3, replay_path=path); game.play()
+    replay = ReplayFile.read(path)
+    assert encode_game(ReplayEngine(replay, catalog).seek(len(replay.actions))) == encode_game(game.state_manager)
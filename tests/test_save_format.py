@@ -0,0 +1,65 @@
+import random
+import pytest
+from conftest import card_named, give, put_card
+from game_logic.ai import RandomAI
+from game_logic.compact_state import CardTable
+from game_logic.gamestate import PHASE_ORDER
+from game_logic.headless import HeadlessGame
+from game_logic.save_format import SaveFormatError, decode_game, encode_game
+from game_logic.simulate import random_deck
+
+def reload(game, catalog):
+    """A fresh HeadlessGame restored from a save of game."""
+    loaded = HeadlessGame(catalog, [], [], seed=0)
+    decode_game(encode_game(game.state_manager), loaded.state_manager, catalog)
+    return loaded
+
+def test_discard_prompt_survives_a_save(game, catalog):
+    card = give(game.player, card_named(catalog, "Grand Fisher"))
+    game.state_manager.sub_state = 'awaiting_discard'
+    loaded = reload(game, catalog)
+    assert loaded.state_manager.sub_state == 'awaiting_discard'
+    assert [c.data["id"] for c in loaded.player.hand] == [card.data["id"]]
+
+def test_corrupt_save_is_rejected(game, catalog):
+    data = bytearray(encode_game(game.state_manager)); data[10] ^= 0xFF
+    with pytest.raises(SaveFormatError): decode_game(bytes(data), HeadlessGame(catalog, [], [], seed=0).state_manager, catalog)
+
+def test_pending_attack_and_damage_survive_a_save(game, catalog):
+    sm = game.state_manager; sm.turn_index = 1; sm.phase_index = PHASE_ORDER.index("Combat")
+    put_card(game.cpu, card_named(catalog, "Grand Fisher"), index=2)
+    game.player.take_damage(0, 3)
+    sm.sub_state = 'awaiting_blockers'; sm.pending_attack = 1 << 2
+    loaded = reload(game, catalog).state_manager
+    assert loaded.sub_state == 'awaiting_blockers' and loaded.pending_attack == 1 << 2
+    assert loaded.players[0].damage_taken == [3, 0, 0, 0, 0]
+
+def loaded_game(catalog, seat, phase, sub_state=None):
+    """A game with an AI on the CPU seat, saved in seat's phase and loaded into a fresh game."""
+    rng = random.Random(4)
+    decks = random_deck(list(catalog), rng), random_deck(list(catalog), rng)
+    table = CardTable.from_catalog(catalog)
+    game = HeadlessGame(catalog, *decks, seed=4, ai=RandomAI(table)); game.state_manager.start_game()
+    sm = game.state_manager; sm.turn_index = seat; sm.phase_index = PHASE_ORDER.index(phase); sm.sub_state = sub_state
+    loaded = HeadlessGame(catalog, [], [], seed=4, ai=RandomAI(table))
+    decode_game(encode_game(sm), loaded.state_manager, catalog)
+    return loaded.state_manager
+
+def at_rest(sm):
+    """True once the loaded game waits on the player: their main or combat phase, or blockers for the CPU's attack."""
+    if sm.is_processing_automatic_phases or len(sm.scheduler): return False
+    return sm.sub_state == 'awaiting_blockers' or (sm.current_player is sm.players[0] and sm.current_phase in ("Main1", "Combat", "Main2"))
+
+@pytest.mark.parametrize("seat", [0, 1])
+@pytest.mark.parametrize("phase", [phase for phase in PHASE_ORDER if phase != "End"])
+def test_loaded_game_carries_on(catalog, seat, phase):
+    sm = loaded_game(catalog, seat, phase)
+    sm.resume_loaded_game(); sm.update()
+    assert sm.game_over or at_rest(sm)
+
+def test_loaded_cpu_discard_carries_on(catalog):
+    sm = loaded_game(catalog, 1, "End", 'awaiting_discard')
+    cpu = sm.players[1]
+    while len(cpu.hand) <= 6: give(cpu, cpu.deck.popleft())
+    sm.resume_loaded_game(); sm.update()
+    assert len(cpu.hand) == 6 and sm.sub_state is None and (sm.game_over or at_rest(sm))